@@ -56,10 +56,12 @@ from __future__ import print_function, unicode_literals
 try:
     import numpy
 except ImportError:
-    pass
+    numpy = None
 
+import math
 import tempfile
 import os
+from array import array
 from collections import defaultdict
 
 from six import integer_types
@@ -70,7 +72,7 @@ from nltk.util import OrderedDict
 from nltk.probability import DictionaryProbDist
 
 from nltk.classify.api import ClassifierI
-from nltk.classify.util import CutoffChecker, accuracy, log_likelihood
+from nltk.classify.util import CutoffChecker
 from nltk.classify.megam import call_megam, write_megam_file, parse_megam_weights
 from nltk.classify.tadm import call_tadm, write_tadm_file, parse_tadm_weights
 
@@ -166,6 +168,40 @@ class MaxentClassifier(ClassifierI):
         # Normalize the dictionary to give a probability distribution
         return DictionaryProbDist(prob_dict, log=self._logarithmic, normalize=True)
 
+    def classify_many(self, featuresets):
+        if numpy is None:
+            return ClassifierI.classify_many(self, featuresets)
+        toks, probs = self._batch_probs(featuresets)
+        labels = list(self._encoding.labels())
+        return [labels[i] for i in toks.best(probs)]
+
+    def prob_classify_many(self, featuresets):
+        if numpy is None:
+            return ClassifierI.prob_classify_many(self, featuresets)
+        toks, probs = self._batch_probs(featuresets)
+        labels = list(self._encoding.labels())
+        return [DictionaryProbDist(dict(zip(labels, row))) for row in probs.tolist()]
+
+    def prob_classify_array(self, featuresets):
+        """
+        Return the probabilities of the labels for each featureset, as
+        an array with one row per featureset and one column per label,
+        in the order of ``labels()``.  The featuresets are encoded in a
+        single pass and scored together.
+
+        :type featuresets: list(dict)
+        :rtype: numpy.ndarray
+        """
+        return self._batch_probs(featuresets)[1]
+
+    def _batch_probs(self, featuresets):
+        toks = _EncodedToks(((fs, None) for fs in featuresets), self._encoding)
+        weights = numpy.asarray(self._weights, 'd')
+        if not self._logarithmic:
+            with numpy.errstate(divide='ignore'):
+                weights = numpy.log2(weights)
+        return toks, toks.probs(toks.scores(weights))
+
     def explain(self, featureset, columns=4):
         """
         Print a table showing the effect of each of the features in
@@ -248,7 +284,7 @@ class MaxentClassifier(ClassifierI):
 
     #: A list of the algorithm names that are accepted for the
     #: ``train()`` method's ``algorithm`` parameter.
-    ALGORITHMS = ['GIS', 'IIS', 'MEGAM', 'TADM']
+    ALGORITHMS = ['GIS', 'IIS', 'LBFGS', 'MEGAM', 'TADM']
 
     @classmethod
     def train(
@@ -282,6 +318,8 @@ class MaxentClassifier(ClassifierI):
 
             - Iterative Scaling Methods: Generalized Iterative Scaling (``'GIS'``),
               Improved Iterative Scaling (``'IIS'``)
+            - L-BFGS optimization of the log likelihood, with ``scipy``
+              (``'LBFGS'``)
             - External Libraries (requiring megam):
               LM-BFGS algorithm, with training performed by Megam (``'megam'``)
 
@@ -301,7 +339,8 @@ class MaxentClassifier(ClassifierI):
             used instead.
         :param gaussian_prior_sigma: The sigma value for a gaussian
             prior on model weights.  Currently, this is supported by
-            ``megam``. For other algorithms, its value is ignored.
+            ``megam`` and ``lbfgs``. For other algorithms, its value is
+            ignored.
         :param cutoffs: Arguments specifying various conditions under
             which the training should be halted.  (Some of the cutoff
             conditions are not supported by some algorithms.)
@@ -336,6 +375,10 @@ class MaxentClassifier(ClassifierI):
             return train_maxent_classifier_with_gis(
                 train_toks, trace, encoding, labels, **cutoffs
             )
+        elif algorithm == 'lbfgs':
+            return train_maxent_classifier_with_lbfgs(
+                train_toks, trace, encoding, labels, gaussian_prior_sigma, **cutoffs
+            )
         elif algorithm == 'megam':
             return train_maxent_classifier_with_megam(
                 train_toks, trace, encoding, labels, gaussian_prior_sigma, **cutoffs
@@ -599,6 +642,41 @@ class BinaryMaxentFeatureEncoding(MaxentFeatureEncodingI):
 
         return encoding
 
+    def _encode_labels(self, featureset):
+        """
+        Return the joint-feature vectors of *featureset* for all the
+        labels at once, as a list of ``(label_index, f_id, f_val)``
+        triples, where label_index indexes ``labels()``.  Each
+        input-feature is looked up once, instead of once per label.
+        """
+        if getattr(self, '_label_features', None) is None:
+            # Map each (fname, fval) to its joint-features, by label.
+            label_index = dict((label, i) for (i, label) in enumerate(self._labels))
+            self._label_features = defaultdict(list)
+            for (fname, fval, label), f_id in self._mapping.items():
+                if label in label_index:
+                    self._label_features[fname, fval].append(
+                        (label_index[label], f_id, 1)
+                    )
+
+        encoding = []
+        for fname, fval in featureset.items():
+            features = self._label_features.get((fname, fval))
+            if features:
+                encoding.extend(features)
+            # Fire the "unseen-value feature" for every label.
+            elif self._unseen and fname in self._unseen:
+                f_id = self._unseen[fname]
+                encoding.extend((i, f_id, 1) for i in range(len(self._labels)))
+
+        # Add always-on features:
+        if self._alwayson:
+            for i, label in enumerate(self._labels):
+                if label in self._alwayson:
+                    encoding.append((i, self._alwayson[label], 1))
+
+        return encoding
+
     def describe(self, f_id):
         # Inherit docs.
         if not isinstance(f_id, integer_types):
@@ -736,6 +814,22 @@ class GISEncoding(BinaryMaxentFeatureEncoding):
         # Return the result
         return encoding
 
+    def _encode_labels(self, featureset):
+        # See BinaryMaxentFeatureEncoding._encode_labels.
+        encoding = BinaryMaxentFeatureEncoding._encode_labels(self, featureset)
+        base_length = BinaryMaxentFeatureEncoding.length(self)
+
+        # Add a correction feature for each label.
+        totals = [0] * len(self._labels)
+        for (i, f_id, f_val) in encoding:
+            totals[i] += f_val
+        for i, total in enumerate(totals):
+            if total >= self._C:
+                raise ValueError('Correction feature is not high enough!')
+            encoding.append((i, base_length, self._C - total))
+
+        return encoding
+
     def length(self):
         return BinaryMaxentFeatureEncoding.length(self) + 1
 
@@ -1032,6 +1126,127 @@ class TypedMaxentFeatureEncoding(MaxentFeatureEncodingI):
         return cls(labels, mapping, **options)
 
 
+######################################################################
+# { Classifier Trainer: Encoded Training Data
+######################################################################
+
+
+class _EncodedToks(object):
+    """
+    The training tokens encoded once, for every label, as a sparse
+    matrix in coordinate form: row ``i * L + j`` holds the joint-feature vector
+    ``encoding.encode(tok_i, labels[j])``, where ``L`` is the number of
+    labels.  The trainers use it to compute the label probabilities and
+    the expected feature counts of a weight vector with array operations,
+    instead of encoding every token again on every iteration; and
+    ``MaxentClassifier`` uses it to classify batches of featuresets (with
+    the label None).
+    """
+
+    def __init__(self, train_toks, encoding):
+        labels = list(encoding.labels())
+        label_index = dict((label, i) for (i, label) in enumerate(labels))
+        rows = array('l')
+        indices = array('l')
+        values = array('d')
+        gold = array('l')
+        if type(encoding) in (BinaryMaxentFeatureEncoding, GISEncoding):
+            # These encodings can encode a token for all labels at once.
+            for tok, label in train_toks:
+                row = len(gold) * len(labels)
+                gold.append(label_index.get(label, -1))
+                for (i, f_id, f_val) in encoding._encode_labels(tok):
+                    rows.append(row + i)
+                    indices.append(f_id)
+                    values.append(f_val)
+        else:
+            row = 0
+            for tok, label in train_toks:
+                gold.append(label_index.get(label, -1))
+                for label in labels:
+                    for (f_id, f_val) in encoding.encode(tok, label):
+                        rows.append(row)
+                        indices.append(f_id)
+                        values.append(f_val)
+                    row += 1
+
+        self.length = encoding.length()
+        self.shape = (len(gold), len(labels))
+        #: The row, feature id and value of each stored value.
+        self.rows = numpy.frombuffer(rows, 'l').astype(numpy.intp)
+        self.indices = numpy.frombuffer(indices, 'l').astype(numpy.intp)
+        self.values = numpy.frombuffer(values, 'd')
+        self.gold = numpy.frombuffer(gold, 'l').astype(numpy.intp)
+        #: Label indices from the greatest label to the least, so that
+        #: argmax breaks ties like ``DictionaryProbDist.max()``.
+        try:
+            self.label_order = numpy.array(
+                sorted(range(len(labels)), key=labels.__getitem__, reverse=True),
+                numpy.intp,
+            )
+        except TypeError:
+            self.label_order = numpy.arange(len(labels))
+
+    def nf(self):
+        """Return the sum of the feature values of each row."""
+        return numpy.bincount(
+            self.rows, weights=self.values, minlength=self.shape[0] * self.shape[1]
+        )
+
+    def scores(self, weights):
+        """
+        Return the ``(tokens x labels)`` array of the dot products of
+        *weights* with each joint-feature vector.
+        """
+        products = weights[self.indices] * self.values
+        return numpy.bincount(
+            self.rows, weights=products, minlength=self.shape[0] * self.shape[1]
+        ).reshape(self.shape)
+
+    def probs(self, scores):
+        """
+        Return the ``(tokens x labels)`` array of label probabilities for
+        the base-2 log scores *scores*.  A token for which every score is
+        -infinity gets a uniform distribution, as in ``DictionaryProbDist``.
+        """
+        top = scores.max(axis=1)[:, None]
+        top[numpy.isneginf(top)] = 0
+        probs = 2 ** (scores - top)
+        total = probs.sum(axis=1)[:, None]
+        none = total[:, 0] == 0
+        probs[none] = 1.0
+        total[none] = self.shape[1]
+        return probs / total
+
+    def fcount(self, probs):
+        """
+        Return the expected number of times each feature occurs, when
+        each label of each token is weighted by its probability in
+        *probs*.
+        """
+        weights = probs.ravel()[self.rows] * self.values
+        return numpy.bincount(self.indices, weights=weights, minlength=self.length)
+
+    def log_likelihood(self, probs):
+        """The same as ``nltk.classify.util.log_likelihood``."""
+        known = self.gold >= 0
+        gold_probs = probs[numpy.flatnonzero(known), self.gold[known]]
+        return math.log(gold_probs.sum() / len(self.gold))
+
+    def best(self, probs):
+        """
+        Return the index of the most probable label of each token, the
+        greatest label among equally probable ones.
+        """
+        return self.label_order[probs[:, self.label_order].argmax(axis=1)]
+
+    def accuracy(self, probs):
+        """The same as ``nltk.classify.util.accuracy``."""
+        if not len(self.gold):
+            return 0
+        return (self.best(probs) == self.gold).mean()
+
+
 ######################################################################
 # { Classifier Trainer: Generalized Iterative Scaling
 ######################################################################
@@ -1067,17 +1282,19 @@ def train_maxent_classifier_with_gis(
     # faster learning.
     Cinv = 1.0 / encoding.C
 
+    # Encode every token with every label, once.
+    toks = _EncodedToks(train_toks, encoding)
+
     # Count how many times each feature occurs in the training data.
     empirical_fcount = calculate_empirical_fcount(train_toks, encoding)
 
     # Check for any features that are not attested in train_toks.
-    unattested = set(numpy.nonzero(empirical_fcount == 0)[0])
+    unattested = numpy.nonzero(empirical_fcount == 0)[0]
 
     # Build the classifier.  Start with weight=0 for each attested
     # feature, and weight=-infinity for each unattested feature.
     weights = numpy.zeros(len(empirical_fcount), 'd')
-    for fid in unattested:
-        weights[fid] = numpy.NINF
+    weights[unattested] = numpy.NINF
     classifier = ConditionalExponentialClassifier(encoding, weights)
 
     # Take the log of the empirical fcount.
@@ -1093,22 +1310,20 @@ def train_maxent_classifier_with_gis(
 
     # Train the classifier.
     try:
+        probs = toks.probs(toks.scores(classifier.weights()))
         while True:
             if trace > 2:
-                ll = cutoffchecker.ll or log_likelihood(classifier, train_toks)
-                acc = cutoffchecker.acc or accuracy(classifier, train_toks)
+                ll = cutoffchecker.ll or toks.log_likelihood(probs)
+                acc = cutoffchecker.acc or toks.accuracy(probs)
                 iternum = cutoffchecker.iter
                 print('     %9d    %14.5f    %9.3f' % (iternum, ll, acc))
 
             # Use the model to estimate the number of times each
             # feature should occur in the training data.
-            estimated_fcount = calculate_estimated_fcount(
-                classifier, train_toks, encoding
-            )
+            estimated_fcount = toks.fcount(probs)
 
             # Take the log of estimated fcount (avoid taking log(0).)
-            for fid in unattested:
-                estimated_fcount[fid] += 1
+            estimated_fcount[unattested] += 1
             log_estimated_fcount = numpy.log2(estimated_fcount)
             del estimated_fcount
 
@@ -1116,9 +1331,12 @@ def train_maxent_classifier_with_gis(
             weights = classifier.weights()
             weights += (log_empirical_fcount - log_estimated_fcount) * Cinv
             classifier.set_weights(weights)
+            probs = toks.probs(toks.scores(weights))
 
             # Check the log-likelihood & accuracy cutoffs.
-            if cutoffchecker.check(classifier, train_toks):
+            if cutoffchecker.check(
+                classifier, train_toks, toks.log_likelihood(probs)
+            ):
                 break
 
     except KeyboardInterrupt:
@@ -1127,8 +1345,9 @@ def train_maxent_classifier_with_gis(
         raise
 
     if trace > 2:
-        ll = log_likelihood(classifier, train_toks)
-        acc = accuracy(classifier, train_toks)
+        probs = toks.probs(toks.scores(classifier.weights()))
+        ll = toks.log_likelihood(probs)
+        acc = toks.accuracy(probs)
         print('         Final    %14.5f    %9.3f' % (ll, acc))
 
     # Return the classifier.
@@ -1182,26 +1401,26 @@ def train_maxent_classifier_with_iis(
     if encoding is None:
         encoding = BinaryMaxentFeatureEncoding.train(train_toks, labels=labels)
 
+    # Encode every token with every label, once.
+    toks = _EncodedToks(train_toks, encoding)
+
     # Count how many times each feature occurs in the training data.
     empirical_ffreq = calculate_empirical_fcount(train_toks, encoding) / len(train_toks)
 
-    # Find the nf map, and related variables nfarray and nfident.
-    # nf is the sum of the features for a given labeled text.
-    # nfmap compresses this sparse set of values to a dense list.
-    # nfarray performs the reverse operation.  nfident is
-    # nfarray multiplied by an identity matrix.
-    nfmap = calculate_nfmap(train_toks, encoding)
-    nfarray = numpy.array(sorted(nfmap, key=nfmap.__getitem__), 'd')
+    # Find nfarray, the sorted attested values of nf, and related
+    # variables.  nf is the sum of the features for a given labeled
+    # text; nf_ids maps each labeled text to the index of its nf in
+    # nfarray.  nftranspose is the transpose of nfarray.
+    nfarray, nf_ids = numpy.unique(toks.nf(), return_inverse=True)
     nftranspose = numpy.reshape(nfarray, (len(nfarray), 1))
 
     # Check for any features that are not attested in train_toks.
-    unattested = set(numpy.nonzero(empirical_ffreq == 0)[0])
+    unattested = numpy.nonzero(empirical_ffreq == 0)[0]
 
     # Build the classifier.  Start with weight=0 for each attested
     # feature, and weight=-infinity for each unattested feature.
     weights = numpy.zeros(len(empirical_ffreq), 'd')
-    for fid in unattested:
-        weights[fid] = numpy.NINF
+    weights[unattested] = numpy.NINF
     classifier = ConditionalExponentialClassifier(encoding, weights)
 
     if trace > 0:
@@ -1213,32 +1432,39 @@ def train_maxent_classifier_with_iis(
 
     # Train the classifier.
     try:
+        probs = toks.probs(toks.scores(classifier.weights()))
         while True:
             if trace > 2:
-                ll = cutoffchecker.ll or log_likelihood(classifier, train_toks)
-                acc = cutoffchecker.acc or accuracy(classifier, train_toks)
+                ll = cutoffchecker.ll or toks.log_likelihood(probs)
+                acc = cutoffchecker.acc or toks.accuracy(probs)
                 iternum = cutoffchecker.iter
                 print('     %9d    %14.5f    %9.3f' % (iternum, ll, acc))
 
+            # Precompute the A matrix:
+            # A[nf][id] = sum ( p(fs) * p(label|fs) * f(fs,label) )
+            # over all label,fs s.t. num_features[label,fs]=nf
+            A = numpy.bincount(
+                nf_ids[toks.rows] * toks.length + toks.indices,
+                weights=probs.ravel()[toks.rows] * toks.values,
+                minlength=len(nfarray) * toks.length,
+            ).reshape(len(nfarray), toks.length)
+            A /= len(train_toks)
+
             # Calculate the deltas for this iteration, using Newton's method.
-            deltas = calculate_deltas(
-                train_toks,
-                classifier,
-                unattested,
-                empirical_ffreq,
-                nfmap,
-                nfarray,
-                nftranspose,
-                encoding,
+            deltas = _newton_deltas(
+                A, empirical_ffreq, nfarray, nftranspose, unattested
             )
 
             # Use the deltas to update our weights.
             weights = classifier.weights()
             weights += deltas
             classifier.set_weights(weights)
+            probs = toks.probs(toks.scores(weights))
 
             # Check the log-likelihood & accuracy cutoffs.
-            if cutoffchecker.check(classifier, train_toks):
+            if cutoffchecker.check(
+                classifier, train_toks, toks.log_likelihood(probs)
+            ):
                 break
 
     except KeyboardInterrupt:
@@ -1247,8 +1473,9 @@ def train_maxent_classifier_with_iis(
         raise
 
     if trace > 2:
-        ll = log_likelihood(classifier, train_toks)
-        acc = accuracy(classifier, train_toks)
+        probs = toks.probs(toks.scores(classifier.weights()))
+        ll = toks.log_likelihood(probs)
+        acc = toks.accuracy(probs)
         print('         Final    %14.5f    %9.3f' % (ll, acc))
 
     # Return the classifier.
@@ -1353,14 +1580,6 @@ def calculate_deltas(
     :param nftranspose: The transpose of ``nfarray``
     :type nftranspose: array(float)
     """
-    # These parameters control when we decide that we've
-    # converged.  It probably should be possible to set these
-    # manually, via keyword arguments to train.
-    NEWTON_CONVERGE = 1e-12
-    MAX_NEWTON = 300
-
-    deltas = numpy.ones(encoding.length(), 'd')
-
     # Precompute the A matrix:
     # A[nf][id] = sum ( p(fs) * p(label|fs) * f(fs,label) )
     # over all label,fs s.t. num_features[label,fs]=nf
@@ -1379,6 +1598,23 @@ def calculate_deltas(
                 A[nfmap[nf], id] += dist.prob(label) * val
     A /= len(train_toks)
 
+    return _newton_deltas(A, ffreq_empirical, nfarray, nftranspose, unattested)
+
+
+def _newton_deltas(A, ffreq_empirical, nfarray, nftranspose, unattested):
+    """
+    Solve for the IIS update values with Newton's method, given the
+    ``A`` matrix of ``calculate_deltas``.
+    """
+    # These parameters control when we decide that we've
+    # converged.  It probably should be possible to set these
+    # manually, via keyword arguments to train.
+    NEWTON_CONVERGE = 1e-12
+    MAX_NEWTON = 300
+
+    deltas = numpy.ones(A.shape[1], 'd')
+    unattested = numpy.array(list(unattested), numpy.intp)
+
     # Iteratively solve for delta.  Use the following variables:
     #   - nf_delta[x][y] = nfarray[x] * delta[y]
     #   - exp_nf_delta[x][y] = exp(nf[x] * delta[y])
@@ -1395,8 +1631,7 @@ def calculate_deltas(
         sum2 = numpy.sum(nf_exp_nf_delta * A, axis=0)
 
         # Avoid division by zero.
-        for fid in unattested:
-            sum2[fid] += 1
+        sum2[unattested] += 1
 
         # Update the deltas.
         deltas -= (ffreq_empirical - sum1) / -sum2
@@ -1409,6 +1644,115 @@ def calculate_deltas(
     return deltas
 
 
+######################################################################
+# { Classifier Trainer: L-BFGS
+######################################################################
+
+
+def train_maxent_classifier_with_lbfgs(
+    train_toks, trace=3, encoding=None, labels=None, gaussian_prior_sigma=0, **cutoffs
+):
+    """
+    Train a new ``ConditionalExponentialClassifier``, using the given
+    training samples, by minimizing the negative log likelihood of the
+    training labels with the L-BFGS algorithm of ``scipy.optimize``.
+    Unlike ``megam`` and ``tadm``, this needs no external binaries.
+    Features that are not attested in ``train_toks`` get the weight
+    -infinity, as with GIS and IIS.  Of the cutoffs, only ``max_iter``
+    (the maximum number of L-BFGS iterations) and ``count_cutoff`` are
+    used.
+
+    :see: ``train_maxent_classifier()`` for parameter descriptions.
+    """
+    try:
+        from scipy.optimize import minimize
+    except ImportError:
+        raise ImportError('The L-BFGS algorithm requires scipy.')
+
+    # Construct an encoding from the training data.
+    if encoding is None:
+        count_cutoff = cutoffs.get('count_cutoff', 0)
+        encoding = BinaryMaxentFeatureEncoding.train(
+            train_toks, count_cutoff, labels=labels, alwayson_features=True
+        )
+    elif labels is not None:
+        raise ValueError('Specify encoding or labels, not both')
+
+    # Only the tokens with a known label contribute to the likelihood.
+    known_labels = set(encoding.labels())
+    train_toks = [(tok, label) for (tok, label) in train_toks if label in known_labels]
+    toks = _EncodedToks(train_toks, encoding)
+    gold = (numpy.arange(len(toks.gold)), toks.gold)
+
+    # Count how many times each feature occurs in the training data,
+    # and leave the unattested features out of the optimization.
+    empirical_fcount = calculate_empirical_fcount(train_toks, encoding)
+    attested = numpy.nonzero(empirical_fcount)[0]
+    empirical_fcount = empirical_fcount[attested]
+    weights = numpy.empty(encoding.length(), 'd')
+    weights[:] = numpy.NINF
+    weights[attested] = 0
+    if gaussian_prior_sigma:
+        inv_variance = 1.0 / gaussian_prior_sigma ** 2
+    else:
+        inv_variance = 0
+
+    # The last evaluated point, and its label probabilities.
+    last = {}
+
+    def objective(x):
+        # Negative log likelihood (in bits) and its gradient.
+        weights[attested] = x
+        scores = toks.scores(weights)
+        probs = toks.probs(scores)
+        top = scores.max(axis=1)
+        log_z = top + numpy.log2((2 ** (scores - top[:, None])).sum(axis=1))
+        nll = (log_z - scores[gold]).sum()
+        grad = toks.fcount(probs)[attested] - empirical_fcount
+        if inv_variance:
+            nll += 0.5 * inv_variance * x.dot(x)
+            grad += inv_variance * x
+        last['x'], last['probs'] = x.copy(), probs
+        return nll, grad
+
+    def report(x):
+        if not numpy.array_equal(x, last.get('x')):
+            objective(x)
+        report.iter += 1
+        probs = last['probs']
+        ll = toks.log_likelihood(probs)
+        acc = toks.accuracy(probs)
+        print('     %9d    %14.5f    %9.3f' % (report.iter, ll, acc))
+
+    report.iter = 0
+
+    max_iter = cutoffs.get('max_iter', 100)
+    if trace > 0:
+        print('  ==> Training (%d iterations)' % max_iter)
+    if trace > 2:
+        print()
+        print('      Iteration    Log Likelihood    Accuracy')
+        print('      ---------------------------------------')
+
+    result = minimize(
+        objective,
+        numpy.zeros(len(attested)),
+        jac=True,
+        method='L-BFGS-B',
+        callback=report if trace > 2 else None,
+        options={'maxiter': max_iter},
+    )
+    weights[attested] = result.x
+
+    if trace > 2:
+        probs = toks.probs(toks.scores(weights))
+        ll = toks.log_likelihood(probs)
+        acc = toks.accuracy(probs)
+        print('         Final    %14.5f    %9.3f' % (ll, acc))
+
+    return MaxentClassifier(encoding, weights)
+
+
 ######################################################################
 # { Classifier Trainer: megam
 ######################################################################
@@ -33,6 +33,11 @@ from __future__ import print_function, unicode_literals
 
 from collections import defaultdict
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 from nltk.probability import FreqDist, DictionaryProbDist, ELEProbDist, sum_logs
 from nltk.classify.api import ClassifierI
 
@@ -60,6 +65,13 @@ class NaiveBayesClassifier(ClassifierI):
     The feature value 'None' is reserved for unseen feature values;
     you generally should not use 'None' as a feature value for one of
     your own features.
+
+    ``classify_many`` and ``prob_classify_many`` score whole batches
+    with a matrix of log probabilities, whose columns are the
+    ``(fname, fval)`` pairs seen in training plus one column per feature
+    name for the values that were not.  This assumes, as holds for the
+    estimators in ``nltk.probability``, that each P(fname=fval|label)
+    gives the same probability to all unseen values.
     """
 
     def __init__(self, label_probdist, feature_probdist):
@@ -82,6 +94,8 @@ class NaiveBayesClassifier(ClassifierI):
         self._label_probdist = label_probdist
         self._feature_probdist = feature_probdist
         self._labels = list(label_probdist.samples())
+        # Log probability matrix used by the batch methods, built on demand
+        self._columns = None
 
     def labels(self):
         return self._labels
@@ -122,6 +136,106 @@ class NaiveBayesClassifier(ClassifierI):
 
         return DictionaryProbDist(logprob, normalize=True, log=True)
 
+    def classify_many(self, featuresets):
+        if np is None:
+            return ClassifierI.classify_many(self, featuresets)
+        scores = self._batch_logprobs(featuresets)
+        # As in DictionaryProbDist.max(), ties go to the greatest label.
+        order = self._label_order
+        return [self._labels[order[i]] for i in scores[:, order].argmax(axis=1)]
+
+    def prob_classify_many(self, featuresets):
+        if np is None:
+            return ClassifierI.prob_classify_many(self, featuresets)
+        scores = self._batch_logprobs(featuresets)
+        return [
+            DictionaryProbDist(
+                dict(zip(self._labels, row.tolist())), normalize=True, log=True
+            )
+            for row in scores
+        ]
+
+    def _batch_logprobs(self, featuresets):
+        """
+        Return an array with the log probability of each label (column)
+        and each featureset (row), before normalization.  The featuresets
+        are encoded as a sparse matrix in CSR form, with a 1 for each
+        column whose feature they have, so the scores are the label log
+        probabilities plus the product of that matrix with the
+        transposed log probability matrix.
+        """
+        if getattr(self, '_columns', None) is None:
+            self._build_matrix()
+        columns = self._columns
+        unseen = self._unseen_columns
+
+        # Encode the featuresets, discarding feature names that we've
+        # never seen before.
+        indptr = [0]
+        indices = []
+        for featureset in featuresets:
+            for feature in featureset.items():
+                column = columns.get(feature)
+                if column is None:
+                    column = unseen.get(feature[0])
+                    if column is None:
+                        continue
+                indices.append(column)
+            indptr.append(len(indices))
+
+        scores = np.tile(self._label_logprobs, (len(indptr) - 1, 1))
+        if indices:
+            indptr = np.array(indptr)
+            rows = np.flatnonzero(np.diff(indptr))
+            logprobs = self._feature_logprobs[indices]
+            scores[rows] += np.add.reduceat(logprobs, indptr[rows], axis=0)
+        return scores
+
+    def _build_matrix(self):
+        """
+        Build the ``(features x labels)`` matrix of log probabilities
+        P(fname=fval|label), and the mappings from ``(fname, fval)``
+        pairs and from feature names (for unseen values) to its rows.
+        """
+        fvals = defaultdict(set)
+        for (label, fname), probdist in self._feature_probdist.items():
+            fvals[fname].update(probdist.samples())
+        columns = {}
+        unseen = {}
+        features = []
+        for fname, values in fvals.items():
+            for fval in values:
+                columns[fname, fval] = len(features)
+                features.append((fname, fval))
+            # A new object stands for any value not seen in training.
+            unseen[fname] = len(features)
+            features.append((fname, object()))
+
+        logprobs = np.empty((len(features), len(self._labels)))
+        for i, label in enumerate(self._labels):
+            for j, (fname, fval) in enumerate(features):
+                probdist = self._feature_probdist.get((label, fname))
+                if probdist is None:
+                    # nb: This case will never come up if the
+                    # classifier was created by
+                    # NaiveBayesClassifier.train().
+                    logprobs[j, i] = sum_logs([])  # = -INF.
+                else:
+                    logprobs[j, i] = probdist.logprob(fval)
+
+        self._label_logprobs = np.array(
+            [self._label_probdist.logprob(label) for label in self._labels]
+        )
+        try:
+            self._label_order = sorted(
+                range(len(self._labels)), key=self._labels.__getitem__, reverse=True
+            )
+        except TypeError:
+            self._label_order = list(range(len(self._labels)))
+        self._feature_logprobs = logprobs
+        self._unseen_columns = unseen
+        self._columns = columns
+
     def show_most_informative_features(self, n=10):
         # Determine the most relevant features, and display them.
         cpdist = self._feature_probdist
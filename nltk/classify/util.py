@@ -116,13 +116,19 @@ class CutoffChecker(object):
         self.acc = None
         self.iter = 1
 
-    def check(self, classifier, train_toks):
+    def check(self, classifier, train_toks, ll=None):
+        """
+        Return True if training should stop.  *ll* is the log likelihood
+        of *classifier* on *train_toks*, if it is already known.
+        """
         cutoffs = self.cutoffs
         self.iter += 1
         if 'max_iter' in cutoffs and self.iter >= cutoffs['max_iter']:
             return True  # iteration cutoff.
 
-        new_ll = nltk.classify.util.log_likelihood(classifier, train_toks)
+        if ll is None:
+            ll = nltk.classify.util.log_likelihood(classifier, train_toks)
+        new_ll = ll
         if math.isnan(new_ll):
             return True
 
@@ -138,7 +144,7 @@ class CutoffChecker(object):
             self.ll = new_ll
 
         if 'max_acc' in cutoffs or 'min_accdelta' in cutoffs:
-            new_acc = nltk.classify.util.log_likelihood(classifier, train_toks)
+            new_acc = ll
             if 'max_acc' in cutoffs and new_acc >= cutoffs['max_acc']:
                 return True  # log likelihood cutoff
             if (
@@ -49,15 +49,23 @@ class GAAClusterer(VectorSpaceClusterer):
         cluster_count = N
         index_map = numpy.arange(N)
 
-        # construct the similarity matrix
-        dims = (N, N)
-        dist = numpy.ones(dims, dtype=numpy.float) * numpy.inf
-        for i in range(N):
-            for j in range(i + 1, N):
-                dist[i, j] = cosine_distance(vectors[i], vectors[j])
+        # construct the similarity matrix, as 1 minus the cosines of the
+        # angles between the vectors (see cosine_distance)
+        vectors = numpy.array(vectors, numpy.float64)
+        norms = numpy.sqrt(numpy.einsum('ij,ij->i', vectors, vectors))
+        dist = numpy.dot(vectors, vectors.T)
+        dist /= numpy.outer(norms, norms)
+        numpy.subtract(1, dist, out=dist)
+        dist[numpy.tril_indices(N)] = numpy.inf
+
+        # the closest cluster after each cluster, and its distance, so that
+        # finding the closest pair of clusters only scans N values
+        nearest = dist.argmin(1)
+        nearest_dist = dist[numpy.arange(N), nearest]
 
         while cluster_count > max(self._num_clusters, 1):
-            i, j = numpy.unravel_index(dist.argmin(), dims)
+            i = nearest_dist.argmin()
+            j = nearest[i]
             if trace:
                 print("merging %d and %d" % (i, j))
 
@@ -68,6 +76,23 @@ class GAAClusterer(VectorSpaceClusterer):
             dist[:, j] = numpy.inf
             dist[j, :] = numpy.inf
 
+            # update the closest clusters of the rows that changed: row i,
+            # the rows whose closest cluster was i or j, and the rows
+            # before i that are now closer to i
+            column = dist[:i, i]
+            stale = (nearest == i) | (nearest == j)
+            stale[i] = True
+            stale[j] = False
+            stale = numpy.flatnonzero(stale)
+            nearest[stale] = dist[stale].argmin(1)
+            nearest_dist[stale] = dist[stale, nearest[stale]]
+            closer = (column < nearest_dist[:i]) | (
+                (column == nearest_dist[:i]) & (nearest[:i] > i)
+            )
+            nearest[:i][closer] = i
+            nearest_dist[:i][closer] = column[closer]
+            nearest_dist[j] = numpy.inf
+
             # merge the clusters
             cluster_len[i] = cluster_len[i] + cluster_len[j]
             self._dendrogram.merge(index_map[i], index_map[j])
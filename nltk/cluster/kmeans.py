@@ -6,9 +6,9 @@
 # For license information, see LICENSE.TXT
 from __future__ import print_function, unicode_literals, division
 
-import copy
 import random
 import sys
+from multiprocessing import Pool, cpu_count
 
 try:
     import numpy
@@ -16,9 +16,12 @@ except ImportError:
     pass
 
 
-from nltk.cluster.util import VectorSpaceClusterer
+from nltk.cluster.util import VectorSpaceClusterer, euclidean_distance, cosine_distance
 from nltk.compat import python_2_unicode_compatible
 
+# The number of vectors whose distances to the means are computed at once.
+_BLOCK_SIZE = 4096
+
 
 @python_2_unicode_compatible
 class KMeansClusterer(VectorSpaceClusterer):
@@ -43,6 +46,10 @@ class KMeansClusterer(VectorSpaceClusterer):
         svd_dimensions=None,
         rng=None,
         avoid_empty_clusters=False,
+        initialisation='random',
+        batch_size=None,
+        max_iterations=None,
+        processes=1,
     ):
 
         """
@@ -68,6 +75,26 @@ class KMeansClusterer(VectorSpaceClusterer):
                                      of next one; avoids undefined behavior
                                      when clusters become empty
         :type avoid_empty_clusters: boolean
+        :param initialisation: how to choose the initial means of a trial:
+                               'random' samples them from the vectors, and
+                               'k-means++' samples each further mean with
+                               probability proportional to the squared
+                               distance to the closest mean chosen so far
+        :type initialisation: str
+        :param batch_size: if given, update the means from random samples
+                           of this many vectors (mini-batch k-means)
+                           instead of from all the vectors; the vectors
+                           may then be any sequence that supports
+                           indexing, such as a ``numpy.memmap``
+        :type batch_size: int
+        :param max_iterations: maximum number of iterations per trial
+                               (default: unlimited, or 100 in mini-batch
+                               mode)
+        :type max_iterations: int
+        :param processes: number of processes to run the trials in; None
+                          uses all the CPUs.  The distance function must
+                          then be picklable.
+        :type processes: int
         """
         VectorSpaceClusterer.__init__(self, normalise, svd_dimensions)
         self._num_means = num_means
@@ -80,19 +107,50 @@ class KMeansClusterer(VectorSpaceClusterer):
         self._repeats = repeats
         self._rng = rng if rng else random.Random()
         self._avoid_empty_clusters = avoid_empty_clusters
+        if initialisation not in ('random', 'k-means++'):
+            raise ValueError('Unknown initialisation %r' % (initialisation,))
+        self._initialisation = initialisation
+        self._batch_size = batch_size
+        self._max_iterations = max_iterations
+        self._processes = processes
 
     def cluster_vectorspace(self, vectors, trace=False):
         if self._means and self._repeats > 1:
             print('Warning: means will be discarded for subsequent trials')
 
-        meanss = []
+        # Unless they are sampled in mini-batches, hold the vectors in a
+        # single array.
+        if not self._batch_size and not isinstance(vectors, numpy.ndarray):
+            vectors = numpy.array(vectors, numpy.float64)
+
+        # Choose the initial means (and the random seed of the mini-batches)
+        # of every trial up front, so that the trials are independent and
+        # can run in parallel.
+        trials = []
         for trial in range(self._repeats):
-            if trace:
-                print('k-means trial', trial)
-            if not self._means or trial > 1:
-                self._means = self._rng.sample(list(vectors), self._num_means)
-            self._cluster_vectorspace(vectors, trace)
-            meanss.append(self._means)
+            if not self._means or trial > 0:
+                self._means = self._initial_means(vectors)
+            seed = self._rng.random() if self._batch_size else None
+            trials.append((self._means, seed, trace))
+
+        if self._processes == 1:
+            meanss = []
+            for trial, (means, seed, trace) in enumerate(trials):
+                if trace:
+                    print('k-means trial', trial)
+                meanss.append(self._cluster_vectorspace(vectors, means, seed, trace))
+        else:
+            pool = Pool(
+                self._processes or cpu_count(),
+                initializer=_init_kmeans_worker,
+                initargs=(self, vectors),
+            )
+            try:
+                meanss = pool.map(_kmeans_trial, trials)
+            finally:
+                pool.terminate()
+                pool.join()
+        self._means = meanss[0]
 
         if len(meanss) > 1:
             # sort the means first (so that different cluster numbering won't
@@ -113,33 +171,160 @@ class KMeansClusterer(VectorSpaceClusterer):
             # use the best means
             self._means = min_means
 
-    def _cluster_vectorspace(self, vectors, trace=False):
-        if self._num_means < len(vectors):
-            # perform k-means clustering
-            converged = False
-            while not converged:
-                # assign the tokens to clusters based on minimum distance to
-                # the cluster means
-                clusters = [[] for m in range(self._num_means)]
-                for vector in vectors:
-                    index = self.classify_vectorspace(vector)
-                    clusters[index].append(vector)
+    def _initial_means(self, vectors):
+        """
+        Choose the initial means of a trial from *vectors*.
+        """
+        if self._initialisation == 'random':
+            return [
+                vectors[i] for i in self._rng.sample(range(len(vectors)), self._num_means)
+            ]
+
+        # k-means++: choose each further mean with probability proportional
+        # to the squared distance to the closest mean chosen so far.
+        means = [vectors[self._rng.randrange(len(vectors))]]
+        closest = self._nearest(vectors, means)[1] ** 2
+        while len(means) < self._num_means:
+            cumulative = numpy.cumsum(closest)
+            if cumulative[-1] > 0:
+                i = numpy.searchsorted(cumulative, self._rng.random() * cumulative[-1])
+                i = min(int(i), len(vectors) - 1)
+            else:
+                i = self._rng.randrange(len(vectors))
+            means.append(vectors[i])
+            closest = numpy.minimum(closest, self._nearest(vectors, means[-1:])[1] ** 2)
+        return means
+
+    def _cluster_vectorspace(self, vectors, means, seed=None, trace=False):
+        """
+        Run one trial of k-means clustering from the initial *means*, and
+        return the final means.
+        """
+        if self._num_means >= len(vectors):
+            return list(means)
+        if self._batch_size:
+            return self._cluster_minibatch(vectors, means, seed, trace)
+
+        # perform k-means clustering
+        converged = False
+        iteration = 0
+        while not converged:
+            # assign the tokens to clusters based on minimum distance to
+            # the cluster means
+            labels = self._nearest(vectors, means)[0]
 
-                if trace:
-                    print('iteration')
-                # for i in range(self._num_means):
-                # print '  mean', i, 'allocated', len(clusters[i]), 'vectors'
+            if trace:
+                print('iteration')
 
-                # recalculate cluster means by computing the centroid of each cluster
-                new_means = list(map(self._centroid, clusters, self._means))
+            # recalculate cluster means by computing the centroid of each cluster
+            new_means = self._centroids(vectors, labels, means)
 
-                # measure the degree of change from the previous step for convergence
-                difference = self._sum_distances(self._means, new_means)
-                if difference < self._max_difference:
-                    converged = True
+            # measure the degree of change from the previous step for convergence
+            difference = self._sum_distances(means, new_means)
+            iteration += 1
+            if difference < self._max_difference or iteration == self._max_iterations:
+                converged = True
 
-                # remember the new means
-                self._means = new_means
+            # remember the new means
+            means = new_means
+        return means
+
+    def _cluster_minibatch(self, vectors, means, seed, trace=False):
+        """
+        Run one trial of mini-batch k-means (Sculley, 2010): each iteration
+        assigns a random sample of the vectors, and moves each mean
+        towards its vectors with a learning rate of one over the number of
+        vectors it has been assigned so far.
+        """
+        rng = random.Random(seed)
+        means = numpy.array(means, numpy.float64)
+        counts = numpy.zeros(len(means))
+        size = min(self._batch_size, len(vectors))
+        for iteration in range(self._max_iterations or 100):
+            indices = sorted(rng.sample(range(len(vectors)), size))
+            if isinstance(vectors, numpy.ndarray):
+                batch = numpy.asarray(vectors[indices], numpy.float64)
+            else:
+                batch = numpy.array([vectors[i] for i in indices], numpy.float64)
+            labels = self._nearest(batch, means)[0]
+
+            if trace:
+                print('iteration')
+
+            batch_counts = numpy.bincount(labels, minlength=len(means))
+            sums = numpy.zeros(means.shape)
+            numpy.add.at(sums, labels, batch)
+            counts += batch_counts
+            updated = batch_counts > 0
+            old_means = means.copy()
+            means[updated] += (
+                sums[updated] - batch_counts[updated, None] * means[updated]
+            ) / counts[updated, None]
+
+            if self._sum_distances(old_means, means) < self._max_difference:
+                break
+        return list(means)
+
+    def _nearest(self, vectors, means):
+        """
+        Return the index of the closest mean to each vector, and the
+        distance to it, as two arrays.  The distances are computed with
+        matrix operations when the distance is ``euclidean_distance`` or
+        ``cosine_distance``, a block of vectors at a time.
+        """
+        labels = numpy.empty(len(vectors), numpy.intp)
+        distances = numpy.empty(len(vectors))
+        vectorised = self._distance in (euclidean_distance, cosine_distance)
+        if vectorised:
+            means = numpy.array(means, numpy.float64)
+        for start in range(0, len(vectors), _BLOCK_SIZE):
+            block = vectors[start : start + _BLOCK_SIZE]
+            if vectorised:
+                block = numpy.asarray(block, numpy.float64)
+            if self._distance is euclidean_distance:
+                d = numpy.dot(block, means.T)
+                d *= -2
+                d += numpy.einsum('ij,ij->i', block, block)[:, None]
+                d += (means * means).sum(1)
+                d = numpy.sqrt(numpy.maximum(d, 0, out=d), out=d)
+            elif self._distance is cosine_distance:
+                d = numpy.dot(block, means.T)
+                d /= numpy.sqrt(numpy.einsum('ij,ij->i', block, block))[:, None]
+                d /= numpy.sqrt((means * means).sum(1))
+                d = 1 - d
+            else:
+                d = numpy.array(
+                    [[self._distance(v, mean) for mean in means] for v in block]
+                ).reshape(len(block), len(means))
+            stop = start + len(block)
+            labels[start:stop] = d.argmin(1)
+            distances[start:stop] = d[numpy.arange(len(block)), labels[start:stop]]
+        return labels, distances
+
+    def _centroids(self, vectors, labels, means):
+        """
+        Return the centroids of the clusters given by *labels*.
+        """
+        counts = numpy.bincount(labels, minlength=len(means))
+        if self._avoid_empty_clusters:
+            sums = numpy.array(means, numpy.float64)
+            counts += 1
+        else:
+            if not counts.all():
+                sys.stderr.write('Error: no centroid defined for empty cluster.\n')
+                sys.stderr.write(
+                    'Try setting argument \'avoid_empty_clusters\' to True\n'
+                )
+                assert False
+            sums = numpy.zeros((len(means), len(means[0])))
+        for start in range(0, len(vectors), _BLOCK_SIZE):
+            block = numpy.asarray(vectors[start : start + _BLOCK_SIZE], numpy.float64)
+            # Sum the vectors of each cluster with a product by the
+            # clusters' indicator matrix.
+            members = numpy.zeros((len(means), len(block)))
+            members[labels[start : start + len(block)], numpy.arange(len(block))] = 1
+            sums += numpy.dot(members, block)
+        return list(sums / counts[:, None])
 
     def classify_vectorspace(self, vector):
         # finds the closest cluster centroid
@@ -152,6 +337,18 @@ class KMeansClusterer(VectorSpaceClusterer):
                 best_index, best_distance = index, dist
         return best_index
 
+    def classify_many(self, vectors):
+        """
+        Classify the vectors together, computing their distances to the
+        means a block of vectors at a time.
+
+        :rtype: list
+        """
+        if self._should_normalise or self._Tt is not None:
+            vectors = [self.vector(vector) for vector in vectors]
+        labels = self._nearest(vectors, self._means)[0]
+        return [self.cluster_name(i) for i in labels.tolist()]
+
     def num_clusters(self):
         if self._means:
             return len(self._means)
@@ -170,31 +367,53 @@ class KMeansClusterer(VectorSpaceClusterer):
             difference += self._distance(u, v)
         return difference
 
-    def _centroid(self, cluster, mean):
-        if self._avoid_empty_clusters:
-            centroid = copy.copy(mean)
-            for vector in cluster:
-                centroid += vector
-            return centroid / (1 + len(cluster))
-        else:
-            if not len(cluster):
-                sys.stderr.write('Error: no centroid defined for empty cluster.\n')
-                sys.stderr.write(
-                    'Try setting argument \'avoid_empty_clusters\' to True\n'
-                )
-                assert False
-            centroid = copy.copy(cluster[0])
-            for vector in cluster[1:]:
-                centroid += vector
-            return centroid / len(cluster)
-
     def __repr__(self):
         return '<KMeansClusterer means=%s repeats=%d>' % (self._means, self._repeats)
 
 
+# Process-level state for clustering trials in parallel.
+_worker_clusterer = None
+_worker_vectors = None
+
+
+def _init_kmeans_worker(clusterer, vectors):
+    global _worker_clusterer, _worker_vectors
+    _worker_clusterer = clusterer
+    _worker_vectors = vectors
+
+
+def _kmeans_trial(args):
+    means, seed, trace = args
+    return _worker_clusterer._cluster_vectorspace(_worker_vectors, means, seed, trace)
+
+
 #################################################################################
 
 
+def benchmark(vectors, num_means, distance, **kwargs):
+    """
+    Clusters *vectors* with a ``KMeansClusterer`` constructed with
+    *num_means*, *distance* and *kwargs*, returning a dict with the
+    number of vectors and the time in seconds spent clustering and
+    assigning them.
+    """
+    from timeit import default_timer as timer
+
+    clusterer = KMeansClusterer(num_means, distance, **kwargs)
+    start = timer()
+    clusterer.cluster(vectors)
+    cluster_time = timer() - start
+
+    start = timer()
+    clusterer.classify_many(vectors)
+    classify_time = timer() - start
+    return dict(
+        vectors=len(vectors),
+        cluster_seconds=cluster_time,
+        classify_seconds=classify_time,
+    )
+
+
 def demo():
     # example from figure 14.9, page 517, Manning and Schutze
 
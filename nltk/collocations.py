@@ -32,13 +32,44 @@ from __future__ import print_function
 #   and unigram counts (raw_freq, pmi, student_t)
 
 import itertools as _itertools
+from collections import defaultdict
+from multiprocessing import Pool, cpu_count
 from six import iteritems
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from nltk.probability import FreqDist
 from nltk.util import ngrams
 # these two unused imports are referenced in collocations.doctest
 from nltk.metrics import ContingencyMeasures, BigramAssocMeasures, TrigramAssocMeasures
 from nltk.metrics.spearman import ranks_from_scores, spearman_correlation
+from nltk.metrics.association import NgramAssocMeasures, QuadgramAssocMeasures
+
+#: The number of words that ``BigramCollocationFinder.from_words`` counts at once.
+_CHUNK_SIZE = 1 << 20
+
+#: The association measures that accept arrays of marginals, which the
+#: finders use to score all their candidates at once.
+_ARRAY_MEASURES = set(
+    getattr(measure, '__func__', measure)
+    for measure in (
+        NgramAssocMeasures.raw_freq,
+        NgramAssocMeasures.student_t,
+        NgramAssocMeasures.chi_sq,
+        NgramAssocMeasures.mi_like,
+        NgramAssocMeasures.pmi,
+        NgramAssocMeasures.likelihood_ratio,
+        NgramAssocMeasures.poisson_stirling,
+        NgramAssocMeasures.jaccard,
+        BigramAssocMeasures.phi_sq,
+        BigramAssocMeasures.chi_sq,
+        BigramAssocMeasures.fisher,
+        BigramAssocMeasures.dice,
+    )
+)
 
 
 class AbstractCollocationFinder(object):
@@ -52,6 +83,16 @@ class AbstractCollocationFinder(object):
     identical interface.
     """
 
+    #: Whether scores and rankings are exactly those of the scalar
+    #: association measures.  Measures that accept arrays of marginals score
+    #: all the candidates at once, much faster, but their scores may differ
+    #: from the scalar ones in the last bit, which can reorder ties.  So by
+    #: default ``nbest`` and ``above_score`` only use the array scores to
+    #: select candidates, which are then rescored one at a time, and
+    #: ``score_ngrams`` scores every candidate one at a time.  Set it to
+    #: False to use the array scores throughout.
+    exact_scores = True
+
     def __init__(self, word_fd, ngram_fd):
         self.word_fd = word_fd
         self.N = word_fd.N()
@@ -114,6 +155,46 @@ class AbstractCollocationFinder(object):
         """
         self._apply_filter(lambda ng, f: any(fn(w) for w in ng))
 
+    def merge(self, other):
+        """Adds the counts of another finder of the same kind, such as one
+        built from another part of the corpus, to the counts of this finder.
+        The ngrams that span the two parts are not counted.
+        """
+        if type(other) is not type(self):
+            raise ValueError('Cannot merge a %s into a %s' % (type(other), type(self)))
+        for name in self._fd_names:
+            getattr(self, name).update(getattr(other, name))
+        self.N += other.N
+
+    @classmethod
+    def from_shards(cls, shards, processes=1, **kwargs):
+        """Constructs a collocation finder for the words of each of the given
+        shards of a corpus, by building a finder for each shard with
+        ``from_words`` and merging them.  With *processes* other than 1,
+        the shards are counted in parallel in that many processes (None
+        uses all the CPUs), so they must be picklable.  The ngrams that
+        span two shards are not counted.
+        """
+        if processes == 1:
+            finders = (cls.from_words(shard, **kwargs) for shard in shards)
+        else:
+            pool = Pool(processes or cpu_count())
+            finders = pool.imap(
+                _finder_from_words, ((cls, shard, kwargs) for shard in shards)
+            )
+        finder = None
+        try:
+            for shard_finder in finders:
+                if finder is None:
+                    finder = shard_finder
+                else:
+                    finder.merge(shard_finder)
+        finally:
+            if processes != 1:
+                pool.terminate()
+                pool.join()
+        return finder
+
     def _score_ngrams(self, score_fn):
         """Generates of (ngram, score) pairs as determined by the scoring
         function provided.
@@ -123,20 +204,105 @@ class AbstractCollocationFinder(object):
             if score is not None:
                 yield tup, score
 
+    def _score_arrays(self, score_fn):
+        """Returns a function from a list of candidate indices to their
+        ngrams, and an array of the score of each candidate, if *score_fn*
+        is an association measure that accepts arrays; or else None.
+        Candidates that ``score_ngram`` would not score get a NaN score.
+        """
+        if numpy is None or not _array_measure(score_fn):
+            return None
+        ngrams, marginals = self._marginal_arrays()
+        with numpy.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            scores = numpy.asarray(score_fn(*marginals), numpy.float64)
+        scores = numpy.where(marginals[0] != 0, scores, numpy.nan)
+        return ngrams, scores
+
+    def _marginal_arrays(self):
+        """Returns a function from a list of candidate indices to their
+        ngrams, and the marginals of all the candidates as arrays, in the
+        order of ``score_ngram``'s arguments to the scoring function.  The
+        marginals other than the total are found by ``_marginal_columns``,
+        which returns them as iterables over the given ngrams.
+        """
+        keys = list(self.ngram_fd)
+        array = lambda values: numpy.fromiter(values, numpy.float64, len(keys))
+        marginals = [
+            tuple(map(array, group)) if isinstance(group, tuple) else array(group)
+            for group in self._marginal_columns(keys)
+        ]
+        marginals.append(self.N)
+        return (lambda indices: [keys[i] for i in indices]), marginals
+
+    def _ranked(self, ngrams, scores, indices, score_fn):
+        """Returns the (ngram, score) pairs of the candidates at *indices*,
+        ordered from highest to lowest score, like ``score_ngrams``.  If
+        ``exact_scores`` is set, the candidates are rescored by
+        ``score_ngram``.
+        """
+        indices = indices.tolist()
+        if self.exact_scores:
+            pairs = [
+                (ngram, self.score_ngram(score_fn, *ngram)) for ngram in ngrams(indices)
+            ]
+            pairs = [(ngram, score) for ngram, score in pairs if score is not None]
+        else:
+            pairs = zip(ngrams(indices), scores[indices].tolist())
+        return sorted(pairs, key=lambda t: (-t[1], t[0]))
+
+    def _margin(self, score):
+        """Returns how far below *score* the array score of a candidate may
+        be while its exact score is above it."""
+        if not self.exact_scores or not numpy.isfinite(score):
+            return 0.0
+        return 1e-6 * (1 + abs(score))
+
     def score_ngrams(self, score_fn):
         """Returns a sequence of (ngram, score) pairs ordered from highest to
         lowest score, as determined by the scoring function provided.
         """
+        arrays = None if self.exact_scores else self._score_arrays(score_fn)
+        if arrays is not None:
+            ngrams, scores = arrays
+            scored = numpy.flatnonzero(~numpy.isnan(scores))
+            return self._ranked(ngrams, scores, scored, score_fn)
         return sorted(self._score_ngrams(score_fn), key=lambda t: (-t[1], t[0]))
 
     def nbest(self, score_fn, n):
         """Returns the top n ngrams when scored by the given function."""
-        return [p for p, s in self.score_ngrams(score_fn)[:n]]
+        arrays = self._score_arrays(score_fn)
+        if arrays is None:
+            return [p for p, s in self.score_ngrams(score_fn)[:n]]
+
+        # Select the candidates scoring at least the nth best score, without
+        # sorting the others.
+        ngrams, scores = arrays
+        scored = numpy.flatnonzero(~numpy.isnan(scores))
+        if n == 0:
+            return []
+        if 0 < n < len(scored):
+            threshold = -numpy.partition(-scores[scored], n - 1)[n - 1]
+            # The n best exact scores are at least the nth best array score
+            # less the error of one score, so their array scores are at
+            # least that less the error of two.
+            threshold -= 2 * self._margin(threshold)
+            scored = scored[scores[scored] >= threshold]
+        return [p for p, s in self._ranked(ngrams, scores, scored, score_fn)[:n]]
 
     def above_score(self, score_fn, min_score):
         """Returns a sequence of ngrams, ordered by decreasing score, whose
         scores each exceed the given minimum score.
         """
+        arrays = self._score_arrays(score_fn)
+        if arrays is not None:
+            ngrams, scores = arrays
+            lowest = min_score - self._margin(min_score)
+            with numpy.errstate(invalid='ignore'):
+                indices = numpy.flatnonzero(scores > lowest)
+            for ngram, score in self._ranked(ngrams, scores, indices, score_fn):
+                if score > min_score:
+                    yield ngram
+            return
         for ngram, score in self.score_ngrams(score_fn):
             if score > min_score:
                 yield ngram
@@ -148,9 +314,15 @@ class BigramCollocationFinder(AbstractCollocationFinder):
     """A tool for the finding and ranking of bigram collocations or other
     association measures. It is often useful to use from_words() rather than
     constructing an instance directly.
+
+    When built by from_words(), the finder holds its counts in arrays
+    indexed by word ids, and only builds ``word_fd`` and ``ngram_fd`` when
+    they are first used.  Frequency and word filters, merging and scoring
+    with the association measures work on the arrays directly.
     """
 
     default_ws = 2
+    _fd_names = ('word_fd', 'ngram_fd')
 
     def __init__(self, word_fd, bigram_fd, window_size=2):
         """Construct a BigramCollocationFinder, given FreqDists for
@@ -159,27 +331,196 @@ class BigramCollocationFinder(AbstractCollocationFinder):
         AbstractCollocationFinder.__init__(self, word_fd, bigram_fd)
         self.window_size = window_size
 
+    # The FreqDists are built from the arrays on first use; after that,
+    # they hold the counts.
+
+    @property
+    def word_fd(self):
+        if self._word_fd is None:
+            words = self._vocab[1:]
+            self._word_fd = FreqDist(dict(zip(words, self._word_counts[1:].tolist())))
+            self._word_counts = None
+        return self._word_fd
+
+    @word_fd.setter
+    def word_fd(self, word_fd):
+        self._word_fd = word_fd
+        self._word_counts = None
+
+    @property
+    def ngram_fd(self):
+        if self._ngram_fd is None:
+            self._ngram_fd = FreqDist(
+                dict(zip(self._bigrams(), self._bigram_counts.tolist()))
+            )
+            self._bigram_codes = self._bigram_counts = None
+        return self._ngram_fd
+
+    @ngram_fd.setter
+    def ngram_fd(self, ngram_fd):
+        self._ngram_fd = ngram_fd
+        self._bigram_codes = self._bigram_counts = None
+
+    def _set_arrays(self, vocab, word_counts, bigram_codes, bigram_counts):
+        """Makes the finder hold its counts in arrays: *vocab* lists the
+        words by id, with None (id 0) first; *word_counts* holds the count
+        of each word id; and *bigram_codes* holds the sorted distinct
+        bigrams, as ``first_id << 32 | second_id``, with their counts in
+        *bigram_counts*.
+        """
+        self._vocab = vocab
+        self._word_fd = self._ngram_fd = None
+        self._word_counts = word_counts
+        self._bigram_codes = bigram_codes
+        self._bigram_counts = bigram_counts
+        self.N = int(word_counts[1:].sum())
+
+    def _bigrams(self, indices=None):
+        """Returns the bigrams of the array-held counts at *indices*."""
+        codes = self._bigram_codes
+        if indices is not None:
+            codes = codes[indices]
+        vocab = self._vocab
+        return [
+            (vocab[w1], vocab[w2])
+            for w1, w2 in zip((codes >> 32).tolist(), (codes & 0xFFFFFFFF).tolist())
+        ]
+
     @classmethod
     def from_words(cls, words, window_size=2):
         """Construct a BigramCollocationFinder for all bigrams in the given
         sequence.  When window_size > 2, count non-contiguous bigrams, in the
         style of Church and Hanks's (1990) association ratio.
         """
-        wfd = FreqDist()
-        bfd = FreqDist()
-
         if window_size < 2:
             raise ValueError("Specify window_size at least 2")
 
-        for window in ngrams(words, window_size, pad_right=True):
-            w1 = window[0]
-            if w1 is None:
-                continue
-            wfd[w1] += 1
-            for w2 in window[1:]:
-                if w2 is not None:
-                    bfd[(w1, w2)] += 1
-        return cls(wfd, bfd, window_size=window_size)
+        if numpy is None:
+            wfd = FreqDist()
+            bfd = FreqDist()
+            for window in ngrams(words, window_size, pad_right=True):
+                w1 = window[0]
+                if w1 is None:
+                    continue
+                wfd[w1] += 1
+                for w2 in window[1:]:
+                    if w2 is not None:
+                        bfd[(w1, w2)] += 1
+            return cls(wfd, bfd, window_size=window_size)
+
+        # Number the words as they are first seen, with None (the padding)
+        # as 0, and count the words and bigrams a chunk at a time.
+        ids = defaultdict()
+        ids.default_factory = ids.__len__
+        ids[None] = 0
+        words = iter(words)
+        word_counts = numpy.zeros(1, numpy.int64)
+        bigram_counts = _CountMerger()
+        tail = numpy.zeros(0, numpy.int64)
+        while True:
+            chunk = numpy.fromiter(
+                map(ids.__getitem__, _itertools.islice(words, _CHUNK_SIZE)), numpy.int64
+            )
+            if not len(chunk):
+                break
+            counts = numpy.bincount(chunk, minlength=len(ids))
+            counts[: len(word_counts)] += word_counts
+            word_counts = counts
+
+            # The bigrams (w1, w2) with w2 in this chunk, and w1 up to
+            # window_size - 1 words before it.
+            window = numpy.concatenate((tail, chunk))
+            for d in range(1, window_size):
+                w1 = window[max(len(tail) - d, 0) : len(window) - d]
+                w2 = window[max(len(tail), d) :]
+                seen = (w1 != 0) & (w2 != 0)
+                bigram_counts.add((w1[seen] << 32) | w2[seen])
+            tail = window[len(window) - window_size + 1 :]
+
+        vocab = [None] * len(ids)
+        for word, i in iteritems(ids):
+            vocab[i] = word
+        finder = cls(FreqDist(), FreqDist(), window_size=window_size)
+        finder._set_arrays(vocab, word_counts, *bigram_counts.merged())
+        return finder
+
+    def apply_freq_filter(self, min_freq):
+        """Removes candidate ngrams which have frequency less than min_freq."""
+        if self._ngram_fd is not None:
+            return AbstractCollocationFinder.apply_freq_filter(self, min_freq)
+        keep = self._bigram_counts >= min_freq
+        self._bigram_codes = self._bigram_codes[keep]
+        self._bigram_counts = self._bigram_counts[keep]
+
+    def apply_word_filter(self, fn):
+        """Removes candidate ngrams (w1, w2, ...) where any of (fn(w1), fn(w2),
+        ...) evaluates to True.
+        """
+        if self._ngram_fd is not None:
+            return AbstractCollocationFinder.apply_word_filter(self, fn)
+        # Call fn once per distinct word of the candidates.
+        codes = self._bigram_codes
+        words = numpy.unique(numpy.concatenate((codes >> 32, codes & 0xFFFFFFFF)))
+        filtered = numpy.zeros(len(self._vocab), bool)
+        filtered[words] = [bool(fn(self._vocab[i])) for i in words.tolist()]
+        keep = ~(filtered[codes >> 32] | filtered[codes & 0xFFFFFFFF])
+        self._bigram_codes = codes[keep]
+        self._bigram_counts = self._bigram_counts[keep]
+
+    def merge(self, other):
+        """Adds the counts of another finder of the same kind, such as one
+        built from another part of the corpus, to the counts of this finder.
+        The ngrams that span the two parts are not counted.
+        """
+        if type(other) is not type(self):
+            raise ValueError('Cannot merge a %s into a %s' % (type(other), type(self)))
+        if other.window_size != self.window_size:
+            raise ValueError('Cannot merge finders with different window sizes')
+        if self._ngram_fd is not None or self._word_fd is not None:
+            return AbstractCollocationFinder.merge(self, other)
+        if other._ngram_fd is not None or other._word_fd is not None:
+            return AbstractCollocationFinder.merge(self, other)
+
+        # Renumber the other finder's words into this one's vocabulary.
+        ids = dict((word, i) for (i, word) in enumerate(self._vocab))
+        vocab = list(self._vocab)
+        for word in other._vocab:
+            if word not in ids:
+                ids[word] = len(vocab)
+                vocab.append(word)
+        renumber = numpy.array([ids[word] for word in other._vocab], numpy.int64)
+
+        word_counts = numpy.zeros(len(vocab), numpy.int64)
+        word_counts[: len(self._vocab)] = self._word_counts
+        word_counts[renumber] += other._word_counts
+        codes = other._bigram_codes
+        codes = (renumber[codes >> 32] << 32) | renumber[codes & 0xFFFFFFFF]
+        bigram_counts = _CountMerger()
+        bigram_counts.add(self._bigram_codes, self._bigram_counts)
+        bigram_counts.add(codes, other._bigram_counts)
+        self._set_arrays(vocab, word_counts, *bigram_counts.merged())
+
+    def _marginal_arrays(self):
+        if self._ngram_fd is not None or self._word_fd is not None:
+            return AbstractCollocationFinder._marginal_arrays(self)
+        codes = self._bigram_codes
+        word_counts = self._word_counts.astype(numpy.float64)
+        marginals = [
+            self._bigram_counts / (self.window_size - 1.0),
+            (word_counts[codes >> 32], word_counts[codes & 0xFFFFFFFF]),
+            self.N,
+        ]
+        return self._bigrams, marginals
+
+    def _marginal_columns(self, ngrams):
+        scale = self.window_size - 1.0
+        return [
+            (self.ngram_fd[ngram] / scale for ngram in ngrams),
+            (
+                (self.word_fd[w1] for w1, w2 in ngrams),
+                (self.word_fd[w2] for w1, w2 in ngrams),
+            ),
+        ]
 
     def score_ngram(self, score_fn, w1, w2):
         """Returns the score for a given bigram using the given scoring
@@ -202,6 +543,7 @@ class TrigramCollocationFinder(AbstractCollocationFinder):
     """
 
     default_ws = 3
+    _fd_names = ('word_fd', 'bigram_fd', 'wildcard_fd', 'ngram_fd')
 
     def __init__(self, word_fd, bigram_fd, wildcard_fd, trigram_fd):
         """Construct a TrigramCollocationFinder, given FreqDists for
@@ -246,6 +588,21 @@ class TrigramCollocationFinder(AbstractCollocationFinder):
         """
         return BigramCollocationFinder(self.word_fd, self.bigram_fd)
 
+    def _marginal_columns(self, ngrams):
+        return [
+            (self.ngram_fd[ngram] for ngram in ngrams),
+            (
+                (self.bigram_fd[(w1, w2)] for w1, w2, w3 in ngrams),
+                (self.wildcard_fd[(w1, w3)] for w1, w2, w3 in ngrams),
+                (self.bigram_fd[(w2, w3)] for w1, w2, w3 in ngrams),
+            ),
+            (
+                (self.word_fd[w1] for w1, w2, w3 in ngrams),
+                (self.word_fd[w2] for w1, w2, w3 in ngrams),
+                (self.word_fd[w3] for w1, w2, w3 in ngrams),
+            ),
+        ]
+
     def score_ngram(self, score_fn, w1, w2, w3):
         """Returns the score for a given trigram using the given scoring
         function.
@@ -269,6 +626,7 @@ class QuadgramCollocationFinder(AbstractCollocationFinder):
     """
 
     default_ws = 4
+    _fd_names = ('word_fd', 'ngram_fd', 'ii', 'iii', 'ixi', 'ixxi', 'iixi', 'ixii')
 
     def __init__(self, word_fd, quadgram_fd, ii, iii, ixi, ixxi, iixi, ixii):
         """Construct a QuadgramCollocationFinder, given FreqDists for appearances of words,
@@ -318,6 +676,30 @@ class QuadgramCollocationFinder(AbstractCollocationFinder):
 
         return cls(ixxx, iiii, ii, iii, ixi, ixxi, iixi, ixii)
 
+    def _marginal_columns(self, ngrams):
+        columns = lambda fd, positions: (
+            fd[tuple(ngram[i] for i in positions)] for ngram in ngrams
+        )
+        word_column = lambda i: (self.word_fd[ngram[i]] for ngram in ngrams)
+        return [
+            (self.ngram_fd[ngram] for ngram in ngrams),
+            (
+                columns(self.iii, (0, 1, 2)),
+                columns(self.iixi, (0, 1, 3)),
+                columns(self.ixii, (0, 2, 3)),
+                columns(self.iii, (1, 2, 3)),
+            ),
+            (
+                columns(self.ii, (0, 1)),
+                columns(self.ixi, (0, 2)),
+                columns(self.ixxi, (0, 3)),
+                columns(self.ixi, (1, 3)),
+                columns(self.ii, (2, 3)),
+                columns(self.ii, (1, 2)),
+            ),
+            tuple(word_column(i) for i in range(4)),
+        ]
+
     def score_ngram(self, score_fn, w1, w2, w3, w4):
         n_all = self.N
         n_iiii = self.ngram_fd[(w1, w2, w3, w4)]
@@ -348,6 +730,85 @@ class QuadgramCollocationFinder(AbstractCollocationFinder):
         )
 
 
+class _CountMerger(object):
+    """
+    Counts integer codes given a batch at a time, as a sorted array of the
+    distinct codes and an array of their counts, and, if *positions* is
+    true, an array of the first position at which each code occurs.
+    Batches are merged into the totals once they hold more codes than the
+    totals, so that each count is merged a logarithmic number of times.
+    """
+
+    def __init__(self, positions=False):
+        empty = numpy.zeros(0, numpy.int64)
+        self._totals = (empty,) * (3 if positions else 2)
+        self._batches = []
+        self._batch_size = 0
+
+    def add(self, codes, counts=None, positions=None):
+        """Adds a batch of codes, or of distinct codes with their *counts*,
+        and the position of each code if positions are counted."""
+        if counts is None:
+            if positions is None:
+                codes, counts = numpy.unique(codes, return_counts=True)
+            else:
+                codes, index, counts = numpy.unique(
+                    codes, return_index=True, return_counts=True
+                )
+                positions = positions[index]
+        batch = (codes, counts) if positions is None else (codes, counts, positions)
+        self._batches.append(batch)
+        self._batch_size += len(codes)
+        if self._batch_size > len(self._totals[0]):
+            self._merge()
+
+    def merged(self):
+        """Returns the distinct codes, sorted, and their total counts (and
+        first positions)."""
+        self._merge()
+        return self._totals
+
+    def _merge(self):
+        columns = [
+            numpy.concatenate(arrays) for arrays in zip(self._totals, *self._batches)
+        ]
+        order = numpy.argsort(columns[0], kind='mergesort')
+        columns = [column[order] for column in columns]
+        codes = columns[0]
+        if len(codes):
+            starts = numpy.flatnonzero(
+                numpy.concatenate(([True], codes[1:] != codes[:-1]))
+            )
+            columns[0] = codes[starts]
+            columns[1] = numpy.add.reduceat(columns[1], starts)
+            if len(columns) == 3:
+                columns[2] = numpy.minimum.reduceat(columns[2], starts)
+        self._totals = tuple(columns)
+        self._batches = []
+        self._batch_size = 0
+
+
+def _array_measure(score_fn):
+    """Returns whether *score_fn* is an association measure that accepts
+    arrays of marginals."""
+    try:
+        if getattr(score_fn, '__func__', score_fn) not in _ARRAY_MEASURES:
+            return False
+    except TypeError:  # unhashable
+        return False
+    return getattr(score_fn, '__self__', None) in (
+        None,
+        BigramAssocMeasures,
+        TrigramAssocMeasures,
+        QuadgramAssocMeasures,
+    )
+
+
+def _finder_from_words(args):
+    cls, words, kwargs = args
+    return cls.from_words(words, **kwargs)
+
+
 def demo(scorer=None, compare_scorer=None):
     """Finds bigram collocations in the files of the WebText corpus."""
     from nltk.metrics import (
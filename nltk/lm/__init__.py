@@ -226,12 +226,13 @@ from nltk.lm.models import (
     WittenBellInterpolated,
     KneserNeyInterpolated,
 )
-from nltk.lm.counter import NgramCounter
+from nltk.lm.counter import CompactNgramCounter, NgramCounter
 from nltk.lm.vocabulary import Vocabulary
 
 __all__ = [
     "Vocabulary",
     "NgramCounter",
+    "CompactNgramCounter",
     "MLE",
     "Lidstone",
     "Laplace",
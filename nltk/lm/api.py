@@ -11,6 +11,7 @@ from __future__ import division, unicode_literals
 import random
 from abc import ABCMeta, abstractmethod
 from bisect import bisect
+from collections import defaultdict
 
 from six import add_metaclass
 
@@ -18,6 +19,11 @@ from nltk.lm.counter import NgramCounter
 from nltk.lm.util import log_base2
 from nltk.lm.vocabulary import Vocabulary
 
+try:
+    import numpy as np
+except ImportError:
+    pass
+
 try:
     from itertools import accumulate
 except ImportError:
@@ -65,12 +71,37 @@ class Smoothing(object):
     def alpha_gamma(self, word, context):
         raise NotImplementedError()
 
+    def unigram_score_many(self, words):
+        """Unigram scores for a sequence of words as a NumPy array.
+
+        Subclasses can override this to avoid scoring one word at a time.
+        """
+        return np.array([self.unigram_score(word) for word in words], dtype=float)
+
+    def alpha_gamma_many(self, words, contexts):
+        """Alpha and gamma values for parallel sequences of words and contexts.
+
+        :return: Two NumPy arrays with one alpha and one gamma per word.
+        """
+        alphas, gammas = np.zeros(len(words)), np.zeros(len(words))
+        for i, (word, context) in enumerate(zip(words, contexts)):
+            alphas[i], gammas[i] = self.alpha_gamma(word, context)
+        return alphas, gammas
+
 
 def _mean(items):
     """Return average (aka mean) for sequence of items."""
     return sum(items) / len(items)
 
 
+def _group_by_context(contexts):
+    """Map every distinct context to the positions where it occurs."""
+    groups = defaultdict(list)
+    for position, context in enumerate(contexts):
+        groups[context].append(position)
+    return groups
+
+
 def _random_generator(seed_or_generator):
     if isinstance(seed_or_generator, random.Random):
         return seed_or_generator
@@ -160,6 +191,62 @@ class LanguageModel(object):
         """
         raise NotImplementedError()
 
+    def score_many(self, text_ngrams):
+        """Masks OOV words and scores the last word of every ngram.
+
+        Equivalent to `[self.score(ngram[-1], ngram[:-1]) for ngram in text_ngrams]`,
+        but the ngrams are scored as one batch: statistics shared by ngrams
+        with the same context are computed only once.
+
+        :param Iterable(tuple(str)) text_ngrams: A sequence of ngram tuples.
+        :rtype: numpy.ndarray
+
+        """
+        masked = {}
+
+        def lookup(word):
+            if word not in masked:
+                masked[word] = self.vocab.lookup(word)
+            return masked[word]
+
+        words, contexts = [], []
+        for ngram in text_ngrams:
+            words.append(lookup(ngram[-1]))
+            contexts.append(tuple(lookup(w) for w in ngram[:-1]))
+        return self.unmasked_score_many(words, contexts)
+
+    def unmasked_score_many(self, words, contexts):
+        """Score words given their contexts without masking them.
+
+        By default this calls `unmasked_score` for every pair. Concrete
+        models can override it to share work between words with the
+        same context.
+
+        :param list(str) words: Words for which we want the scores.
+        :param list(tuple(str)) contexts: The context of each word.
+        An empty tuple asks for a unigram score.
+        :rtype: numpy.ndarray
+
+        """
+        return np.array(
+            [self.unmasked_score(w, c or None) for w, c in zip(words, contexts)],
+            dtype=float,
+        )
+
+    def _counts_and_totals(self, words, contexts):
+        """Ngram counts of each word and total counts of each context.
+
+        Looks up every distinct context only once.
+
+        :return: Two NumPy arrays parallel to `words`.
+        """
+        counts, totals = np.zeros(len(words)), np.zeros(len(words))
+        for context, positions in _group_by_context(contexts).items():
+            context_counts = self.context_counts(context)
+            totals[positions] = context_counts.N()
+            counts[positions] = [context_counts[words[i]] for i in positions]
+        return counts, totals
+
     def logscore(self, word, context=None):
         """Evaluate the log score of this word in this context.
 
@@ -168,6 +255,19 @@ class LanguageModel(object):
         """
         return log_base2(self.score(word, context))
 
+    def logscore_many(self, text_ngrams):
+        """Evaluate the log scores of many ngrams at once.
+
+        The arguments are the same as for `score_many`. On large evaluation
+        texts, `-logscore_many(text_ngrams).mean()` computes the same
+        cross-entropy as `entropy` much faster.
+
+        :rtype: numpy.ndarray
+
+        """
+        with np.errstate(divide="ignore"):
+            return np.log2(self.score_many(text_ngrams))
+
     def context_counts(self, context):
         """Helper method for retrieving counts for a given context.
 
@@ -198,6 +298,26 @@ class LanguageModel(object):
         """
         return pow(2.0, self.entropy(text_ngrams))
 
+    def save_arpa(self, path):
+        """Write the model's backoff tables to `path` in ARPA format.
+
+        See `nltk.lm.arpa` for details and for loading the model back.
+
+        """
+        from nltk.lm.arpa import save_arpa
+
+        save_arpa(self, path)
+
+    def save_binary(self, path):
+        """Write the model's backoff tables to `path` in a memory-mappable format.
+
+        See `nltk.lm.arpa` for details and for loading the model back.
+
+        """
+        from nltk.lm.arpa import save_binary
+
+        save_binary(self, path)
+
     def generate(self, num_words=1, text_seed=None, random_seed=None):
         """Generate words from the model.
 
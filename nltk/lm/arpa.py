@@ -0,0 +1,454 @@
+# -*- coding: utf-8 -*-
+# Natural Language Toolkit: Language Models
+#
+# Copyright (C) 2001-2019 NLTK Project
+# URL: <http://nltk.org/>
+# For license information, see LICENSE.TXT
+"""
+Language Model Storage
+----------------------
+
+Trained ngram models can be stored as backoff tables, either in the
+text ARPA format understood by most language modeling toolkits or in a
+compact binary format that is memory-mapped when loaded.
+
+Every ngram seen in training (and every context of a longer ngram) is stored
+with its log10 probability under the model.
+Ngrams that are used as contexts also get a log10 backoff weight, chosen so
+that the probabilities of all words in that context still sum to one.
+For interpolated models such as `KneserNeyInterpolated` these backoff tables
+reproduce the model's scores exactly for every context seen in training.
+Unseen contexts back off to shorter ones, as is standard for ARPA models.
+
+    >>> from nltk.lm import KneserNeyInterpolated
+    >>> from nltk.lm.preprocessing import padded_everygram_pipeline
+    >>> train, vocab = padded_everygram_pipeline(2, [list("abcd"), list("acdb")])
+    >>> lm = KneserNeyInterpolated(2)
+    >>> lm.fit(train, vocab)
+
+The loaded model scores words like the original one, but it reads the
+probabilities from the stored tables.
+
+    >>> import os, tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), "model.arpa")
+    >>> lm.save_arpa(path)
+    >>> from nltk.lm.arpa import load_arpa
+    >>> arpa_lm = load_arpa(path)
+    >>> round(arpa_lm.score("b", ["a"]), 4) == round(lm.score("b", ["a"]), 4)
+    True
+
+Binary models are loaded lazily: the arrays stay in the mapped file and
+are shared by all processes that load the same model.
+
+    >>> path = os.path.join(tempfile.mkdtemp(), "model.bin")
+    >>> lm.save_binary(path)
+    >>> from nltk.lm.arpa import load_binary
+    >>> binary_lm = load_binary(path)
+    >>> round(binary_lm.score("b", ["a"]), 4) == round(lm.score("b", ["a"]), 4)
+    True
+
+"""
+from __future__ import division, unicode_literals
+
+import io
+import json
+import math
+import struct
+from collections import defaultdict
+
+from six import string_types
+
+from nltk import compat
+from nltk.lm.api import LanguageModel
+from nltk.lm.util import NEG_INF, prefix_range
+from nltk.lm.vocabulary import _dispatched_lookup
+
+try:
+    import numpy as np
+except ImportError:
+    pass
+
+_BINARY_MAGIC = b"NLTKLM01"
+# ARPA files conventionally use -99 for the logarithm of zero.
+_ARPA_LOG_ZERO = -99.0
+_LOG10_2 = math.log10(2)
+
+
+@compat.python_2_unicode_compatible
+class _SortedVocabulary(object):
+    """Vocabulary stored as sorted UTF-8 strings in one byte array.
+
+    Words are found by binary search, so the arrays can be memory-mapped
+    without building a dictionary at load time.
+    A word's position in the sorted order is its integer id.
+
+    """
+
+    def __init__(self, blob, offsets, unk_label="<UNK>"):
+        self._blob = blob
+        self._offsets = offsets
+        self.unk_label = unk_label
+
+    def _word_bytes(self, idx):
+        return self._blob[self._offsets[idx] : self._offsets[idx + 1]].tobytes()
+
+    def word(self, idx):
+        """Return the word with integer id `idx`."""
+        return self._word_bytes(idx).decode("utf-8")
+
+    def index(self, word):
+        """Return the integer id of `word`, or None if it is not stored."""
+        if not isinstance(word, string_types):
+            return None
+        key = word.encode("utf-8")
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._word_bytes(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self) and self._word_bytes(lo) == key:
+            return lo
+        return None
+
+    def lookup(self, words):
+        """Look up one or more words, as `Vocabulary.lookup` does."""
+        return _dispatched_lookup(words, self)
+
+    def __contains__(self, word):
+        return self.index(word) is not None
+
+    def __iter__(self):
+        return (self.word(idx) for idx in range(len(self)))
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __str__(self):
+        return "<{0} with unk_label='{1}' and {2} items>".format(
+            self.__class__.__name__, self.unk_label, len(self)
+        )
+
+
+@compat.python_2_unicode_compatible
+class ArpaLanguageModel(LanguageModel):
+    """Backoff ngram model answering scores from stored probability tables.
+
+    Instances are created by `load_arpa` and `load_binary`.  The tables are
+    fixed once loaded, so the model cannot be trained: `fit` raises
+    `TypeError`.
+    The ngrams of each order are kept as a sorted array of word id rows with
+    parallel arrays of log10 probabilities and log10 backoff weights.
+
+    """
+
+    def __init__(self, order, vocabulary, ngrams, logprobs, backoffs):
+        """
+        :param int order: Largest ngram order in the tables.
+        :param _SortedVocabulary vocabulary: Words and their integer ids.
+        :param dict ngrams: Sorted word id rows for each ngram order.
+        :param dict logprobs: log10 probabilities for each ngram order.
+        :param dict backoffs: log10 backoff weights for each ngram order.
+        """
+        super(ArpaLanguageModel, self).__init__(order, vocabulary=vocabulary)
+        self._ngrams = ngrams
+        self._logprobs = logprobs
+        self._backoffs = backoffs
+
+    def fit(self, text, vocabulary_text=None):
+        raise TypeError("Models loaded from backoff tables cannot be fit.")
+
+    def _find(self, ids):
+        rows = self._ngrams.get(len(ids))
+        if rows is None:
+            return None
+        lo, hi = prefix_range(rows, ids)
+        return lo if hi > lo else None
+
+    def _log10_score(self, word, context):
+        word_id = self.vocab.index(word)
+        if word_id is None:
+            return NEG_INF
+        context = tuple(context or ())[-self.order + 1 :] if self.order > 1 else ()
+        ids = []
+        for w in context:
+            idx = self.vocab.index(w)
+            # No stored ngram contains an unknown word, so drop everything
+            # up to and including it from the context.
+            ids = [] if idx is None else ids + [idx]
+        backoff = 0.0
+        while True:
+            row = self._find(ids + [word_id])
+            if row is not None:
+                return backoff + float(self._logprobs[len(ids) + 1][row])
+            if not ids:
+                return NEG_INF
+            row = self._find(ids)
+            if row is not None:
+                backoff += float(self._backoffs[len(ids)][row])
+            ids = ids[1:]
+
+    def unmasked_score(self, word, context=None):
+        return 10.0 ** self._log10_score(word, context)
+
+    def logscore(self, word, context=None):
+        """Evaluate the log score of this word in this context.
+
+        Computed from the stored log10 values, so very small probabilities
+        do not underflow.
+
+        """
+        return (
+            self._log10_score(
+                self.vocab.lookup(word), self.vocab.lookup(context) if context else None
+            )
+            / _LOG10_2
+        )
+
+    def _entries(self):
+        entries = {}
+        for order, rows in self._ngrams.items():
+            entries[order] = [
+                (
+                    tuple(self.vocab.word(idx) for idx in row),
+                    float(logprob),
+                    float(backoff),
+                )
+                for row, logprob, backoff in zip(
+                    rows, self._logprobs[order], self._backoffs[order]
+                )
+            ]
+        return entries
+
+    def __str__(self):
+        return "<{0} with order {1} and {2} ngrams>".format(
+            self.__class__.__name__,
+            self.order,
+            sum(len(rows) for rows in self._ngrams.values()),
+        )
+
+
+def _backoff_entries(model):
+    """Compute the backoff tables of a trained model.
+
+    :return: Maps each ngram order to a sorted list of
+        `(ngram, log10 probability, log10 backoff weight)` tuples.
+    :rtype: dict(int, list(tuple))
+    """
+    if isinstance(model, ArpaLanguageModel):
+        return model._entries()
+
+    listed = {1: set((word,) for word in model.vocab)}
+    for order in range(2, model.order + 1):
+        listed[order] = set()
+        for context in model.counts[order].conditions():
+            listed[order].update(
+                context + (word,)
+                for word, count in model.counts[order][context].items()
+                if count > 0
+            )
+    # Backoff weights are attached to contexts, so every context of a stored
+    # ngram must be stored itself.
+    for order in range(model.order, 2, -1):
+        listed[order - 1].update(ngram[:-1] for ngram in listed[order])
+
+    scores = {}
+    for order, ngrams in listed.items():
+        ngrams = sorted(ngrams)
+        probs = model.unmasked_score_many(
+            [ngram[-1] for ngram in ngrams], [ngram[:-1] for ngram in ngrams]
+        )
+        scores[order] = dict(zip(ngrams, probs.tolist()))
+
+    entries = {}
+    for order, ngram_scores in scores.items():
+        # For every context, the probability mass of its seen continuations
+        # under this order and under the next lower order.
+        continuations = defaultdict(list)
+        for ngram in scores.get(order + 1, ()):
+            continuations[ngram[:-1]].append(ngram)
+        entries[order] = []
+        for ngram in sorted(ngram_scores):
+            backoff = 0.0
+            if ngram in continuations:
+                seen = continuations[ngram]
+                lower = model.unmasked_score_many(
+                    [cont[-1] for cont in seen], [ngram[1:]] * len(seen)
+                )
+                left = 1.0 - sum(scores[order + 1][cont] for cont in seen)
+                left_lower = 1.0 - float(lower.sum())
+                if left > 1e-10 and left_lower > 1e-10:
+                    backoff = math.log10(left / left_lower)
+                else:
+                    backoff = NEG_INF
+            prob = ngram_scores[ngram]
+            entries[order].append(
+                (ngram, math.log10(prob) if prob > 0 else NEG_INF, backoff)
+            )
+    return entries
+
+
+def _format_log10(value):
+    return "{0:.7g}".format(max(value, _ARPA_LOG_ZERO))
+
+
+def _parse_log10(value):
+    value = float(value)
+    return NEG_INF if value <= _ARPA_LOG_ZERO else value
+
+
+def save_arpa(model, path):
+    """Write the backoff tables of `model` to `path` in ARPA format.
+
+    Words may not contain whitespace, since the format separates them by it.
+
+    :param LanguageModel model: A trained model.
+    :param str path: Output file name.
+    """
+    entries = _backoff_entries(model)
+    with io.open(path, "w", encoding="utf-8") as fout:
+        fout.write("\\data\\\n")
+        for order in sorted(entries):
+            fout.write("ngram {0}={1}\n".format(order, len(entries[order])))
+        for order in sorted(entries):
+            fout.write("\n\\{0}-grams:\n".format(order))
+            for ngram, logprob, backoff in entries[order]:
+                line = _format_log10(logprob) + "\t" + " ".join(ngram)
+                if order < model.order:
+                    line += "\t" + _format_log10(backoff)
+                fout.write(line + "\n")
+        fout.write("\n\\end\\\n")
+
+
+def _read_arpa_entries(path):
+    entries = defaultdict(list)
+    order = None
+    with io.open(path, encoding="utf-8") as fin:
+        for line in fin:
+            line = line.strip()
+            if not line or line == "\\data\\" or line.startswith("ngram "):
+                continue
+            if line == "\\end\\":
+                break
+            if line.startswith("\\") and line.endswith("-grams:"):
+                order = int(line[1 : -len("-grams:")])
+                continue
+            if order is None:
+                raise ValueError("Malformed ARPA file: {0!r}".format(line))
+            fields = line.split()
+            if len(fields) not in (order + 1, order + 2):
+                raise ValueError(
+                    "Expected a {0}-gram entry, got: {1!r}".format(order, line)
+                )
+            backoff = _parse_log10(fields[order + 1]) if len(fields) > order + 1 else 0.0
+            entries[order].append(
+                (tuple(fields[1 : order + 1]), _parse_log10(fields[0]), backoff)
+            )
+    return entries
+
+
+def _build_tables(entries):
+    """Turn backoff entries into sorted vocabulary and ngram arrays."""
+    words = sorted(
+        set(ngram[0] for ngram, _, _ in entries[1]), key=lambda w: w.encode("utf-8")
+    )
+    encoded = [word.encode("utf-8") for word in words]
+    word_ids = dict((word, idx) for idx, word in enumerate(words))
+    arrays = {
+        "words": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        "word_offsets": np.cumsum([0] + [len(w) for w in encoded], dtype=np.int64),
+    }
+    for order, order_entries in entries.items():
+        try:
+            rows = np.array(
+                [[word_ids[w] for w in ngram] for ngram, _, _ in order_entries],
+                dtype=np.int32,
+            ).reshape(-1, order)
+        except KeyError as e:
+            raise ValueError("Ngram word {0} is not among the unigrams".format(e))
+        # Sort rows lexicographically: np.lexsort treats the last key as primary.
+        sort = np.lexsort(rows.T[::-1]) if len(rows) else np.arange(0)
+        arrays["ngrams_{0}".format(order)] = rows[sort]
+        arrays["logprobs_{0}".format(order)] = np.array(
+            [logprob for _, logprob, _ in order_entries], dtype=np.float32
+        )[sort]
+        arrays["backoffs_{0}".format(order)] = np.array(
+            [backoff for _, _, backoff in order_entries], dtype=np.float32
+        )[sort]
+    return arrays
+
+
+def _model_from_arrays(order, arrays, unk_label):
+    vocab = _SortedVocabulary(arrays["words"], arrays["word_offsets"], unk_label)
+    tables = [{}, {}, {}]
+    for k in range(1, order + 1):
+        for table, name in zip(tables, ("ngrams", "logprobs", "backoffs")):
+            table[k] = arrays["{0}_{1}".format(name, k)]
+    return ArpaLanguageModel(order, vocab, *tables)
+
+
+def load_arpa(path, unk_label="<UNK>"):
+    """Load a backoff model from an ARPA file.
+
+    :param str path: Input file name.
+    :param str unk_label: Label that unknown words are mapped to. Toolkits
+        other than NLTK usually write it as "<unk>".
+    :rtype: ArpaLanguageModel
+    """
+    entries = _read_arpa_entries(path)
+    if 1 not in entries:
+        raise ValueError("ARPA file {0} has no unigrams".format(path))
+    return _model_from_arrays(max(entries), _build_tables(entries), unk_label)
+
+
+def save_binary(model, path):
+    """Write the backoff tables of `model` to `path` in binary format.
+
+    The file holds a short JSON header followed by aligned NumPy arrays,
+    which `load_binary` maps into memory without copying them.
+
+    :param LanguageModel model: A trained model.
+    :param str path: Output file name.
+    """
+    arrays = _build_tables(_backoff_entries(model))
+    layout = {}
+    offset = 0
+    for name, array in sorted(arrays.items()):
+        layout[name] = [array.dtype.str, list(array.shape), offset]
+        offset += -(-array.nbytes // 8) * 8
+    header = json.dumps(
+        {"order": model.order, "unk_label": model.vocab.unk_label, "arrays": layout}
+    ).encode("utf-8")
+    header += b" " * (-(len(_BINARY_MAGIC) + 8 + len(header)) % 8)
+    with open(path, "wb") as fout:
+        fout.write(_BINARY_MAGIC + struct.pack("<Q", len(header)) + header)
+        for name, array in sorted(arrays.items()):
+            data = np.ascontiguousarray(array).tobytes()
+            fout.write(data + b"\0" * (-len(data) % 8))
+
+
+def load_binary(path):
+    """Memory-map a model written by `save_binary`.
+
+    Scores are read from the mapped file on demand, so loading is nearly
+    instantaneous and the pages are shared between processes.
+
+    :param str path: Input file name.
+    :rtype: ArpaLanguageModel
+    """
+    with open(path, "rb") as fin:
+        if fin.read(len(_BINARY_MAGIC)) != _BINARY_MAGIC:
+            raise ValueError("{0} is not a binary NLTK language model".format(path))
+        (header_size,) = struct.unpack("<Q", fin.read(8))
+        header = json.loads(fin.read(header_size).decode("utf-8"))
+    start = len(_BINARY_MAGIC) + 8 + header_size
+    arrays = {}
+    for name, (dtype, shape, offset) in header["arrays"].items():
+        if not np.prod(shape):
+            arrays[name] = np.empty(shape, dtype=dtype)
+            continue
+        arrays[name] = np.memmap(
+            path, dtype=dtype, mode="r", offset=start + offset, shape=tuple(shape)
+        )
+    return _model_from_arrays(header["order"], arrays, header["unk_label"])
@@ -10,14 +10,21 @@ Language Model Counter
 ----------------------
 """
 
-from __future__ import unicode_literals
+from __future__ import division, unicode_literals
 
-from collections import Sequence, defaultdict
+from array import array
+from collections import Mapping, Sequence, defaultdict
 
 from six import string_types
 from nltk import compat
+from nltk.lm.util import prefix_range
 from nltk.probability import ConditionalFreqDist, FreqDist
 
+try:
+    import numpy as np
+except ImportError:
+    pass
+
 
 @compat.python_2_unicode_compatible
 class NgramCounter(object):
@@ -133,6 +140,25 @@ class NgramCounter(object):
                 context, word = ngram[:-1], ngram[-1]
                 self[ngram_order][context][word] += 1
 
+    def merge(self, other):
+        """Adds the counts of another `NgramCounter` to this one.
+
+        Useful for combining counters filled from separate parts of a corpus.
+
+        >>> from nltk.lm import NgramCounter
+        >>> counts = NgramCounter([[("a", "b"), ("a",)]])
+        >>> counts.merge(NgramCounter([[("a", "b"), ("b",)]]))
+        >>> counts[["a"]]["b"], counts["a"], counts["b"]
+        (2, 1, 1)
+
+        """
+        for order, other_counts in other._counts.items():
+            if order == 1:
+                self.unigrams.update(other_counts)
+                continue
+            for context, continuations in other_counts.items():
+                self[order][context].update(continuations)
+
     def N(self):
         """Returns grand total number of ngrams stored.
 
@@ -166,3 +192,358 @@ class NgramCounter(object):
 
     def __contains__(self, item):
         return item in self._counts
+
+
+@compat.python_2_unicode_compatible
+class _CompactFreqDist(Mapping):
+    """Read-only `FreqDist`-like view on the continuations of one context.
+
+    Wraps a slice of the sorted word id and count arrays of a
+    `CompactNgramCounter`, so creating it copies no data.
+    Like `FreqDist`, looking up a missing word returns 0.
+
+    """
+
+    def __init__(self, word_ids, words, ids, counts):
+        self._word_ids = word_ids
+        self._words = words
+        self._ids = ids
+        self._counts = counts
+        self._N = None
+
+    def _position(self, word):
+        idx = self._word_ids.get(word)
+        if idx is None:
+            return None
+        pos = self._ids.searchsorted(idx)
+        if pos < len(self._ids) and self._ids[pos] == idx:
+            return pos
+        return None
+
+    def __getitem__(self, word):
+        pos = self._position(word)
+        return 0 if pos is None else int(self._counts[pos])
+
+    def __contains__(self, word):
+        return self._position(word) is not None
+
+    def get(self, word, default=None):
+        pos = self._position(word)
+        return default if pos is None else int(self._counts[pos])
+
+    def __iter__(self):
+        return (self._words[idx] for idx in self._ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def values(self):
+        return [int(count) for count in self._counts]
+
+    def items(self):
+        return list(zip(self, self.values()))
+
+    def N(self):
+        """Return the total number of sample outcomes in this view.
+
+        :rtype: int
+        """
+        if self._N is None:
+            self._N = int(self._counts.sum())
+        return self._N
+
+    def B(self):
+        """Return the number of distinct samples with nonzero counts.
+
+        :rtype: int
+        """
+        return len(self)
+
+    def freq(self, sample):
+        """Return the relative frequency of `sample`, as in `FreqDist.freq`.
+
+        :rtype: float
+        """
+        n = self.N()
+        if n == 0:
+            return 0
+        return self[sample] / n
+
+    def most_common(self, n=None):
+        """List the `n` most common samples and their counts.
+
+        :rtype: list(tuple)
+        """
+        order = np.argsort(-self._counts, kind="mergesort")
+        if n is not None:
+            order = order[:n]
+        return [(self._words[self._ids[i]], int(self._counts[i])) for i in order]
+
+    def max(self):
+        """Return the sample with the greatest number of outcomes.
+
+        :raises ValueError: if the view is empty.
+        """
+        if len(self) == 0:
+            raise ValueError(
+                "A CompactNgramCounter view must have at least one sample "
+                "before max is defined."
+            )
+        return self.most_common(1)[0][0]
+
+    def __str__(self):
+        return "<FreqDist with {0} samples and {1} outcomes>".format(
+            len(self), self.N()
+        )
+
+    def __repr__(self):
+        return self.__str__()
+
+
+@compat.python_2_unicode_compatible
+class _CompactConditionalFreqDist(object):
+    """Read-only `ConditionalFreqDist`-like view on one ngram order."""
+
+    def __init__(self, counter, order):
+        self._counter = counter
+        self._order = order
+
+    def __getitem__(self, context):
+        return self._counter._context_counts(self._order, tuple(context))
+
+    def __contains__(self, context):
+        return bool(self[context])
+
+    def conditions(self):
+        """Return a list of the contexts seen for this ngram order.
+
+        :rtype: list(tuple(str))
+        """
+        return list(self._counter._contexts(self._order))
+
+    def keys(self):
+        return self.conditions()
+
+    def __iter__(self):
+        return iter(self.conditions())
+
+    def __len__(self):
+        return len(self.conditions())
+
+    def N(self):
+        """Return the total number of ngrams of this order.
+
+        :rtype: int
+        """
+        counts = self._counter._order_arrays(self._order)[1]
+        return int(counts.sum())
+
+    def __str__(self):
+        return "<ConditionalFreqDist with {0} conditions>".format(len(self))
+
+    def __repr__(self):
+        return self.__str__()
+
+
+@compat.python_2_unicode_compatible
+class CompactNgramCounter(object):
+    """Memory-efficient, integer-encoded alternative to `NgramCounter`.
+
+    Words are mapped to consecutive integer ids as they are seen and the
+    ngrams of each order are stored as a sorted NumPy array of id rows
+    with a parallel array of counts.
+    Counts are answered through the same interface as `NgramCounter`, so
+    this class can be passed as the `counter` to any language model.
+
+    >>> text = [["a", "b", "c", "d"], ["a", "c", "d", "c"]]
+    >>> from nltk.util import ngrams
+    >>> text_bigrams = [ngrams(sent, 2) for sent in text]
+    >>> text_unigrams = [ngrams(sent, 1) for sent in text]
+    >>> from nltk.lm.counter import CompactNgramCounter
+    >>> ngram_counts = CompactNgramCounter(text_bigrams + text_unigrams)
+    >>> ngram_counts['a']
+    2
+    >>> ngram_counts['aliens']
+    0
+    >>> sorted(ngram_counts[['a']].items())
+    [('b', 1), ('c', 1)]
+    >>> ngram_counts[['a']]['b']
+    1
+    >>> ngram_counts[['a']].N()
+    2
+    >>> print(ngram_counts)
+    <CompactNgramCounter with 2 ngram orders and 14 ngrams>
+
+    Updates are buffered as flat arrays of ids and merged into the sorted
+    arrays in batches of `buffer_size` ids, or as soon as counts are queried.
+
+    >>> ngram_counts.update([ngrams(["d", "e", "f"], 1)])
+    >>> ngram_counts['e']
+    1
+
+    Unlike `NgramCounter`, the objects returned by indexing are read-only
+    views: modify the counts only through `update`.
+
+    """
+
+    def __init__(self, ngram_text=None, buffer_size=10000000):
+        """Creates a new CompactNgramCounter.
+
+        :param ngram_text: Optional text containing sentences of ngrams, as for `update` method.
+        :type ngram_text: Iterable(Iterable(tuple(str))) or None
+        :param int buffer_size: Number of word ids to buffer before merging
+            them into the sorted count arrays.
+
+        """
+        self._word_ids = {}
+        self._words = []
+        self._ngrams = {}
+        self._values = {}
+        self._pending = {}
+        self._n_pending = 0
+        self.buffer_size = buffer_size
+
+        if ngram_text:
+            self.update(ngram_text)
+
+    def _word_id(self, word):
+        idx = self._word_ids.get(word)
+        if idx is None:
+            idx = self._word_ids[word] = len(self._words)
+            self._words.append(word)
+        return idx
+
+    def update(self, ngram_text):
+        """Updates ngram counts from `ngram_text`.
+
+        :param Iterable(Iterable(tuple(str))) ngram_text: Text containing senteces of ngrams.
+        :raises TypeError: if the ngrams are not tuples.
+
+        """
+        word_id = self._word_id
+        for sent in ngram_text:
+            for ngram in sent:
+                if not isinstance(ngram, tuple):
+                    raise TypeError(
+                        "Ngram <{0}> isn't a tuple, "
+                        "but {1}".format(ngram, type(ngram))
+                    )
+                buf = self._pending.get(len(ngram))
+                if buf is None:
+                    buf = self._pending[len(ngram)] = array("i")
+                buf.extend(word_id(word) for word in ngram)
+                self._n_pending += len(ngram)
+            if self._n_pending >= self.buffer_size:
+                self._flush()
+
+    def _flush(self):
+        """Merge the buffered ngrams into the sorted count arrays."""
+        pending, self._pending, self._n_pending = self._pending, {}, 0
+        for order, buf in pending.items():
+            if not buf:
+                continue
+            rows = np.frombuffer(buf, dtype=np.intc).astype(np.int32)
+            rows = rows.reshape(-1, order)
+            self._add_rows(order, rows, np.ones(len(rows), dtype=np.int64))
+
+    def _add_rows(self, order, rows, counts):
+        """Add `counts` of the ngram id `rows` to the sorted arrays of `order`."""
+        if order in self._ngrams:
+            rows = np.concatenate([self._ngrams[order], rows])
+            counts = np.concatenate([self._values[order], counts])
+        # np.unique sorts the rows lexicographically, which lets us find
+        # every continuation of a context by binary search.
+        self._ngrams[order], inverse = np.unique(rows, axis=0, return_inverse=True)
+        self._values[order] = np.bincount(
+            inverse, weights=counts, minlength=len(self._ngrams[order])
+        ).astype(np.int64)
+
+    def merge(self, other):
+        """Adds the counts of another `CompactNgramCounter` to this one.
+
+        >>> from nltk.lm.counter import CompactNgramCounter
+        >>> counts = CompactNgramCounter([[("a", "b"), ("a",)]])
+        >>> counts.merge(CompactNgramCounter([[("a", "b"), ("b",)]]))
+        >>> counts[["a"]]["b"], counts["a"], counts["b"]
+        (2, 1, 1)
+
+        """
+        if self._n_pending:
+            self._flush()
+        translate = np.array(
+            [self._word_id(word) for word in other._words], dtype=np.int32
+        )
+        for order in other._orders():
+            rows, counts = other._order_arrays(order)
+            if len(rows):
+                self._add_rows(order, translate[rows], counts)
+
+    def _order_arrays(self, order):
+        if self._n_pending:
+            self._flush()
+        if order not in self._ngrams:
+            return (
+                np.empty((0, order), dtype=np.int32),
+                np.empty(0, dtype=np.int64),
+            )
+        return self._ngrams[order], self._values[order]
+
+    def _context_counts(self, order, context):
+        """Return a `_CompactFreqDist` over the words following `context`."""
+        rows, counts = self._order_arrays(order)
+        ids = [self._word_ids.get(word) for word in context]
+        lo, hi = (0, 0) if None in ids else prefix_range(rows, ids)
+        return _CompactFreqDist(
+            self._word_ids, self._words, rows[lo:hi, -1], counts[lo:hi]
+        )
+
+    def _contexts(self, order):
+        rows = self._order_arrays(order)[0]
+        if order == 1 or not len(rows):
+            return []
+        contexts = rows[:, :-1]
+        is_new = np.ones(len(contexts), dtype=bool)
+        is_new[1:] = (contexts[1:] != contexts[:-1]).any(axis=1)
+        return [tuple(self._words[idx] for idx in row) for row in contexts[is_new]]
+
+    @property
+    def unigrams(self):
+        return self._context_counts(1, ())
+
+    def N(self):
+        """Returns grand total number of ngrams stored.
+
+        :rtype: int
+
+        >>> from nltk.lm.counter import CompactNgramCounter
+        >>> counts = CompactNgramCounter([[("a", "b"), ("c",), ("d", "e")]])
+        >>> counts.N()
+        3
+
+        """
+        return sum(int(self._order_arrays(order)[1].sum()) for order in self._orders())
+
+    def _orders(self):
+        return set(self._ngrams) | set(self._pending) | {1}
+
+    def __getitem__(self, item):
+        """User-friendly access to ngram counts."""
+        if isinstance(item, int):
+            if item == 1:
+                return self.unigrams
+            return _CompactConditionalFreqDist(self, item)
+        elif isinstance(item, string_types):
+            return self.unigrams[item]
+        elif isinstance(item, Sequence):
+            return self._context_counts(len(item) + 1, tuple(item))
+
+    def __str__(self):
+        return "<{0} with {1} ngram orders and {2} ngrams>".format(
+            self.__class__.__name__, len(self), self.N()
+        )
+
+    def __len__(self):
+        return len(self._orders())
+
+    def __contains__(self, item):
+        return item in self._orders()
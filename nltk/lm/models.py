@@ -12,6 +12,11 @@ from nltk import compat
 from nltk.lm.api import LanguageModel, Smoothing
 from nltk.lm.smoothing import KneserNey, WittenBell
 
+try:
+    import numpy as np
+except ImportError:
+    pass
+
 
 @compat.python_2_unicode_compatible
 class MLE(LanguageModel):
@@ -29,6 +34,11 @@ class MLE(LanguageModel):
         """
         return self.context_counts(context).freq(word)
 
+    def unmasked_score_many(self, words, contexts):
+        counts, totals = self._counts_and_totals(words, contexts)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(totals > 0, counts / totals, 0.0)
+
 
 @compat.python_2_unicode_compatible
 class Lidstone(LanguageModel):
@@ -53,6 +63,10 @@ class Lidstone(LanguageModel):
         norm_count = counts.N()
         return (word_count + self.gamma) / (norm_count + len(self.vocab) * self.gamma)
 
+    def unmasked_score_many(self, words, contexts):
+        counts, totals = self._counts_and_totals(words, contexts)
+        return (counts + self.gamma) / (totals + len(self.vocab) * self.gamma)
+
 
 @compat.python_2_unicode_compatible
 class Laplace(Lidstone):
@@ -83,6 +97,22 @@ class InterpolatedLanguageModel(LanguageModel):
         alpha, gamma = self.estimator.alpha_gamma(word, context)
         return alpha + gamma * self.unmasked_score(word, context[1:])
 
+    def unmasked_score_many(self, words, contexts):
+        """Interpolate all words at once, from unigrams up to full contexts.
+
+        Unrolls the recursion in `unmasked_score`, so at each step the
+        estimator sees every word whose context is long enough together.
+        """
+        scores = self.estimator.unigram_score_many(words)
+        lengths = np.array([len(context) for context in contexts], dtype=int)
+        for k in range(1, lengths.max() + 1 if len(lengths) else 1):
+            positions = np.flatnonzero(lengths >= k)
+            alphas, gammas = self.estimator.alpha_gamma_many(
+                [words[i] for i in positions], [contexts[i][-k:] for i in positions]
+            )
+            scores[positions] = alphas + gammas * scores[positions]
+        return scores
+
 
 class WittenBellInterpolated(InterpolatedLanguageModel):
     """Interpolated version of Witten-Bell smoothing."""
@@ -5,9 +5,13 @@
 # Author: Ilia Kurenkov <ilia.kurenkov@gmail.com>
 # URL: <http://nltk.org/>
 # For license information, see LICENSE.TXT
+from collections import Counter
 from functools import partial
-from itertools import chain
+from itertools import chain, islice
+from multiprocessing import Pool, cpu_count
 
+from nltk.lm.counter import NgramCounter
+from nltk.lm.vocabulary import Vocabulary
 from nltk.util import everygrams, pad_sequence
 
 flatten = chain.from_iterable
@@ -49,3 +53,119 @@ def padded_everygram_pipeline(order, text):
         (everygrams(list(padding_fn(sent)), max_len=order) for sent in text),
         flatten(map(padding_fn, text)),
     )
+
+
+# Vocabulary used by worker processes to mask words, set once per worker by
+# `_init_counting_worker` rather than pickled with every chunk.
+_worker_vocab = None
+
+
+def _init_counting_worker(vocabulary):
+    global _worker_vocab
+    _worker_vocab = vocabulary
+
+
+def _count_chunk(order, reader, counter_cls, count_words, count_ngrams, chunk):
+    """Count the words and padded everygrams of one chunk of sentences."""
+    sents = chunk if reader is None else reader(chunk)
+    words = Counter()
+    counter = counter_cls() if count_ngrams else None
+    for sent in sents:
+        sent = list(pad_both_ends(sent, n=order))
+        if count_words:
+            words.update(sent)
+        if count_ngrams:
+            if _worker_vocab is not None:
+                sent = _worker_vocab.lookup(sent)
+            counter.update([everygrams(sent, max_len=order)])
+    return words, counter
+
+
+def _imap_batches(pool, func, chunks, batch_size):
+    """Map `func` over `chunks` in `pool`, submitting `batch_size` at a time.
+
+    `Pool.imap_unordered` reads its whole input up front; this reads at most
+    one batch of chunks ahead of the results.
+    """
+    chunks = iter(chunks)
+    while True:
+        batch = list(islice(chunks, batch_size))
+        if not batch:
+            return
+        for result in pool.imap_unordered(func, batch):
+            yield result
+
+
+def padded_everygram_counts(
+    order, chunks, reader=None, vocabulary=None, counter=None, processes=None
+):
+    """Count padded everygrams of a sharded corpus in a process pool.
+
+    Parallel equivalent of fitting a model on the output of
+    `padded_everygram_pipeline`. Every chunk of the corpus is counted by one
+    worker, so the memory a worker needs is bounded by the size of a chunk
+    and its counts. The chunks are read a few at a time, and the partial
+    counts are merged as they arrive.
+
+    The result can be passed straight to a model:
+
+        >>> text = [list("abcd"), list("egadbe"), list("bcda")]
+        >>> counter, vocab = padded_everygram_counts(2, [text[:2], text[2:]])
+        >>> from nltk.lm import MLE
+        >>> lm = MLE(2, vocabulary=vocab, counter=counter)
+        >>> lm.counts[["b"]]["c"]
+        2
+        >>> lm.score("c", ["b"])
+        0.6666666666666666
+
+    If `vocabulary` already has counts or a cutoff above 1, words are masked
+    with it before counting ngrams, as `LanguageModel.fit` does. An empty
+    vocabulary with a cutoff is first filled in a separate pass over the chunks,
+    which are then held in a list for the second pass.
+
+    :param int order: Largest ngram length produced by `everygrams`.
+    :param chunks: Parts of the corpus, for example a list of lists of
+        sentences, or file names that `reader` turns into sentences.
+    :param reader: Optional picklable function called in the worker to turn a
+        chunk into an iterable of sentences.
+    :param vocabulary: Optional vocabulary to fill or to mask words with.
+    :type vocabulary: `nltk.lm.Vocabulary` or None
+    :param counter: Optional counter to add the counts to. Workers count into
+        new instances of the same class, so `CompactNgramCounter` also works.
+    :type counter: `nltk.lm.NgramCounter` or None
+    :param processes: Number of worker processes, by default the number of CPUs.
+    :return: The ngram counter and the vocabulary.
+    """
+    vocabulary = Vocabulary() if vocabulary is None else vocabulary
+    counter = NgramCounter() if counter is None else counter
+    processes = processes or cpu_count()
+    batch_size = 2 * processes
+    needs_masking = bool(vocabulary.counts) or vocabulary.cutoff > 1
+
+    if not vocabulary.counts and needs_masking:
+        chunks = list(chunks)
+        pool = Pool(processes)
+        try:
+            count = partial(_count_chunk, order, reader, None, True, False)
+            for words, _ in _imap_batches(pool, count, chunks, batch_size):
+                vocabulary.update(words)
+        finally:
+            pool.close()
+            pool.join()
+
+    pool = Pool(
+        processes,
+        initializer=_init_counting_worker,
+        initargs=(vocabulary if needs_masking else None,),
+    )
+    try:
+        count_words = not needs_masking
+        count = partial(_count_chunk, order, reader, type(counter), count_words, True)
+        for words, chunk_counter in _imap_batches(pool, count, chunks, batch_size):
+            if count_words:
+                vocabulary.update(words)
+            counter.merge(chunk_counter)
+    finally:
+        pool.close()
+        pool.join()
+    return counter, vocabulary
@@ -11,7 +11,12 @@ According to Chen & Goodman 1995 these should work with both Backoff and
 Interpolation.
 """
 
-from nltk.lm.api import Smoothing
+from nltk.lm.api import Smoothing, _group_by_context
+
+try:
+    import numpy as np
+except ImportError:
+    pass
 
 
 def _count_non_zero_vals(dictionary):
@@ -31,6 +36,13 @@ class WittenBell(Smoothing):
     def unigram_score(self, word):
         return self.counts.unigrams.freq(word)
 
+    def unigram_score_many(self, words):
+        unigrams = self.counts.unigrams
+        total = unigrams.N()
+        if total == 0:
+            return np.zeros(len(words))
+        return np.array([unigrams[word] for word in words], dtype=float) / total
+
     def alpha(self, word, context):
         return self.counts[context].freq(word)
 
@@ -38,6 +50,19 @@ class WittenBell(Smoothing):
         n_plus = _count_non_zero_vals(self.counts[context])
         return n_plus / (n_plus + self.counts[len(context) + 1].N())
 
+    def alpha_gamma_many(self, words, contexts):
+        alphas, gammas = np.zeros(len(words)), np.zeros(len(words))
+        order_totals = {}
+        for context, positions in _group_by_context(contexts).items():
+            prefix_counts = self.counts[context]
+            order = len(context) + 1
+            if order not in order_totals:
+                order_totals[order] = self.counts[order].N()
+            n_plus = _count_non_zero_vals(prefix_counts)
+            gammas[positions] = n_plus / (n_plus + order_totals[order])
+            alphas[positions] = [prefix_counts.freq(words[i]) for i in positions]
+        return (1.0 - gammas) * alphas, gammas
+
 
 class KneserNey(Smoothing):
     """Kneser-Ney Smoothing."""
@@ -59,3 +84,15 @@ class KneserNey(Smoothing):
     def gamma(self, prefix_counts):
         return self.discount * _count_non_zero_vals(prefix_counts) / prefix_counts.N()
 
+    def unigram_score_many(self, words):
+        return np.full(len(words), 1.0 / len(self.vocab))
+
+    def alpha_gamma_many(self, words, contexts):
+        counts, totals = np.zeros(len(words)), np.zeros(len(words))
+        gammas = np.zeros(len(words))
+        for context, positions in _group_by_context(contexts).items():
+            prefix_counts = self.counts[context]
+            gammas[positions] = self.gamma(prefix_counts)
+            counts[positions] = [prefix_counts[words[i]] for i in positions]
+            totals[positions] = prefix_counts.N()
+        return np.maximum(counts - self.discount, 0.0) / totals, gammas
@@ -18,3 +18,21 @@ def log_base2(score):
     if score == 0.0:
         return NEG_INF
     return log(score, 2)
+
+
+def prefix_range(rows, prefix):
+    """Find the rows that start with `prefix` in a lexicographically sorted array.
+
+    :param rows: Two-dimensional NumPy array whose rows are sorted.
+    :param prefix: Sequence of values to match against the first columns.
+    :return: `(lo, hi)` such that `rows[lo:hi]` are exactly the matching rows.
+    :rtype: tuple(int, int)
+    """
+    lo, hi = 0, len(rows)
+    for column, value in enumerate(prefix):
+        values = rows[lo:hi, column]
+        lo, hi = (
+            lo + int(values.searchsorted(value, "left")),
+            lo + int(values.searchsorted(value, "right")),
+        )
+    return lo, hi
@@ -19,20 +19,73 @@ from functools import reduce
 
 from six import add_metaclass
 
-_log2 = lambda x: _math.log(x, 2.0)
-_ln = _math.log
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _is_array(*values):
+    """Returns whether any of *values* is a NumPy array."""
+    return numpy is not None and any(isinstance(v, numpy.ndarray) for v in values)
+
+
+def _ln(x):
+    if _is_array(x):
+        return _array_log(numpy.log, x)
+    return _math.log(x)
+
+
+def _log2(x):
+    if _is_array(x):
+        return _array_log(numpy.log2, x)
+    return _math.log(x, 2.0)
+
+
+def _array_log(log, x):
+    """Applies the NumPy logarithm *log* to the array *x*.  As for the
+    scalar measures, the logarithm of 0 is -inf, and of a negative value
+    NaN; results may differ from theirs in the last bit.
+    """
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        return log(numpy.asarray(x, numpy.float64))
+
 
 _product = lambda s: reduce(lambda x, y: x * y, s)
 
 _SMALL = 1e-20
 
 try:
-    from scipy.stats import fisher_exact
+    from scipy.stats import fisher_exact, hypergeom
 except ImportError:
 
     def fisher_exact(*_args, **_kwargs):
         raise NotImplementedError
 
+    hypergeom = None
+
+
+def _fisher_less(n_ii, n_io, n_oi, n_oo):
+    """Returns the p-values of ``fisher_exact([[n_ii, n_io], [n_oi, n_oo]],
+    alternative='less')`` for arrays of table values, computed together
+    from the hypergeometric distribution as scipy does for each table.
+    """
+    if hypergeom is None:
+        raise NotImplementedError
+    table = numpy.broadcast_arrays(
+        *(numpy.asarray(v).astype(numpy.int64) for v in (n_ii, n_io, n_oi, n_oo))
+    )
+    if any((v < 0).any() for v in table):
+        raise ValueError("All values in `table` must be nonnegative.")
+    n_ii, n_io, n_oi, n_oo = table
+    row, column = n_ii + n_io, n_ii + n_oi
+    total = row + n_oi + n_oo
+    # A table with an empty row or column has a p-value of 1.
+    empty = (row == 0) | (row == total) | (column == 0) | (column == total)
+    with numpy.errstate(invalid='ignore', divide='ignore'):
+        pvalue = hypergeom.cdf(n_ii, total, row, column)
+    return numpy.where(empty, 1.0, pvalue)
+
 
 ### Indices to marginals arguments:
 
@@ -64,6 +117,12 @@ class NgramAssocMeasures(object):
     Inheriting classes should define a property _n, and a method _contingency
     which calculates contingency values from marginals in order for all
     association measures defined here to be usable.
+
+    Every measure also accepts NumPy arrays of counts (preferably floats,
+    as integer products may overflow) in place of any of the marginals,
+    and then returns an array of scores, one per element.
+    Where a scalar call would raise ZeroDivisionError, the array score is
+    inf or NaN instead.
     """
 
     _n = 0
@@ -246,6 +305,8 @@ class BigramAssocMeasures(NgramAssocMeasures):
 
         n_ii, n_io, n_oi, n_oo = cls._contingency(*marginals)
 
+        if _is_array(n_ii, n_io, n_oi, n_oo):
+            return _fisher_less(n_ii, n_io, n_oi, n_oo)
         (odds, pvalue) = fisher_exact([[n_ii, n_io], [n_oi, n_oo]], alternative='less')
         return pvalue
 
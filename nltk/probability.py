@@ -45,8 +45,14 @@ import warnings
 import array
 from collections import defaultdict, Counter
 from functools import reduce
+from itertools import islice
 from abc import ABCMeta, abstractmethod
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from six import itervalues, text_type, add_metaclass
 
 from nltk import compat
@@ -2078,6 +2084,518 @@ class ConditionalFreqDist(defaultdict):
         return '<ConditionalFreqDist with %d conditions>' % len(self)
 
 
+##//////////////////////////////////////////////////////
+##  Compact Frequency Distributions
+##//////////////////////////////////////////////////////
+
+
+class _Interner(object):
+    """
+    Numbers hashable objects consecutively, in the order they are first
+    seen.  A removed object keeps its number, which is not reused.
+    """
+
+    _REMOVED = object()
+
+    def __init__(self):
+        self.ids = {}
+        self.items = []
+
+    def intern(self, item):
+        i = self.ids.get(item)
+        if i is None:
+            i = self.ids[item] = len(self.items)
+            self.items.append(item)
+        return i
+
+    def remove(self, item):
+        self.items[self.ids.pop(item)] = self._REMOVED
+
+
+class _CountTable(object):
+    """
+    The integer counts of the (condition, sample) pairs of a compact
+    distribution, keyed by the code ``condition << 32 | sample`` of the
+    numbers of the pair: a sorted NumPy array of codes with an array of
+    their counts, and a dict of the codes changed since the arrays were
+    last merged (mapped to None if they were deleted), which is merged
+    into the arrays once it holds ``buffer_size`` codes.  The total count
+    and the number of samples of each condition are kept up to date.
+    """
+
+    def __init__(self, buffer_size):
+        self.codes = numpy.zeros(0, numpy.int64)
+        self.counts = numpy.zeros(0, numpy.int64)
+        self.changes = {}
+        self.buffer_size = buffer_size
+        self.totals = array.array('q')
+        self.sizes = array.array('q')
+
+    def add_condition(self):
+        self.totals.append(0)
+        self.sizes.append(0)
+
+    def get(self, code):
+        """Return the count of *code*, or None if it has no count."""
+        try:
+            return self.changes[code]
+        except KeyError:
+            i = numpy.searchsorted(self.codes, code)
+            if i < len(self.codes) and self.codes[i] == code:
+                return int(self.counts[i])
+            return None
+
+    def set(self, code, count):
+        """Set the count of *code*, or delete it if *count* is None."""
+        old = self.get(code)
+        condition = code >> 32
+        self.totals[condition] += (count or 0) - (old or 0)
+        self.sizes[condition] += (count is not None) - (old is not None)
+        self.changes[code] = count
+        if len(self.changes) >= self.buffer_size:
+            self.flush()
+
+    def add(self, codes, counts):
+        """
+        Add the counts of an array of codes, which may repeat.  Fewer
+        codes than ``buffer_size`` are added one by one to the changed
+        codes, and more are merged into the arrays at once.
+        """
+        if len(codes) < self.buffer_size:
+            for code, count in zip(codes.tolist(), counts.tolist()):
+                self.set(code, (self.get(code) or 0) + count)
+        else:
+            self.merge(codes, counts)
+
+    def merge(self, codes, counts):
+        """Merge the counts of an array of codes into the arrays."""
+        self.flush()
+        codes = numpy.concatenate([self.codes, codes])
+        counts = numpy.concatenate([self.counts, counts])
+        self.codes, inverse = numpy.unique(codes, return_inverse=True)
+        self.counts = numpy.zeros(len(self.codes), numpy.int64)
+        numpy.add.at(self.counts, inverse, counts)
+        conditions = self.codes >> 32
+        n = len(self.totals)
+        totals = numpy.bincount(conditions, self.counts, n).astype(numpy.int64)
+        self.totals = array.array('q', totals.tolist())
+        self.sizes = array.array('q', numpy.bincount(conditions, minlength=n).tolist())
+
+    def flush(self):
+        """Merge the changed codes into the arrays."""
+        if not self.changes:
+            return
+        codes = numpy.fromiter(self.changes, numpy.int64, len(self.changes))
+        order = numpy.argsort(codes)
+        codes = codes[order]
+        values = [self.changes[code] for code in codes.tolist()]
+        kept = numpy.array([value is not None for value in values], bool)
+        counts = numpy.array([value or 0 for value in values], numpy.int64)
+        self.changes = {}
+
+        positions = numpy.searchsorted(self.codes, codes)
+        found = positions < len(self.codes)
+        found[found] = self.codes[positions[found]] == codes[found]
+        old = numpy.ones(len(self.codes), bool)
+        old[positions[found]] = False
+        self.codes, self.counts = self.codes[old], self.counts[old]
+        positions = numpy.searchsorted(self.codes, codes[kept])
+        self.codes = numpy.insert(self.codes, positions, codes[kept])
+        self.counts = numpy.insert(self.counts, positions, counts[kept])
+
+    def condition(self, condition):
+        """Return the sample numbers and counts of *condition*."""
+        self.flush()
+        start, end = numpy.searchsorted(
+            self.codes, [condition << 32, (condition + 1) << 32]
+        )
+        return self.codes[start:end] & 0xFFFFFFFF, self.counts[start:end]
+
+
+@compat.python_2_unicode_compatible
+class CompactFreqDist(FreqDist):
+    """
+    A ``FreqDist`` that stores its counts in NumPy arrays over an
+    interned vocabulary of samples, instead of in a dictionary.  It has
+    the same interface, and can be used wherever a ``FreqDist`` can; but
+    counts must be integers, and samples are listed in the order they
+    were first counted.
+
+        >>> from nltk.probability import CompactFreqDist
+        >>> fdist = CompactFreqDist('abracadabra')
+        >>> fdist['a'], fdist.N(), fdist.B()
+        (5, 11, 5)
+        >>> fdist.most_common(2)
+        [('a', 5), ('b', 2)]
+        >>> fdist['z'] += 1
+        >>> fdist.freq('z')
+        0.0833...
+
+    The distributions of a ``CompactConditionalFreqDist`` are also
+    ``CompactFreqDist`` objects, which share the arrays and the
+    vocabulary of their conditional distribution.
+    """
+
+    def __init__(self, samples=None, buffer_size=100000):
+        """
+        Construct a new frequency distribution.  If ``samples`` is
+        given, then the frequency distribution will be initialized
+        with the count of each object in ``samples``; otherwise, it
+        will be initialized to be empty.
+
+        :param samples: The samples to initialize the frequency
+            distribution with.
+        :type samples: Sequence
+        :param buffer_size: The number of changed counts to keep in a
+            dictionary before merging them into the arrays.
+        :type buffer_size: int
+        """
+        self._samples = _Interner()
+        self._table = _CountTable(buffer_size)
+        self._table.add_condition()
+        self._condition = 0
+        self.update(samples)
+
+    @classmethod
+    def _view(cls, samples, table, condition):
+        """Return the distribution of *condition* in *table*."""
+        fdist = cls.__new__(cls)
+        fdist._samples = samples
+        fdist._table = table
+        fdist._condition = condition
+        return fdist
+
+    def _code(self, sample):
+        i = self._samples.ids.get(sample)
+        return None if i is None else self._condition << 32 | i
+
+    def _arrays(self):
+        return self._table.condition(self._condition)
+
+    def __getitem__(self, sample):
+        code = self._code(sample)
+        count = None if code is None else self._table.get(code)
+        return 0 if count is None else count
+
+    def get(self, sample, default=None):
+        code = self._code(sample)
+        count = None if code is None else self._table.get(code)
+        return default if count is None else count
+
+    def __contains__(self, sample):
+        code = self._code(sample)
+        return code is not None and self._table.get(code) is not None
+
+    def __setitem__(self, sample, count):
+        code = self._condition << 32 | self._samples.intern(sample)
+        self._table.set(code, int(count))
+
+    def __delitem__(self, sample):
+        if sample not in self:
+            raise KeyError(sample)
+        self._table.set(self._code(sample), None)
+
+    def setdefault(self, sample, count=None):
+        if sample not in self:
+            self[sample] = count
+        return self[sample]
+
+    def pop(self, sample, *default):
+        if sample not in self:
+            if default:
+                return default[0]
+            raise KeyError(sample)
+        count = self[sample]
+        del self[sample]
+        return count
+
+    def popitem(self):
+        if not len(self):
+            raise KeyError('popitem(): distribution is empty')
+        sample = self.keys()[-1]
+        return sample, self.pop(sample)
+
+    def clear(self):
+        for sample in self.keys():
+            del self[sample]
+
+    def update(self, *args, **kwargs):
+        """
+        Add the counts of a mapping, or count the samples of an
+        iterable, as ``Counter.update()`` does.
+        """
+        for samples in args + (kwargs,):
+            if samples is None:
+                continue
+            if not hasattr(samples, 'items'):
+                samples = Counter(samples)
+            self._add(samples.items())
+
+    def _add(self, sample_counts):
+        """Add the counts of an iterable of (sample, count) pairs."""
+        intern = self._samples.intern
+        codes, counts = array.array('q'), array.array('q')
+        for sample, count in sample_counts:
+            codes.append(self._condition << 32 | intern(sample))
+            counts.append(count)
+        self._table.add(
+            numpy.frombuffer(codes, numpy.int64), numpy.frombuffer(counts, numpy.int64)
+        )
+
+    def __len__(self):
+        return self._table.sizes[self._condition]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def keys(self):
+        ids, _ = self._arrays()
+        items = self._samples.items
+        return [items[i] for i in ids.tolist()]
+
+    def values(self):
+        return self._arrays()[1].tolist()
+
+    def items(self):
+        return list(zip(self.keys(), self.values()))
+
+    def N(self):
+        """
+        Return the total number of sample outcomes that have been
+        recorded by this FreqDist.
+
+        :rtype: int
+        """
+        return self._table.totals[self._condition]
+
+    def r_Nr(self, bins=None):
+        """
+        Return the dictionary mapping r to Nr, the number of samples with frequency r, where Nr > 0.
+
+        :type bins: int
+        :param bins: The number of possible sample outcomes.  ``bins``
+            is used to calculate Nr(0).  In particular, Nr(0) is
+            ``bins-self.B()``.  If ``bins`` is not specified, it
+            defaults to ``self.B()`` (so Nr(0) will be 0).
+        :rtype: int
+        """
+        _r_Nr = defaultdict(int)
+        counts, nrs = numpy.unique(self._arrays()[1], return_counts=True)
+        _r_Nr.update(zip(counts.tolist(), nrs.tolist()))
+        _r_Nr[0] = bins - self.B() if bins is not None else 0
+        return _r_Nr
+
+    def most_common(self, n=None):
+        """
+        List the *n* most common samples and their counts, from the most
+        common to the least; samples with equal counts are listed in the
+        order they were first counted.
+        """
+        ids, counts = self._arrays()
+        order = numpy.argsort(-counts, kind='mergesort')[:n]
+        items = self._samples.items
+        return [
+            (items[i], count)
+            for i, count in zip(ids[order].tolist(), counts[order].tolist())
+        ]
+
+    def copy(self):
+        """
+        Create a copy of this frequency distribution.
+
+        :rtype: CompactFreqDist
+        """
+        return CompactFreqDist(self)
+
+    def __eq__(self, other):
+        if not hasattr(other, 'items'):
+            return NotImplemented
+        return Counter(dict(self.items())) == Counter(dict(other.items()))
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return (CompactFreqDist, (dict(self.items()),))
+
+
+class CompactConditionalFreqDist(ConditionalFreqDist):
+    """
+    A ``ConditionalFreqDist`` that stores the counts of all its
+    conditions in one pair of NumPy arrays, keyed by numbers given to
+    the conditions and to the samples, instead of in a ``FreqDist`` per
+    condition.  It has the same interface, and can be used wherever a
+    ``ConditionalFreqDist`` can; its distributions are
+    ``CompactFreqDist`` objects.
+
+        >>> from nltk.probability import CompactConditionalFreqDist
+        >>> words = 'the the the dog dog some other words'.split()
+        >>> cfdist = CompactConditionalFreqDist((len(w), w) for w in words)
+        >>> cfdist[3]
+        FreqDist({'the': 3, 'dog': 2})
+        >>> cfdist[3].freq('the')
+        0.6
+        >>> cfdist[5]['words'] += 1
+        >>> cfdist.N()
+        9
+    """
+
+    def __init__(self, cond_samples=None, buffer_size=100000):
+        """
+        Construct a new empty conditional frequency distribution.  In
+        particular, the count for every sample, under every condition,
+        is zero.
+
+        :param cond_samples: The samples to initialize the conditional
+            frequency distribution with
+        :type cond_samples: Sequence of (condition, sample) tuples
+        :param buffer_size: The number of changed counts to keep in a
+            dictionary before merging them into the arrays.
+        :type buffer_size: int
+        """
+        ConditionalFreqDist.__init__(self)
+        self._conditions = _Interner()
+        self._samples = _Interner()
+        self._table = _CountTable(buffer_size)
+        if cond_samples:
+            cond_samples = iter(cond_samples)
+            while True:
+                counts = Counter(map(tuple, islice(cond_samples, buffer_size)))
+                if not counts:
+                    break
+                self._add(counts.items())
+
+    def _add(self, pair_counts):
+        """Add the counts of an iterable of ((condition, sample), count) pairs."""
+        intern = self._samples.intern
+        codes, counts = array.array('q'), array.array('q')
+        for (condition, sample), count in pair_counts:
+            i = self._conditions.ids.get(condition)
+            if i is None:
+                i = self[condition]._condition
+            codes.append(i << 32 | intern(sample))
+            counts.append(count)
+        self._table.merge(
+            numpy.frombuffer(codes, numpy.int64), numpy.frombuffer(counts, numpy.int64)
+        )
+
+    def _pair_counts(self):
+        """Return a list of the ((condition, sample), count) pairs."""
+        self._table.flush()
+        conditions, samples = self._conditions.items, self._samples.items
+        return [
+            ((conditions[code >> 32], samples[code & 0xFFFFFFFF]), count)
+            for code, count in zip(
+                self._table.codes.tolist(), self._table.counts.tolist()
+            )
+        ]
+
+    def __reduce__(self):
+        state = (self.conditions(), self._samples.items, self._pair_counts())
+        return (self.__class__, (None, self._table.buffer_size), state)
+
+    def __setstate__(self, state):
+        conditions, samples, pair_counts = state
+        for condition in conditions:
+            self[condition]
+        for sample in samples:
+            self._samples.intern(sample)
+        self._add(pair_counts)
+
+    def __getitem__(self, condition):
+        i = self._conditions.ids.get(condition)
+        if i is None:
+            i = self._conditions.intern(condition)
+            self._table.add_condition()
+        return CompactFreqDist._view(self._samples, self._table, i)
+
+    def __setitem__(self, condition, fdist):
+        target = self[condition]
+        if target:
+            target.clear()
+        for sample, count in fdist.items():
+            target[sample] = count
+
+    def __delitem__(self, condition):
+        self[condition].clear()
+        self._conditions.remove(condition)
+
+    def __contains__(self, condition):
+        return condition in self._conditions.ids
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self._conditions.ids)
+
+    def get(self, condition, default=None):
+        return self[condition] if condition in self else default
+
+    def keys(self):
+        removed = _Interner._REMOVED
+        return [c for c in self._conditions.items if c is not removed]
+
+    def values(self):
+        return [self[c] for c in self.keys()]
+
+    def items(self):
+        return [(c, self[c]) for c in self.keys()]
+
+    def setdefault(self, condition, fdist=None):
+        if condition not in self and fdist is not None:
+            self[condition] = fdist
+        return self[condition]
+
+    def pop(self, condition, *default):
+        if condition not in self:
+            if default:
+                return default[0]
+            raise KeyError(condition)
+        fdist = self[condition].copy()
+        del self[condition]
+        return fdist
+
+    def clear(self):
+        self._conditions = _Interner()
+        self._table = _CountTable(self._table.buffer_size)
+
+    def update(self, *args, **kwargs):
+        for condition, fdist in dict(*args, **kwargs).items():
+            self[condition] = fdist
+
+    def copy(self):
+        cls, args, state = self.__reduce__()
+        result = cls(*args)
+        result.__setstate__(state)
+        return result
+
+    def N(self):
+        """
+        Return the total number of sample outcomes that have been
+        recorded by this ``ConditionalFreqDist``.
+
+        :rtype: int
+        """
+        return sum(self._table.totals)
+
+    def __eq__(self, other):
+        if not isinstance(other, ConditionalFreqDist):
+            return NotImplemented
+        return set(self.conditions()) == set(other.conditions()) and all(
+            self[c] == other[c] for c in self.conditions()
+        )
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+
 @compat.python_2_unicode_compatible
 @add_metaclass(ABCMeta)
 class ConditionalProbDistI(dict):
@@ -2493,6 +3011,8 @@ if __name__ == '__main__':
     gt_demo()
 
 __all__ = [
+    'CompactConditionalFreqDist',
+    'CompactFreqDist',
     'ConditionalFreqDist',
     'ConditionalProbDist',
     'ConditionalProbDistI',
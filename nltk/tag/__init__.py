@@ -109,6 +109,10 @@ def _get_tagger(lang=None):
 
 
 def _pos_tag(tokens, tagset=None, tagger=None, lang=None):
+    return _pos_tag_sents([tokens], tagset, tagger, lang, batch=False)[0]
+
+
+def _pos_tag_sents(sentences, tagset=None, tagger=None, lang=None, batch=True):
     # Currently only supoorts English and Russian.
     if lang not in ['eng', 'rus']:
         raise NotImplementedError(
@@ -116,21 +120,27 @@ def _pos_tag(tokens, tagset=None, tagger=None, lang=None):
             "(i.e. lang='eng' or lang='rus')"
         )
     else:
-        tagged_tokens = tagger.tag(tokens)
+        if batch:
+            tagged_sents = tagger.tag_sents(sentences)
+        else:
+            tagged_sents = [tagger.tag(tokens) for tokens in sentences]
         if tagset:  # Maps to the specified tagset.
             if lang == 'eng':
-                tagged_tokens = [
-                    (token, map_tag('en-ptb', tagset, tag))
-                    for (token, tag) in tagged_tokens
+                tagged_sents = [
+                    [(token, map_tag('en-ptb', tagset, tag)) for (token, tag) in sent]
+                    for sent in tagged_sents
                 ]
             elif lang == 'rus':
                 # Note that the new Russion pos tags from the model contains suffixes,
                 # see https://github.com/nltk/nltk/issues/2151#issuecomment-430709018
-                tagged_tokens = [
-                    (token, map_tag('ru-rnc-new', tagset, tag.partition('=')[0]))
-                    for (token, tag) in tagged_tokens
+                tagged_sents = [
+                    [
+                        (token, map_tag('ru-rnc-new', tagset, tag.partition('=')[0]))
+                        for (token, tag) in sent
+                    ]
+                    for sent in tagged_sents
                 ]
-        return tagged_tokens
+        return tagged_sents
 
 
 def pos_tag(tokens, tagset=None, lang='eng'):
@@ -177,4 +187,4 @@ def pos_tag_sents(sentences, tagset=None, lang='eng'):
     :rtype: list(list(tuple(str, str)))
     """
     tagger = _get_tagger(lang)
-    return [_pos_tag(sent, tagset, tagger, lang) for sent in sentences]
+    return _pos_tag_sents(sentences, tagset, tagger, lang)
@@ -13,7 +13,7 @@ from __future__ import print_function, division
 from collections import defaultdict, Counter
 
 from nltk.tag import TaggerI
-from nltk.tbl import Feature, Template
+from nltk.tbl import Feature, Template, Rule
 from nltk import jsontags
 
 
@@ -190,6 +190,65 @@ def describe_template_sets():
 ######################################################################
 
 
+def _compile_conditions(rule):
+    """
+    Return the conditions of *rule* as a tuple of ``(field, positions,
+    value)`` triples, where field is 0 for a word and 1 for a tag; or
+    None if *rule* is not a plain ``Rule`` or has other features.
+    """
+    if not isinstance(rule, Rule) or type(rule).applies is not Rule.applies:
+        return None
+    conditions = []
+    for feature, value in rule._conditions:
+        if feature.extract_property is Word.extract_property:
+            field = 0
+        elif feature.extract_property is Pos.extract_property:
+            field = 1
+        else:
+            return None
+        conditions.append((field, feature.positions, value))
+    return tuple(conditions)
+
+
+def _candidates(conditions, indexes, positions):
+    """
+    Return the positions among *positions* where the compiled
+    *conditions* may hold.  *indexes* maps the words and the tags to the
+    positions that have them.  If the positions that satisfy the rarest
+    condition are fewer than *positions*, only those are returned.
+    """
+    best = None
+    best_size = len(positions)
+    for field, offsets, value in conditions:
+        matches = indexes[field].get(value, ())
+        size = len(matches) * len(offsets)
+        if size < best_size:
+            best, best_size = (matches, offsets), size
+    if best is None:
+        return positions
+    matches, offsets = best
+    candidates = set(
+        (sentnum, i - offset) for (sentnum, i) in matches for offset in offsets
+    )
+    return [pos for pos in candidates if pos in positions]
+
+
+def _conditions_hold(conditions, tokens, index):
+    """
+    Return True if each compiled condition holds for *tokens[index]*,
+    i.e. if at least one of its positions has the required value.
+    """
+    n = len(tokens)
+    for field, positions, value in conditions:
+        for pos in positions:
+            i = index + pos
+            if 0 <= i < n and tokens[i][field] == value:
+                break
+        else:
+            return False
+    return True
+
+
 @jsontags.register_tag
 class BrillTagger(TaggerI):
     """
@@ -225,6 +284,7 @@ class BrillTagger(TaggerI):
         self._initial_tagger = initial_tagger
         self._rules = tuple(rules)
         self._training_stats = training_stats
+        self._compiled_rules = None
 
     def encode_json_obj(self):
         return self._initial_tagger, self._rules, self._training_stats
@@ -260,30 +320,80 @@ class BrillTagger(TaggerI):
 
     def tag(self, tokens):
         # Inherit documentation from TaggerI
+        return self.tag_sents([tokens])[0]
 
+    def tag_sents(self, sentences):
+        """
+        Tag each of the *sentences*.  The initial tagger tags them all
+        first, and then each rule is applied to the whole batch.  A rule
+        is only tried at positions that have its original tag and, when
+        it is compiled (see ``_compile_rules``), only at those where the
+        rarest of its conditions can hold, which are found from an index
+        of the positions of each word and tag in the batch.
+
+        :param sentences: the sentences to tag
+        :type sentences: list(list(str))
+        :rtype: list(list(tuple(str, str)))
+        """
         # Run the initial tagger.
-        tagged_tokens = self._initial_tagger.tag(tokens)
+        tagged_sents = [
+            list(tagged_tokens)
+            for tagged_tokens in self._initial_tagger.tag_sents(sentences)
+        ]
 
-        # Create a dictionary that maps each tag to a list of the
-        # indices of tokens that have that tag.
+        # Create dictionaries that map each word and each tag to a set of
+        # the (sentence, index) positions of tokens that have it.
+        word_to_positions = defaultdict(set)
         tag_to_positions = defaultdict(set)
-        for i, (token, tag) in enumerate(tagged_tokens):
-            tag_to_positions[tag].add(i)
-
-        # Apply each rule, in order.  Only try to apply rules at
-        # positions that have the desired original tag.
-        for rule in self._rules:
-            # Find the positions where it might apply
-            positions = tag_to_positions.get(rule.original_tag, [])
-            # Apply the rule at those positions.
-            changed = rule.apply(tagged_tokens, positions)
-            # Update tag_to_positions with the positions of tags that
-            # were modified.
-            for i in changed:
-                tag_to_positions[rule.original_tag].remove(i)
-                tag_to_positions[rule.replacement_tag].add(i)
-
-        return tagged_tokens
+        for sentnum, tagged_tokens in enumerate(tagged_sents):
+            for i, (token, tag) in enumerate(tagged_tokens):
+                word_to_positions[token].add((sentnum, i))
+                tag_to_positions[tag].add((sentnum, i))
+        indexes = (word_to_positions, tag_to_positions)
+
+        # Apply each rule, in order.
+        for rule, conditions in self._compile_rules():
+            positions = tag_to_positions.get(rule.original_tag)
+            if not positions:
+                continue
+            # Find the positions where it applies.  As in TagRule.apply,
+            # all of them are found before any tag is changed.
+            if conditions is None:
+                changed = [
+                    (sentnum, i)
+                    for (sentnum, i) in positions
+                    if rule.applies(tagged_sents[sentnum], i)
+                ]
+            else:
+                changed = [
+                    (sentnum, i)
+                    for (sentnum, i) in _candidates(conditions, indexes, positions)
+                    if _conditions_hold(conditions, tagged_sents[sentnum], i)
+                ]
+            # Apply the rule there, and update tag_to_positions with the
+            # positions of tags that were modified.
+            new_positions = tag_to_positions[rule.replacement_tag]
+            for sentnum, i in changed:
+                tagged_tokens = tagged_sents[sentnum]
+                tagged_tokens[i] = (tagged_tokens[i][0], rule.replacement_tag)
+                positions.remove((sentnum, i))
+                new_positions.add((sentnum, i))
+
+        return tagged_sents
+
+    def _compile_rules(self):
+        """
+        Return a list of ``(rule, conditions)`` pairs, one for each rule.
+        For a ``Rule`` whose features all examine the word or the tag of
+        nearby tokens, conditions is a tuple of ``(field, positions,
+        value)`` triples that ``_conditions_hold`` can check without
+        calling ``Feature.extract_property``; for other rules it is None.
+        """
+        if getattr(self, '_compiled_rules', None) is None:
+            self._compiled_rules = [
+                (rule, _compile_conditions(rule)) for rule in self._rules
+            ]
+        return self._compiled_rules
 
     def print_template_statistics(self, test_stats=None, printunused=True):
         """
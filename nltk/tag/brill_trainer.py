@@ -12,7 +12,9 @@ from __future__ import print_function, division
 
 import bisect
 import textwrap
+from array import array
 from collections import defaultdict
+from multiprocessing import Pool, cpu_count
 
 from nltk.tag import untag, BrillTagger
 
@@ -21,6 +23,42 @@ from nltk.tag import untag, BrillTagger
 ######################################################################
 
 
+def _find_rules(templates, sents):
+    """
+    Use the templates to find, for each error of the tagged sentence,
+    the rules that would generate the correct tag there.  Return a list
+    of ``(wordnum, rules)`` pairs.
+
+    :param sents: a tagged sentence and the same sentence correctly tagged
+    :type sents: tuple(list(tuple), list(tuple))
+    """
+    sent, train_sent = sents
+    found = []
+    for wordnum, ((word, tag), (_, correct_tag)) in enumerate(zip(sent, train_sent)):
+        if tag != correct_tag:
+            rules = [
+                rule
+                for template in templates
+                for rule in template.applicable_rules(sent, wordnum, correct_tag)
+            ]
+            found.append((wordnum, rules))
+    return found
+
+
+# Templates of a worker process finding the initial rules, set once per
+# worker by `_init_rule_worker`.
+_worker_templates = None
+
+
+def _init_rule_worker(templates):
+    global _worker_templates
+    _worker_templates = templates
+
+
+def _worker_find_rules(sents):
+    return _find_rules(_worker_templates, sents)
+
+
 class BrillTaggerTrainer(object):
     """
     A trainer for tbl taggers.
@@ -55,12 +93,29 @@ class BrillTaggerTrainer(object):
         self._deterministic = deterministic
         self._ruleformat = ruleformat
 
+        self._tag_ids = None
+        """Mapping from tags to the integers that stand for them in the
+           position and rule mappings."""
+
+        self._sent_offsets = None
+        self._sentnums = None
+        """Positions are numbered consecutively through the corpus.
+           _sent_offsets holds the position of the first word of each
+           sentence, and _sentnums the sentence of each position, so that
+           position p is word p - _sent_offsets[s] of sentence
+           s = _sentnums[p].  Numbered positions sort like the
+           (sentnum, wordnum) pairs they stand for."""
+
+        self._correct_tags = None
+        """Array mapping positions to their correct tag ids."""
+
         self._tag_positions = None
-        """Mapping from tags to lists of positions that use that tag."""
+        """List mapping tag ids to sorted arrays of the positions that
+           use that tag."""
 
         self._rules_by_position = None
-        """Mapping from positions to the set of rules that are known
-           to occur at that position.  Position is (sentnum, wordnum).
+        """List mapping positions to the set of rules that are known
+           to occur at that position (or None).
            Initially, this will only contain positions where each rule
            applies in a helpful way; but when we examine a rule, we'll
            extend this list to also include positions where each rule
@@ -69,11 +124,11 @@ class BrillTaggerTrainer(object):
         self._positions_by_rule = None
         """Mapping from rule to position to effect, specifying the
            effect that each rule has on the overall score, at each
-           position.  Position is (sentnum, wordnum); and effect is
-           -1, 0, or 1.  As with _rules_by_position, this mapping starts
-           out only containing rules with positive effects; but when
-           we examine a rule, we'll extend this mapping to include
-           the positions where the rule is harmful or neutral."""
+           position.  Effect is -1, 0, or 1.  As with _rules_by_position,
+           this mapping starts out only containing rules with positive
+           effects; but when we examine a rule, we'll extend this mapping
+           to include the positions where the rule is harmful or
+           neutral."""
 
         self._rules_by_score = None
         """Mapping from scores to the set of rules whose effect on the
@@ -87,13 +142,19 @@ class BrillTaggerTrainer(object):
            Invariant: ruleScores[r] = sum(_positions_by_rule[r])"""
 
         self._first_unknown_position = None
-        """Mapping from rules to the first position where we're unsure
+        """List mapping the id of each original tag to a mapping from the
+           rules for that tag to the first position where we're unsure
            if the rule applies.  This records the next position we
-           need to check to see if the rule messed anything up."""
+           need to check to see if the rule messed anything up.  Since
+           a rule can only apply where its original tag is, grouping the
+           rules by that tag lets _update_rules look only at the rules
+           that could apply at a changed position."""
 
     # Training
 
-    def train(self, train_sents, max_rules=200, min_score=2, min_acc=None):
+    def train(
+        self, train_sents, max_rules=200, min_score=2, min_acc=None, processes=1
+    ):
         """
         Trains the Brill tagger on the corpus *train_sents*,
         producing at most *max_rules* transformations, each of which
@@ -101,6 +162,10 @@ class BrillTaggerTrainer(object):
         *min_score*, and each of which has accuracy not lower than
         *min_acc*.
 
+        Finding the initial rules, which instantiates every template at
+        every error of the initial tagger, can be spread over *processes*
+        worker processes; the learned rules are the same.
+
         #imports
         >>> from nltk.tbl.template import Template
         >>> from nltk.tag.brill import Pos, Word
@@ -234,6 +299,9 @@ class BrillTaggerTrainer(object):
         :type min_score: int
         :param min_acc: discard any rule with lower accuracy than min_acc
         :type min_acc: float or None
+        :param processes: number of processes that find the initial rules
+            (None for one per CPU); the templates must be picklable
+        :type processes: int or None
         :return: the learned tagger
         :rtype: BrillTagger
 
@@ -280,7 +348,7 @@ class BrillTaggerTrainer(object):
         # rules, which are added to the rule mappings.
         if self._trace:
             print("Finding initial useful rules...")
-        self._init_mappings(test_sents, train_sents)
+        self._init_mappings(test_sents, train_sents, processes)
         if self._trace:
             print(("    Found %d useful rules." % len(self._rule_scores)))
 
@@ -333,33 +401,73 @@ class BrillTaggerTrainer(object):
         # Create and return a tagger from the rules we found.
         return BrillTagger(self._initial_tagger, rules, trainstats)
 
-    def _init_mappings(self, test_sents, train_sents):
+    def _init_mappings(self, test_sents, train_sents, processes=1):
         """
         Initialize the tag position mapping & the rule related
         mappings.  For each error in test_sents, find new rules that
         would correct them, and add them to the rule mappings.
         """
-        self._tag_positions = defaultdict(list)
-        self._rules_by_position = defaultdict(set)
+        self._tag_ids = {}
+        self._sent_offsets = array('l', [0])
+        self._sentnums = array('l')
+        self._correct_tags = array('l')
+        self._tag_positions = []
         self._positions_by_rule = defaultdict(dict)
         self._rules_by_score = defaultdict(set)
         self._rule_scores = defaultdict(int)
-        self._first_unknown_position = defaultdict(int)
-        # Scan through the corpus, initializing the tag_positions
-        # mapping and all the rule-related mappings.
-        for sentnum, sent in enumerate(test_sents):
-            for wordnum, (word, tag) in enumerate(sent):
-
-                # Initialize tag_positions
-                self._tag_positions[tag].append((sentnum, wordnum))
-
-                # If it's an error token, update the rule-related mappings.
-                correct_tag = train_sents[sentnum][wordnum][1]
-                if tag != correct_tag:
-                    for rule in self._find_rules(sent, wordnum, correct_tag):
-                        self._update_rule_applies(rule, sentnum, wordnum, train_sents)
+        self._first_unknown_position = []
+        # Scan through the corpus, numbering the positions and initializing
+        # the tag_positions mapping.
+        pos = 0
+        for sentnum, (sent, train_sent) in enumerate(zip(test_sents, train_sents)):
+            for (word, tag), (_, correct_tag) in zip(sent, train_sent):
+                self._tag_positions[self._tag_id(tag)].append(pos)
+                self._correct_tags.append(self._tag_id(correct_tag))
+                self._sentnums.append(sentnum)
+                pos += 1
+            self._sent_offsets.append(pos)
+        self._rules_by_position = [None] * pos
+
+        # For each error token, update the rule-related mappings.
+        if processes == 1:
+            found = (
+                _find_rules(self._templates, sents)
+                for sents in zip(test_sents, train_sents)
+            )
+        else:
+            pool = Pool(
+                processes or cpu_count(),
+                initializer=_init_rule_worker,
+                initargs=(self._templates,),
+            )
+            found = pool.imap(_worker_find_rules, zip(test_sents, train_sents), 64)
+        try:
+            for offset, sent_rules in zip(self._sent_offsets, found):
+                for wordnum, rules in sent_rules:
+                    for rule in rules:
+                        self._update_rule_applies(rule, offset + wordnum)
+        finally:
+            if processes != 1:
+                pool.terminate()
+                pool.join()
+
+    def _tag_id(self, tag):
+        """
+        Return the id of *tag*, numbering it if it is new.
+        """
+        try:
+            return self._tag_ids[tag]
+        except KeyError:
+            tag_id = self._tag_ids[tag] = len(self._tag_ids)
+            self._tag_positions.append(array('l'))
+            self._first_unknown_position.append({})
+            return tag_id
 
     def _clean(self):
+        self._tag_ids = None
+        self._sent_offsets = None
+        self._sentnums = None
+        self._correct_tags = None
         self._tag_positions = None
         self._rules_by_position = None
         self._positions_by_rule = None
@@ -367,54 +475,47 @@ class BrillTaggerTrainer(object):
         self._rule_scores = None
         self._first_unknown_position = None
 
-    def _find_rules(self, sent, wordnum, new_tag):
-        """
-        Use the templates to find rules that apply at index *wordnum*
-        in the sentence *sent* and generate the tag *new_tag*.
-        """
-        for template in self._templates:
-            for rule in template.applicable_rules(sent, wordnum, new_tag):
-                yield rule
-
-    def _update_rule_applies(self, rule, sentnum, wordnum, train_sents):
+    def _update_rule_applies(self, rule, pos):
         """
         Update the rule data tables to reflect the fact that
-        *rule* applies at the position *(sentnum, wordnum)*.
+        *rule* applies at the position *pos*.
         """
-        pos = sentnum, wordnum
+        positions = self._positions_by_rule[rule]
 
         # If the rule is already known to apply here, ignore.
         # (This only happens if the position's tag hasn't changed.)
-        if pos in self._positions_by_rule[rule]:
+        if pos in positions:
             return
 
         # Update self._positions_by_rule.
-        correct_tag = train_sents[sentnum][wordnum][1]
-        if rule.replacement_tag == correct_tag:
-            self._positions_by_rule[rule][pos] = 1
-        elif rule.original_tag == correct_tag:
-            self._positions_by_rule[rule][pos] = -1
+        correct_tag = self._correct_tags[pos]
+        if self._tag_ids[rule.replacement_tag] == correct_tag:
+            effect = 1
+        elif self._tag_ids[rule.original_tag] == correct_tag:
+            effect = -1
         else:  # was wrong, remains wrong
-            self._positions_by_rule[rule][pos] = 0
+            effect = 0
+        positions[pos] = effect
 
         # Update _rules_by_position
-        self._rules_by_position[pos].add(rule)
+        rules = self._rules_by_position[pos]
+        if rules is None:
+            rules = self._rules_by_position[pos] = set()
+        rules.add(rule)
 
         # Update _rule_scores.
         old_score = self._rule_scores[rule]
-        self._rule_scores[rule] += self._positions_by_rule[rule][pos]
+        self._rule_scores[rule] = old_score + effect
 
         # Update _rules_by_score.
         self._rules_by_score[old_score].discard(rule)
-        self._rules_by_score[self._rule_scores[rule]].add(rule)
+        self._rules_by_score[old_score + effect].add(rule)
 
-    def _update_rule_not_applies(self, rule, sentnum, wordnum):
+    def _update_rule_not_applies(self, rule, pos):
         """
         Update the rule data tables to reflect the fact that *rule*
-        does not apply at the position *(sentnum, wordnum)*.
+        does not apply at the position *pos*.
         """
-        pos = sentnum, wordnum
-
         # Update _rule_scores.
         old_score = self._rule_scores[rule]
         self._rule_scores[rule] -= self._positions_by_rule[rule][pos]
@@ -440,6 +541,7 @@ class BrillTaggerTrainer(object):
         score *and* which has been tested against the entire corpus, we
         can conclude that it's the next best rule.
         """
+        offsets, sentnums = self._sent_offsets, self._sentnums
         for max_score in sorted(self._rules_by_score.keys(), reverse=True):
             if len(self._rules_by_score) == 0:
                 return None
@@ -449,21 +551,23 @@ class BrillTaggerTrainer(object):
             if self._deterministic:
                 best_rules.sort(key=repr)
             for rule in best_rules:
-                positions = self._tag_positions[rule.original_tag]
+                tag_id = self._tag_ids[rule.original_tag]
+                positions = self._tag_positions[tag_id]
+                first_unknown = self._first_unknown_position[tag_id]
 
-                unk = self._first_unknown_position.get(rule, (0, -1))
-                start = bisect.bisect_left(positions, unk)
+                start = bisect.bisect_left(positions, first_unknown.get(rule, 0))
 
                 for i in range(start, len(positions)):
-                    sentnum, wordnum = positions[i]
-                    if rule.applies(test_sents[sentnum], wordnum):
-                        self._update_rule_applies(rule, sentnum, wordnum, train_sents)
+                    pos = positions[i]
+                    sentnum = sentnums[pos]
+                    if rule.applies(test_sents[sentnum], pos - offsets[sentnum]):
+                        self._update_rule_applies(rule, pos)
                         if self._rule_scores[rule] < max_score:
-                            self._first_unknown_position[rule] = (sentnum, wordnum + 1)
+                            first_unknown[rule] = pos + 1
                             break  # The update demoted the rule.
 
                 if self._rule_scores[rule] == max_score:
-                    self._first_unknown_position[rule] = (len(train_sents) + 1, 0)
+                    first_unknown[rule] = len(sentnums) + 1
                     # optimization: if no min_acc threshold given, don't bother computing accuracy
                     if min_acc is None:
                         return rule
@@ -497,7 +601,10 @@ class BrillTaggerTrainer(object):
             self._trace_apply(len(update_positions))
 
         # Update test_sents.
-        for (sentnum, wordnum) in update_positions:
+        offsets, sentnums = self._sent_offsets, self._sentnums
+        for pos in update_positions:
+            sentnum = sentnums[pos]
+            wordnum = pos - offsets[sentnum]
             text = test_sents[sentnum][wordnum][0]
             test_sents[sentnum][wordnum] = (text, new_tag)
 
@@ -506,14 +613,14 @@ class BrillTaggerTrainer(object):
         Update _tag_positions to reflect the changes to tags that are
         made by *rule*.
         """
+        old_tag_positions = self._tag_positions[self._tag_ids[rule.original_tag]]
+        new_tag_positions = self._tag_positions[self._tag_ids[rule.replacement_tag]]
         # Update the tag index.
         for pos in self._positions_by_rule[rule]:
             # Delete the old tag.
-            old_tag_positions = self._tag_positions[rule.original_tag]
             old_index = bisect.bisect_left(old_tag_positions, pos)
             del old_tag_positions[old_index]
             # Insert the new tag.
-            new_tag_positions = self._tag_positions[rule.replacement_tag]
             bisect.insort_left(new_tag_positions, pos)
 
     def _update_rules(self, rule, train_sents, test_sents):
@@ -521,27 +628,33 @@ class BrillTaggerTrainer(object):
         Check if we should add or remove any rules from consideration,
         given the changes made by *rule*.
         """
+        offsets, sentnums = self._sent_offsets, self._sentnums
+
         # Collect a list of all positions that might be affected.
         neighbors = set()
-        for sentnum, wordnum in self._positions_by_rule[rule]:
+        for pos in self._positions_by_rule[rule]:
+            sentnum = sentnums[pos]
+            offset = offsets[sentnum]
             for template in self._templates:
-                n = template.get_neighborhood(test_sents[sentnum], wordnum)
-                neighbors.update([(sentnum, i) for i in n])
+                n = template.get_neighborhood(test_sents[sentnum], pos - offset)
+                neighbors.update([offset + i for i in n])
 
         # Update the rules at each position.
         num_obsolete = num_new = num_unseen = 0
-        for sentnum, wordnum in neighbors:
+        for pos in neighbors:
+            sentnum = sentnums[pos]
+            wordnum = pos - offsets[sentnum]
             test_sent = test_sents[sentnum]
             correct_tag = train_sents[sentnum][wordnum][1]
 
             # Check if the change causes any rule at this position to
             # stop matching; if so, then update our rule mappings
             # accordingly.
-            old_rules = set(self._rules_by_position[sentnum, wordnum])
+            old_rules = set(self._rules_by_position[pos] or ())
             for old_rule in old_rules:
                 if not old_rule.applies(test_sent, wordnum):
                     num_obsolete += 1
-                    self._update_rule_not_applies(old_rule, sentnum, wordnum)
+                    self._update_rule_not_applies(old_rule, pos)
 
             # Check if the change causes our templates to propose any
             # new rules for this position.
@@ -554,23 +667,20 @@ class BrillTaggerTrainer(object):
                         if new_rule not in self._rule_scores:
                             num_unseen += 1
                         old_rules.add(new_rule)
-                        self._update_rule_applies(
-                            new_rule, sentnum, wordnum, train_sents
-                        )
+                        self._update_rule_applies(new_rule, pos)
 
             # We may have caused other rules to match here, that are
             # not proposed by our templates -- in particular, rules
             # that are harmful or neutral.  We therefore need to
-            # update any rule whose first_unknown_position is past
-            # this rule.
-            for new_rule, pos in self._first_unknown_position.items():
-                if pos > (sentnum, wordnum):
+            # update any rule for the tag at this position whose
+            # first_unknown_position is past this position.
+            tag_id = self._tag_ids[test_sent[wordnum][1]]
+            for new_rule, unknown in self._first_unknown_position[tag_id].items():
+                if unknown > pos:
                     if new_rule not in old_rules:
                         num_new += 1
                         if new_rule.applies(test_sent, wordnum):
-                            self._update_rule_applies(
-                                new_rule, sentnum, wordnum, train_sents
-                            )
+                            self._update_rule_applies(new_rule, pos)
 
         if self._trace > 3:
             self._trace_update_rules(num_obsolete, num_new, num_unseen)
@@ -629,3 +739,30 @@ class BrillTaggerTrainer(object):
             ('  - %d rule applications added (%d novel)' % (num_new, num_unseen)),
         )
         print(prefix)
+
+
+def benchmark(initial_tagger, templates, train_sents, max_rules=20, processes=1):
+    """
+    Trains a Brill tagger on *train_sents*, returning a dict with the
+    number of tokens and of learned rules, the time in seconds spent
+    finding the initial rules, and the mean time in seconds per learned
+    rule after that.
+    """
+    from timeit import default_timer as timer
+
+    trainer = BrillTaggerTrainer(initial_tagger, templates, deterministic=True)
+    start = timer()
+    trainer.train(train_sents, max_rules=0, processes=processes)
+    init_time = timer() - start
+
+    start = timer()
+    tagger = trainer.train(train_sents, max_rules=max_rules, processes=processes)
+    rule_time = timer() - start - init_time
+
+    num_rules = len(tagger.rules())
+    return dict(
+        tokens=tagger.train_stats('tokencount'),
+        rules=num_rules,
+        init_seconds=init_time,
+        seconds_per_rule=rule_time / num_rules if num_rules else 0.0,
+    )
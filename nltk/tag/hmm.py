@@ -72,6 +72,8 @@ from __future__ import print_function, unicode_literals, division
 
 import re
 import itertools
+import time
+from multiprocessing import Pool, cpu_count
 
 from six.moves import map, zip
 
@@ -151,6 +153,7 @@ class HiddenMarkovModelTagger(TaggerI):
         self._outputs = outputs
         self._priors = priors
         self._cache = None
+        self._transitions_logprob = None
         self._transform = transform
 
     @classmethod
@@ -375,6 +378,7 @@ class HiddenMarkovModelTagger(TaggerI):
 
     def reset_cache(self):
         self._cache = None
+        self._transitions_logprob = None
 
     def best_path(self, unlabeled_sequence):
         """
@@ -398,15 +402,15 @@ class HiddenMarkovModelTagger(TaggerI):
         P, O, X, S = self._cache
 
         V = np.zeros((T, N), np.float32)
-        B = -np.ones((T, N), np.int)
+        B = -np.ones((T, N), int)
+        states = np.arange(N)
 
         V[0] = P + O[:, S[unlabeled_sequence[0]]]
         for t in range(1, T):
-            for j in range(N):
-                vs = V[t - 1, :] + X[:, j]
-                best = np.argmax(vs)
-                V[t, j] = vs[best] + O[j, S[unlabeled_sequence[t]]]
-                B[t, j] = best
+            # vs[i, j] is the score of reaching state j from state i
+            vs = V[t - 1, :, None] + X
+            B[t] = vs.argmax(axis=0)
+            V[t] = vs[B[t], states] + O[:, S[unlabeled_sequence[t]]]
 
         current = np.argmax(V[T - 1, :])
         sequence = [current]
@@ -418,6 +422,93 @@ class HiddenMarkovModelTagger(TaggerI):
         sequence.reverse()
         return list(map(self._states.__getitem__, sequence))
 
+    def best_paths(self, unlabeled_sequences, batch_size=None):
+        """
+        Returns the optimal state sequence of each of the unlabeled
+        sequences, as ``best_path`` does. The sequences are padded to the
+        same length and decoded together, one time step at a time, in
+        batches of ``batch_size`` sequences; by default batches are sized
+        to keep the arrays of scores below about a million entries.
+
+        :return: the state sequences
+        :rtype: list(sequence of any)
+        :param unlabeled_sequences: the sequences of unlabeled symbols
+        :type unlabeled_sequences: list(list)
+        :param batch_size: the number of sequences decoded together
+        :type batch_size: int
+        """
+        unlabeled_sequences = [self._transform(seq) for seq in unlabeled_sequences]
+        return self._best_paths(unlabeled_sequences, batch_size)
+
+    def _best_paths(self, unlabeled_sequences, batch_size=None):
+        N = len(self._states)
+        self._create_cache()
+        self._update_cache([s for seq in unlabeled_sequences for s in seq])
+        P, O, X, S = self._cache
+        if batch_size is None:
+            batch_size = max(1, 2 ** 20 // (N * N))
+
+        # Decode the longest sequences first, so that the sequences that
+        # still have a symbol at time t are the first ones of their batch.
+        order = sorted(
+            range(len(unlabeled_sequences)),
+            key=lambda k: len(unlabeled_sequences[k]),
+            reverse=True,
+        )
+        paths = [[] for seq in unlabeled_sequences]
+        # Transposed, so that the maximum is taken over the last axis.
+        XT = np.ascontiguousarray(X.T)
+        for start in range(0, len(order), batch_size):
+            batch = order[start : start + batch_size]
+            lengths = [len(unlabeled_sequences[k]) for k in batch]
+            batch = batch[: sum(1 for length in lengths if length)]
+            if not batch:
+                continue
+            T = lengths[0]
+            symbols = np.zeros((len(batch), T), int)
+            for row, k in enumerate(batch):
+                symbols[row, : lengths[row]] = [S[s] for s in unlabeled_sequences[k]]
+
+            V = P + O[:, symbols[:, 0]].T
+            B = -np.ones((T, len(batch), N), int)
+            ends = np.zeros((len(batch), N), np.float32)
+            active = len(batch)
+            for t in range(1, T):
+                while lengths[active - 1] <= t:
+                    active -= 1
+                    ends[active] = V[active]
+                V = V[:active]
+                # vs[b, j, i] is the score of reaching state j from state i
+                vs = V[:, None, :] + XT
+                B[t, :active] = vs.argmax(axis=2)
+                V = vs.max(axis=2)
+                V += O[:, symbols[:active, t]].T
+            ends[:active] = V
+
+            for row, k in enumerate(batch):
+                current = ends[row].argmax()
+                sequence = [current]
+                for t in range(lengths[row] - 1, 0, -1):
+                    current = B[t, row, current]
+                    sequence.append(current)
+                sequence.reverse()
+                paths[k] = list(map(self._states.__getitem__, sequence))
+        return paths
+
+    def tag_sents(self, sentences):
+        """
+        Tags each of the sequences with its highest probability state
+        sequence, decoding many sequences at once with ``best_paths``.
+
+        :return: the labelled sequences of symbols
+        :rtype: list(list)
+        :param sentences: the sequences of unlabeled symbols
+        :type sentences: list(list)
+        """
+        sentences = [self._transform(sent) for sent in sentences]
+        paths = self._best_paths(sentences)
+        return [list(zip(sent, path)) for sent, path in zip(sentences, paths)]
+
     def best_path_simple(self, unlabeled_sequence):
         """
         Returns the state sequence of the optimal (most probable) path through
@@ -702,15 +793,17 @@ class HiddenMarkovModelTagger(TaggerI):
 
     def _transitions_matrix(self):
         """ Return a matrix of transition log probabilities. """
-        trans_iter = (
-            self._transitions[sj].logprob(si)
-            for sj in self._states
-            for si in self._states
-        )
+        if getattr(self, '_transitions_logprob', None) is None:
+            trans_iter = (
+                self._transitions[sj].logprob(si)
+                for sj in self._states
+                for si in self._states
+            )
 
-        transitions_logprob = np.fromiter(trans_iter, dtype=np.float64)
-        N = len(self._states)
-        return transitions_logprob.reshape((N, N)).T
+            transitions_logprob = np.fromiter(trans_iter, dtype=np.float64)
+            N = len(self._states)
+            self._transitions_logprob = transitions_logprob.reshape((N, N)).T
+        return self._transitions_logprob
 
     def _outputs_vector(self, symbol):
         """
@@ -751,9 +844,8 @@ class HiddenMarkovModelTagger(TaggerI):
             symbol = unlabeled_sequence[t][_TEXT]
             output_logprob = self._outputs_vector(symbol)
 
-            for i in range(N):
-                summand = alpha[t - 1] + transitions_logprob[i]
-                alpha[t, i] = logsumexp2(summand) + output_logprob[i]
+            summand = alpha[t - 1] + transitions_logprob
+            alpha[t] = logsumexp2(summand, axis=1) + output_logprob
 
         return alpha
 
@@ -785,9 +877,8 @@ class HiddenMarkovModelTagger(TaggerI):
             symbol = unlabeled_sequence[t + 1][_TEXT]
             outputs = self._outputs_vector(symbol)
 
-            for i in range(N):
-                summand = transitions_logprob[i] + beta[t + 1] + outputs
-                beta[t, i] = logsumexp2(summand)
+            summand = transitions_logprob + beta[t + 1] + outputs
+            beta[t] = logsumexp2(summand, axis=1)
 
         return beta
 
@@ -849,6 +940,80 @@ class HiddenMarkovModelTagger(TaggerI):
         )
 
 
+def _baum_welch_counts(sequences, priors, transitions, outputs):
+    """
+    Return the log probability of the sequences and the log expected
+    transition and output counts of the Baum-Welch E-step, as a tuple
+    ``(logprob, A_numer, A_denom, B_numer, B_denom)``.
+
+    :param sequences: the training data, as arrays of symbol numbers
+    :param priors: the log probabilities of starting in each state
+    :param transitions: an N by N array of log probabilities of moving from
+        the row state to the column state
+    :param outputs: an N by M array of log probabilities of each state
+        emitting each symbol
+    """
+    N, M = outputs.shape
+    A_numer = _ninf_array((N, N))
+    B_numer = _ninf_array((N, M))
+    A_denom = _ninf_array(N)
+    B_denom = _ninf_array(N)
+    logprob = 0
+
+    for sequence in sequences:
+        T = len(sequence)
+        emissions = outputs[:, sequence].T
+
+        # compute forward and backward probabilities
+        alpha = _ninf_array((T, N))
+        beta = _ninf_array((T, N))
+        alpha[0] = priors + emissions[0]
+        for t in range(1, T):
+            alpha[t] = logsumexp2(alpha[t - 1] + transitions.T, axis=1) + emissions[t]
+        beta[T - 1] = 0
+        for t in range(T - 2, -1, -1):
+            beta[t] = logsumexp2(transitions + beta[t + 1] + emissions[t + 1], axis=1)
+
+        # find the log probability of the sequence
+        lpk = logsumexp2(alpha[T - 1])
+        alpha_plus_beta = alpha + beta - lpk
+
+        # add the expected counts of this sequence to the sums
+        for t in range(T - 1):
+            numer_add = (
+                transitions
+                + emissions[t + 1]
+                + beta[t + 1]
+                + (alpha[t] - lpk).reshape(N, 1)
+            )
+            A_numer = np.logaddexp2(A_numer, numer_add)
+        if T > 1:
+            A_denom = np.logaddexp2(
+                A_denom, np.logaddexp2.reduce(alpha_plus_beta[:-1], axis=0)
+            )
+        B_denom = np.logaddexp2(B_denom, np.logaddexp2.reduce(alpha_plus_beta, axis=0))
+        for t in range(T):
+            xi = sequence[t]
+            B_numer[:, xi] = np.logaddexp2(B_numer[:, xi], alpha_plus_beta[t])
+
+        logprob += lpk
+
+    return logprob, A_numer, A_denom, B_numer, B_denom
+
+
+_worker_shards = None
+
+
+def _init_baum_welch_worker(shards):
+    global _worker_shards
+    _worker_shards = shards
+
+
+def _baum_welch_shard(args):
+    shard, priors, transitions, outputs = args
+    return _baum_welch_counts(_worker_shards[shard], priors, transitions, outputs)
+
+
 class HiddenMarkovModelTrainer(object):
     """
     Algorithms for learning HMM parameters from training data. These include
@@ -896,52 +1061,6 @@ class HiddenMarkovModelTrainer(object):
             model = self.train_unsupervised(unlabeled_sequences, **kwargs)
         return model
 
-    def _baum_welch_step(self, sequence, model, symbol_to_number):
-
-        N = len(model._states)
-        M = len(model._symbols)
-        T = len(sequence)
-
-        # compute forward and backward probabilities
-        alpha = model._forward_probability(sequence)
-        beta = model._backward_probability(sequence)
-
-        # find the log probability of the sequence
-        lpk = logsumexp2(alpha[T - 1])
-
-        A_numer = _ninf_array((N, N))
-        B_numer = _ninf_array((N, M))
-        A_denom = _ninf_array(N)
-        B_denom = _ninf_array(N)
-
-        transitions_logprob = model._transitions_matrix().T
-
-        for t in range(T):
-            symbol = sequence[t][_TEXT]  # not found? FIXME
-            next_symbol = None
-            if t < T - 1:
-                next_symbol = sequence[t + 1][_TEXT]  # not found? FIXME
-            xi = symbol_to_number[symbol]
-
-            next_outputs_logprob = model._outputs_vector(next_symbol)
-            alpha_plus_beta = alpha[t] + beta[t]
-
-            if t < T - 1:
-                numer_add = (
-                    transitions_logprob
-                    + next_outputs_logprob
-                    + beta[t + 1]
-                    + alpha[t].reshape(N, 1)
-                )
-                A_numer = np.logaddexp2(A_numer, numer_add)
-                A_denom = np.logaddexp2(A_denom, alpha_plus_beta)
-            else:
-                B_denom = np.logaddexp2(A_denom, alpha_plus_beta)
-
-            B_numer[:, xi] = np.logaddexp2(B_numer[:, xi], alpha_plus_beta)
-
-        return lpk, A_numer, A_denom, B_numer, B_denom
-
     def train_unsupervised(self, unlabeled_sequences, update_outputs=True, **kwargs):
         """
         Trains the HMM using the Baum-Welch algorithm to maximise the
@@ -964,6 +1083,9 @@ class HiddenMarkovModelTrainer(object):
         :param max_iterations: the maximum number of EM iterations
         :param convergence_logprob: the maximum change in log probability to
             allow convergence
+        :param processes: the number of worker processes that share the
+            E-step of each iteration, or None to use one per CPU. The
+            default of 1 trains in this process.
         """
 
         # create a uniform HMM, which will be iteratively refined, unless
@@ -988,25 +1110,22 @@ class HiddenMarkovModelTrainer(object):
         M = len(self._symbols)
         symbol_numbers = dict((sym, i) for i, sym in enumerate(self._symbols))
 
-        # update model prob dists so that they can be modified
-        # model._priors = MutableProbDist(model._priors, self._states)
-
-        model._transitions = DictionaryConditionalProbDist(
-            dict(
-                (s, MutableProbDist(model._transitions[s], self._states))
-                for s in self._states
-            )
-        )
-
-        if update_outputs:
-            model._outputs = DictionaryConditionalProbDist(
-                dict(
-                    (s, MutableProbDist(model._outputs[s], self._symbols))
-                    for s in self._states
-                )
-            )
-
+        # The E-step works on arrays of symbol numbers and log probabilities:
+        # priors, transitions (from row state to column state) and outputs
+        # (from state to symbol).
+        sequences = [
+            np.array([symbol_numbers[token[_TEXT]] for token in sequence], np.intp)
+            for sequence in unlabeled_sequences
+        ]
+        sequences = [sequence for sequence in sequences if len(sequence)]
+        priors = np.array([model._priors.logprob(s) for s in self._states])
+        # the transition matrix is cached, and the given model's
+        # transitions may have been changed in place since it was built
         model.reset_cache()
+        transitions = np.array(model._transitions_matrix().T, np.float64)
+        outputs = np.array(
+            [model._outputs_vector(symbol) for symbol in self._symbols], np.float64
+        ).T.reshape(N, M)
 
         # iterate until convergence
         converged = False
@@ -1014,73 +1133,99 @@ class HiddenMarkovModelTrainer(object):
         iteration = 0
         max_iterations = kwargs.get('max_iterations', 1000)
         epsilon = kwargs.get('convergence_logprob', 1e-6)
-
-        while not converged and iteration < max_iterations:
-            A_numer = _ninf_array((N, N))
-            B_numer = _ninf_array((N, M))
-            A_denom = _ninf_array(N)
-            B_denom = _ninf_array(N)
-
-            logprob = 0
-            for sequence in unlabeled_sequences:
-                sequence = list(sequence)
-                if not sequence:
-                    continue
-
-                (
-                    lpk,
-                    seq_A_numer,
-                    seq_A_denom,
-                    seq_B_numer,
-                    seq_B_denom,
-                ) = self._baum_welch_step(sequence, model, symbol_numbers)
-
-                # add these sums to the global A and B values
-                for i in range(N):
-                    A_numer[i] = np.logaddexp2(A_numer[i], seq_A_numer[i] - lpk)
-                    B_numer[i] = np.logaddexp2(B_numer[i], seq_B_numer[i] - lpk)
-
-                A_denom = np.logaddexp2(A_denom, seq_A_denom - lpk)
-                B_denom = np.logaddexp2(B_denom, seq_B_denom - lpk)
-
-                logprob += lpk
-
-            # use the calculated values to update the transition and output
-            # probability values
-            for i in range(N):
-                logprob_Ai = A_numer[i] - A_denom[i]
-                logprob_Bi = B_numer[i] - B_denom[i]
+        processes = kwargs.get('processes', 1)
+
+        pool = None
+        if processes != 1:
+            n_shards = processes or cpu_count()
+            shards = [sequences[k::n_shards] for k in range(n_shards)]
+            pool = Pool(
+                n_shards, initializer=_init_baum_welch_worker, initargs=(shards,)
+            )
+        try:
+            while not converged and iteration < max_iterations:
+                start = time.time()
+
+                # E-step: expected transition and output counts, summed over
+                # the sequences of each shard and then over the shards
+                if pool is None:
+                    results = [
+                        _baum_welch_counts(sequences, priors, transitions, outputs)
+                    ]
+                else:
+                    tasks = [
+                        (k, priors, transitions, outputs) for k in range(n_shards)
+                    ]
+                    results = pool.map(_baum_welch_shard, tasks)
+                logprob, A_numer, A_denom, B_numer, B_denom = results[0]
+                for result in results[1:]:
+                    logprob += result[0]
+                    A_numer = np.logaddexp2(A_numer, result[1])
+                    A_denom = np.logaddexp2(A_denom, result[2])
+                    B_numer = np.logaddexp2(B_numer, result[3])
+                    B_denom = np.logaddexp2(B_denom, result[4])
+
+                # M-step: use the calculated values to update the transition
+                # and output probability values
+                logprob_A = A_numer - A_denom[:, None]
+                logprob_B = B_numer - B_denom[:, None]
 
                 # We should normalize all probabilities (see p.391 Huang et al)
                 # Let sum(P) be K.
                 # We can divide each Pi by K to make sum(P) == 1.
                 #   Pi' = Pi/K
                 #   log2(Pi') = log2(Pi) - log2(K)
-                logprob_Ai -= logsumexp2(logprob_Ai)
-                logprob_Bi -= logsumexp2(logprob_Bi)
-
-                # update output and transition probabilities
-                si = self._states[i]
-
-                for j in range(N):
-                    sj = self._states[j]
-                    model._transitions[si].update(sj, logprob_Ai[j])
-
+                transitions = logprob_A - logsumexp2(logprob_A, axis=1)[:, None]
                 if update_outputs:
-                    for k in range(M):
-                        ok = self._symbols[k]
-                        model._outputs[si].update(ok, logprob_Bi[k])
+                    outputs = logprob_B - logsumexp2(logprob_B, axis=1)[:, None]
 
                 # Rabiner says the priors don't need to be updated. I don't
                 # believe him. FIXME
 
-            # test for convergence
-            if iteration > 0 and abs(logprob - last_logprob) < epsilon:
-                converged = True
+                # test for convergence
+                if iteration > 0 and abs(logprob - last_logprob) < epsilon:
+                    converged = True
+
+                print(
+                    'iteration',
+                    iteration,
+                    'logprob',
+                    logprob,
+                    'time %.2fs' % (time.time() - start),
+                )
+                iteration += 1
+                last_logprob = logprob
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        if converged:
+            print('converged after', iteration, 'iterations')
+
+        # update model prob dists with the trained values
+        model._transitions = DictionaryConditionalProbDist(
+            dict(
+                (s, MutableProbDist(model._transitions[s], self._states))
+                for s in self._states
+            )
+        )
+        for i, si in enumerate(self._states):
+            for j, sj in enumerate(self._states):
+                model._transitions[si].update(sj, transitions[i, j])
+
+        if update_outputs:
+            model._outputs = DictionaryConditionalProbDist(
+                dict(
+                    (s, MutableProbDist(model._outputs[s], self._symbols))
+                    for s in self._states
+                )
+            )
+            for i, si in enumerate(self._states):
+                for k, ok in enumerate(self._symbols):
+                    model._outputs[si].update(ok, outputs[i, k])
 
-            print('iteration', iteration, 'logprob', logprob)
-            iteration += 1
-            last_logprob = logprob
+        model.reset_cache()
 
         return model
 
@@ -1151,9 +1296,16 @@ def _ninf_array(shape):
     return res
 
 
-def logsumexp2(arr):
-    max_ = arr.max()
-    return np.log2(np.sum(2 ** (arr - max_))) + max_
+def logsumexp2(arr, axis=None):
+    """
+    Returns the base 2 logarithm of the sum of 2 to the power of the
+    elements of arr, along the given axis if any.
+    """
+    max_ = arr.max(axis=axis, keepdims=True)
+    res = np.log2(np.sum(2 ** (arr - max_), axis=axis, keepdims=True)) + max_
+    if axis is None:
+        return res.reshape(())[()]
+    return res.squeeze(axis)
 
 
 def _log_add(*values):
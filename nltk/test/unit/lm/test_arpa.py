@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# Natural Language Toolkit: Language Model Unit Tests
+#
+# Copyright (C) 2001-2019 NLTK Project
+# URL: <http://nltk.org/>
+# For license information, see LICENSE.TXT
+
+from __future__ import division
+
+import io
+import math
+import os
+import shutil
+import tempfile
+import unittest
+
+from nltk.lm import MLE, KneserNeyInterpolated, WittenBellInterpolated
+from nltk.lm.arpa import load_arpa, load_binary
+from nltk.lm.preprocessing import padded_everygram_pipeline
+
+
+def _fit(model_cls, order):
+    text = [list("abcd"), list("egadbe"), list("bcda")]
+    train, vocab = padded_everygram_pipeline(order, text)
+    model = model_cls(order)
+    model.fit(train, vocab)
+    return model
+
+
+class ArpaRoundTripTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _path(self, name):
+        return os.path.join(self.tmpdir, name)
+
+    def _reload(self, model):
+        model.save_arpa(self._path("model.arpa"))
+        model.save_binary(self._path("model.bin"))
+        return load_arpa(self._path("model.arpa")), load_binary(self._path("model.bin"))
+
+    def assertScoresMatch(self, model, loaded):
+        contexts = set(
+            context
+            for order in range(2, model.order + 1)
+            for context in model.counts[order].conditions()
+        )
+        for context in sorted(contexts) + [()]:
+            for word in model.vocab:
+                self.assertAlmostEqual(
+                    model.score(word, context), loaded.score(word, context), places=5
+                )
+
+    def test_kneser_ney(self):
+        model = _fit(KneserNeyInterpolated, 3)
+        for loaded in self._reload(model):
+            self.assertScoresMatch(model, loaded)
+
+    def test_witten_bell(self):
+        model = _fit(WittenBellInterpolated, 3)
+        for loaded in self._reload(model):
+            self.assertScoresMatch(model, loaded)
+
+    def test_mle_zero_scores(self):
+        model = _fit(MLE, 2)
+        for loaded in self._reload(model):
+            self.assertScoresMatch(model, loaded)
+            self.assertEqual(loaded.score("c", ["a"]), 0.0)
+            self.assertTrue(math.isinf(loaded.logscore("c", ["a"])))
+
+    def test_unknown_words(self):
+        model = _fit(KneserNeyInterpolated, 2)
+        for loaded in self._reload(model):
+            self.assertIn("<UNK>", loaded.vocab)
+            self.assertEqual(loaded.vocab.lookup("aliens"), "<UNK>")
+            self.assertAlmostEqual(
+                loaded.score("aliens", ["a"]), model.score("aliens", ["a"]), places=5
+            )
+
+    def test_logscore(self):
+        model = _fit(KneserNeyInterpolated, 3)
+        for loaded in self._reload(model):
+            self.assertAlmostEqual(
+                loaded.logscore("b", ["<s>", "a"]),
+                model.logscore("b", ["<s>", "a"]),
+                places=5,
+            )
+
+    def test_resave(self):
+        model = _fit(KneserNeyInterpolated, 3)
+        loaded = self._reload(model)[1]
+        loaded.save_arpa(self._path("resaved.arpa"))
+        self.assertScoresMatch(model, load_arpa(self._path("resaved.arpa")))
+        self.assertRaises(TypeError, loaded.fit, [["a", "b"]])
+
+    def test_read_arpa_backoff(self):
+        with io.open(self._path("hand.arpa"), "w", encoding="utf-8") as fout:
+            fout.write(
+                u"\\data\\\nngram 1=3\nngram 2=1\n\n"
+                u"\\1-grams:\n-1.0\t<unk>\t0\n-0.5\ta\t-0.3\n-0.5\tb\n\n"
+                u"\\2-grams:\n-0.1\ta b\n\n\\end\\\n"
+            )
+        model = load_arpa(self._path("hand.arpa"), unk_label="<unk>")
+        self.assertEqual(model.order, 2)
+        self.assertAlmostEqual(model.score("b", ["a"]), 10 ** -0.1)
+        self.assertAlmostEqual(model.score("a", ["a"]), 10 ** (-0.3 - 0.5))
+        self.assertAlmostEqual(model.score("a", ["b"]), 10 ** -0.5)
+        self.assertAlmostEqual(model.score("zzz"), 10 ** -1.0)
+
+    def test_not_binary(self):
+        with open(self._path("junk.bin"), "wb") as fout:
+            fout.write(b"not a model")
+        with self.assertRaises(ValueError):
+            load_binary(self._path("junk.bin"))
@@ -6,12 +6,14 @@
 # URL: <http://nltk.org/>
 # For license information, see LICENSE.TXT
 
+from __future__ import division
+
 import unittest
 
 import six
 
 from nltk import FreqDist
-from nltk.lm import NgramCounter
+from nltk.lm import CompactNgramCounter, NgramCounter
 from nltk.util import everygrams
 
 
@@ -133,3 +135,58 @@ class NgramCounterTrainingTests(unittest.TestCase):
         six.assertCountEqual(self, unigrams, counter[1].keys())
         six.assertCountEqual(self, bigram_contexts, counter[2].keys())
         six.assertCountEqual(self, trigram_contexts, counter[3].keys())
+
+
+class CompactNgramCounterTests(unittest.TestCase):
+    """CompactNgramCounter should give the same counts as NgramCounter."""
+
+    @classmethod
+    def setUpClass(cls):
+        text = [list("abcd"), list("egdbe")]
+        cls.counter = NgramCounter(everygrams(sent, max_len=3) for sent in text)
+        # A tiny buffer forces several merges of the count arrays.
+        cls.compact = CompactNgramCounter(
+            (everygrams(sent, max_len=3) for sent in text), buffer_size=4
+        )
+
+    def test_N(self):
+        self.assertEqual(self.compact.N(), 21)
+        self.assertEqual(self.compact[2].N(), self.counter[2].N())
+
+    def test_orders(self):
+        self.assertEqual(len(self.compact), 3)
+        self.assertIn(3, self.compact)
+        self.assertNotIn(4, self.compact)
+
+    def test_unigrams(self):
+        self.assertEqual(self.compact["b"], 2)
+        self.assertEqual(self.compact["z"], 0)
+        self.assertEqual(dict(self.compact.unigrams), dict(self.counter.unigrams))
+        self.assertEqual(self.compact.unigrams.freq("e"), 2 / 9)
+
+    def test_contexts(self):
+        for order in (2, 3):
+            six.assertCountEqual(
+                self, self.counter[order].conditions(), self.compact[order].conditions()
+            )
+            for context in self.counter[order].conditions():
+                self.assertEqual(
+                    dict(self.counter[context]), dict(self.compact[context])
+                )
+                self.assertEqual(self.counter[context].N(), self.compact[context].N())
+
+    def test_unseen_context(self):
+        self.assertEqual(self.compact[["z"]]["a"], 0)
+        self.assertFalse(self.compact[["a", "z"]])
+        self.assertEqual(self.compact[["z"]].N(), 0)
+
+    def test_update(self):
+        counter = CompactNgramCounter([[("a", "b"), ("a",)]])
+        counter.update([[("a", "b"), ("a", "c")]])
+        self.assertEqual(counter[["a"]]["b"], 2)
+        self.assertEqual(counter[["a"]]["c"], 1)
+        self.assertEqual(counter["a"], 1)
+
+    def test_train_on_illegal_sentences(self):
+        with self.assertRaises(TypeError):
+            CompactNgramCounter([["Check", "this", "out", "!"]])
@@ -15,6 +15,7 @@ import unittest
 from six import add_metaclass
 
 from nltk.lm import (
+    CompactNgramCounter,
     Vocabulary,
     MLE,
     Lidstone,
@@ -52,6 +53,7 @@ class ParametrizeTestsMeta(type):
         )
         for i, c in enumerate(contexts):
             dct["test_sumto1_{0}".format(i)] = cls.add_sum_to_1_test(c)
+        dct["test_score_many"] = cls.add_score_many_test(contexts)
         scores = dct.get("score_tests", [])
         for i, (word, context, expected_score) in enumerate(scores):
             dct["test_score_{0}".format(i)] = cls.add_score_test(
@@ -79,6 +81,18 @@ class ParametrizeTestsMeta(type):
 
         return test_method
 
+    @classmethod
+    def add_score_many_test(cls, contexts):
+        def test(self):
+            ngrams = [c + (w,) for c in contexts + ((),) for w in self.model.vocab]
+            expected = [self.model.score(ngram[-1], ngram[:-1]) for ngram in ngrams]
+            scores = self.model.score_many(ngrams)
+            self.assertEqual(len(scores), len(expected))
+            for score, expected_score in zip(scores, expected):
+                self.assertAlmostEqual(score, expected_score)
+
+        return test
+
     @classmethod
     def add_sum_to_1_test(cls, context):
         def test(self):
@@ -148,6 +162,13 @@ class MleBigramTests(unittest.TestCase):
         self.assertTrue(math.isinf(self.model.entropy(untrained)))
         self.assertTrue(math.isinf(self.model.perplexity(untrained)))
 
+    def test_logscore_many(self):
+        ngrams = [("<s>", "a"), ("a", "b"), ("d", "e"), ("a",)]
+        logscores = self.model.logscore_many(ngrams)
+        for ngram, logscore in zip(ngrams, logscores):
+            self.assertAlmostEqual(self.model.logscore(ngram[-1], ngram[:-1]), logscore)
+        self.assertTrue(math.isinf(logscores[2]))
+
     def test_entropy_perplexity_unigrams(self):
         # word = score, log score
         # <s>   = 0.1429, -2.8074
@@ -440,3 +461,23 @@ class NgramModelTextGenerationTests(unittest.TestCase):
             self.model.generate(text_seed=None, random_seed=3),
             self.model.generate(random_seed=3),
         )
+
+
+class CompactNgramCounterModelTests(unittest.TestCase):
+    """Models backed by CompactNgramCounter should score like the defaults."""
+
+    def test_scores_match(self):
+        vocab, training_text = _prepare_test_data(3)
+        for model_cls in (MLE, Laplace, WittenBellInterpolated, KneserNeyInterpolated):
+            model = model_cls(3, vocabulary=vocab)
+            model.fit(training_text)
+            compact = model_cls(3, vocabulary=vocab, counter=CompactNgramCounter())
+            compact.fit(training_text)
+            for context in (None, ("a",), ("b",), ("a", "b"), ("<s>", "<s>")):
+                for word in vocab:
+                    self.assertAlmostEqual(
+                        model.score(word, context), compact.score(word, context)
+                    )
+            self.assertEqual(
+                model.generate(5, random_seed=3), compact.generate(5, random_seed=3)
+            )
@@ -7,7 +7,8 @@
 # For license information, see LICENSE.TXT
 import unittest
 
-from nltk.lm.preprocessing import padded_everygram_pipeline
+from nltk.lm import MLE, CompactNgramCounter, NgramCounter, Vocabulary
+from nltk.lm.preprocessing import padded_everygram_counts, padded_everygram_pipeline
 
 
 class TestPreprocessing(unittest.TestCase):
@@ -29,3 +30,53 @@ class TestPreprocessing(unittest.TestCase):
         train_data, vocab_data = padded_everygram_pipeline(2, [["a", "b", "c"]])
         self.assertEqual([list(sent) for sent in train_data], expected_train)
         self.assertEqual(list(vocab_data), expected_vocab)
+
+
+def _read_sents(fileid):
+    return [list(word) for word in fileid.split()]
+
+
+class TestParallelCounting(unittest.TestCase):
+    def setUp(self):
+        self.text = [list("abcd"), list("egadbe"), list("bcda"), list("aab")]
+
+    def assertSameCounts(self, counter, expected):
+        for order in (1, 2, 3):
+            self.assertEqual(counter[order].N(), expected[order].N())
+        for context in expected[3].conditions():
+            self.assertEqual(dict(counter[context]), dict(expected[context]))
+
+    def test_matches_serial_counting(self):
+        expected = NgramCounter()
+        train, vocab = padded_everygram_pipeline(3, self.text)
+        expected.update(train)
+        counter, vocabulary = padded_everygram_counts(
+            3, iter([self.text[:1], self.text[1:3], self.text[3:]]), processes=1
+        )
+        self.assertSameCounts(counter, expected)
+        self.assertEqual(vocabulary, Vocabulary(vocab))
+
+    def test_unk_cutoff(self):
+        model = MLE(2, vocabulary=Vocabulary(unk_cutoff=2))
+        model.fit(*padded_everygram_pipeline(2, self.text))
+        counter, vocabulary = padded_everygram_counts(
+            2,
+            [self.text[:2], self.text[2:]],
+            vocabulary=Vocabulary(unk_cutoff=2),
+            processes=2,
+        )
+        self.assertEqual(vocabulary, model.vocab)
+        self.assertIn("<UNK>", counter.unigrams)
+        self.assertEqual(dict(counter.unigrams), dict(model.counts.unigrams))
+
+    def test_reader_and_compact_counter(self):
+        counter, _ = padded_everygram_counts(
+            2,
+            ["abcd egadbe", "bcda aab"],
+            reader=_read_sents,
+            counter=CompactNgramCounter(),
+            processes=2,
+        )
+        expected = NgramCounter(padded_everygram_pipeline(2, self.text)[0])
+        self.assertEqual(counter.N(), expected.N())
+        self.assertEqual(dict(counter[["a"]]), dict(expected[["a"]]))
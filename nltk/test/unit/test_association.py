@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for scoring arrays of marginals with nltk.metrics.association.
+"""
+from __future__ import absolute_import, unicode_literals
+import unittest
+
+from nltk.metrics.association import (
+    BigramAssocMeasures,
+    TrigramAssocMeasures,
+    QuadgramAssocMeasures,
+)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+MEASURES = [
+    'raw_freq',
+    'student_t',
+    'chi_sq',
+    'mi_like',
+    'pmi',
+    'likelihood_ratio',
+    'poisson_stirling',
+    'jaccard',
+]
+
+
+@unittest.skipIf(numpy is None, 'numpy is required for array scores')
+class TestArrayMeasures(unittest.TestCase):
+    def assert_array_scores(self, measures, contingencies, names):
+        marginals = [measures._marginals(*cont) for cont in contingencies]
+        columns = []
+        for i, value in enumerate(marginals[0][:-1]):
+            if isinstance(value, tuple):
+                columns.append(
+                    tuple(
+                        numpy.array([m[i][j] for m in marginals], float)
+                        for j in range(len(value))
+                    )
+                )
+            else:
+                columns.append(numpy.array([m[i] for m in marginals], float))
+        columns.append(numpy.array([m[-1] for m in marginals], float))
+
+        for name in names:
+            score_fn = getattr(measures, name)
+            scores = score_fn(*columns)
+            self.assertEqual(len(scores), len(contingencies))
+            for score, margs in zip(scores, marginals):
+                self.assertAlmostEqual(score, score_fn(*margs), places=9, msg=name)
+
+    def test_bigram(self):
+        contingencies = [(8, 5, 24, 31740), (110, 2442, 111, 29114), (1, 3, 2, 94)]
+        self.assert_array_scores(
+            BigramAssocMeasures,
+            contingencies,
+            MEASURES + ['phi_sq', 'dice'],
+        )
+
+    def test_bigram_fisher(self):
+        try:
+            import scipy
+        except ImportError:
+            raise unittest.SkipTest('scipy is required for the fisher measure')
+        contingencies = [(8, 5, 24, 31740), (0, 5, 0, 20), (3, 0, 1, 7)]
+        self.assert_array_scores(BigramAssocMeasures, contingencies, ['fisher'])
+
+    def test_trigram(self):
+        contingencies = [(3, 1, 4, 1, 5, 9, 2, 6535), (10, 2, 7, 1, 8, 2, 8, 1828)]
+        self.assert_array_scores(TrigramAssocMeasures, contingencies, MEASURES)
+
+    def test_quadgram(self):
+        contingencies = [
+            tuple(range(1, 16)) + (10000,),
+            (5, 3, 5, 8, 9, 7, 9, 3, 2, 3, 8, 4, 6, 2, 6, 4338),
+        ]
+        self.assert_array_scores(QuadgramAssocMeasures, contingencies, MEASURES)
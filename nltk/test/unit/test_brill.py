@@ -35,3 +35,46 @@ class TestBrill(unittest.TestCase):
     @unittest.skip("Should be tested in __main__ of nltk.tbl.demo")
     def test_brill_demo(self):
         demo()
+
+    def test_train_processes(self):
+        train_sents = [
+            [('the', 'DT'), ('can', 'NN'), ('is', 'VBZ'), ('red', 'JJ')],
+            [('I', 'PRP'), ('can', 'MD'), ('see', 'VB'), ('it', 'PRP')],
+            [('you', 'PRP'), ('can', 'MD'), ('go', 'VB')],
+            [('a', 'DT'), ('can', 'NN'), ('fell', 'VBD')],
+            [('they', 'PRP'), ('can', 'MD'), ('run', 'VB')],
+        ]
+        tagger = UnigramTagger(train_sents)
+        templates = [brill.Template(brill.Pos([-1])), brill.Template(brill.Word([1]))]
+        rules = []
+        for processes in (1, 2):
+            trainer = brill_trainer.BrillTaggerTrainer(
+                tagger, templates, deterministic=True
+            )
+            rules.append(trainer.train(train_sents, processes=processes).rules())
+        self.assertEqual(rules[0], rules[1])
+        self.assertEqual(len(rules[0]), 1)
+
+        stats = brill_trainer.benchmark(tagger, templates, train_sents, max_rules=5)
+        self.assertEqual(stats['tokens'], 17)
+        self.assertEqual(stats['rules'], 1)
+
+    def test_tag_sents(self):
+        from nltk.tag import DefaultTagger
+        from nltk.tbl import Rule
+
+        rules = [
+            Rule('000', 'NN', 'VB', [(brill.Word([-1]), 'to')]),
+            Rule('001', 'NN', 'DT', [(brill.Word([0]), 'the')]),
+            Rule('002', 'VB', 'NN', [(brill.Pos([-2, -1]), 'DT')]),
+        ]
+        tagger = brill.BrillTagger(DefaultTagger('NN'), rules)
+        sents = ['I want to go'.split(), 'the to go'.split(), 'to the run'.split(), []]
+        expected = [
+            [('I', 'NN'), ('want', 'NN'), ('to', 'NN'), ('go', 'VB')],
+            [('the', 'DT'), ('to', 'NN'), ('go', 'NN')],
+            [('to', 'NN'), ('the', 'VB'), ('run', 'NN')],
+            [],
+        ]
+        self.assertEqual(tagger.tag_sents(sents), expected)
+        self.assertEqual([tagger.tag(sent) for sent in sents], expected)
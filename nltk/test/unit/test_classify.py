@@ -33,7 +33,7 @@ def assert_classifier_correct(algorithm):
         classifier = classify.MaxentClassifier.train(
             TRAIN, algorithm, trace=0, max_iter=1000
         )
-    except (LookupError, AttributeError) as e:
+    except (LookupError, AttributeError, ImportError) as e:
         raise SkipTest(str(e))
 
     for (px, py), featureset in zip(RESULTS, TEST):
@@ -48,3 +48,37 @@ def test_megam():
 
 def test_tadm():
     assert_classifier_correct('TADM')
+
+
+def test_lbfgs():
+    assert_classifier_correct('LBFGS')
+
+
+def test_classify_many():
+    try:
+        import numpy
+    except ImportError:
+        raise SkipTest('numpy is required for batch classification')
+
+    classifier = classify.MaxentClassifier.train(TRAIN, 'GIS', trace=0, max_iter=10)
+    labels = classifier.labels()
+    probs = classifier.prob_classify_array(TEST)
+    assert probs.shape == (len(TEST), len(labels))
+    pdists = classifier.prob_classify_many(TEST)
+    for featureset, pdist, row in zip(TEST, pdists, probs):
+        expected = classifier.prob_classify(featureset)
+        for label, p in zip(labels, row):
+            assert abs(expected.prob(label) - pdist.prob(label)) < 1e-12
+            assert abs(expected.prob(label) - p) < 1e-12
+    assert classifier.classify_many(TEST) == [
+        classifier.classify(featureset) for featureset in TEST
+    ]
+    assert classifier.classify_many(fs for fs in TEST) == classifier.classify_many(TEST)
+
+
+def test_decisiontree_classify_many():
+    classifier = classify.DecisionTreeClassifier.train(TRAIN, entropy_cutoff=0)
+    assert classifier.classify_many(TEST) == [
+        classifier.classify(featureset) for featureset in TEST
+    ]
+    assert classifier.classify_many(fs for fs in TEST) == classifier.classify_many(TEST)
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for nltk.cluster.
+"""
+from __future__ import absolute_import
+import random
+import unittest
+
+from nose import SkipTest
+
+try:
+    import numpy
+except ImportError:
+    raise SkipTest('numpy is required for nltk.cluster')
+
+from nltk.cluster import KMeansClusterer, GAAClusterer, euclidean_distance
+
+
+def separated_vectors(num_means=3, size=30):
+    """Vectors scattered tightly around num_means distant points."""
+    rng = numpy.random.RandomState(0)
+    centres = numpy.arange(num_means)[:, None] * 10.0 * numpy.ones(2)
+    return [centres[i % num_means] + rng.rand(2) for i in range(size)]
+
+
+class TestKMeans(unittest.TestCase):
+    def assert_separated(self, clusters, num_means):
+        for i in range(num_means):
+            self.assertEqual(len(set(clusters[i::num_means])), 1)
+        self.assertEqual(len(set(clusters)), num_means)
+
+    def test_initial_means(self):
+        # example from figure 14.9, page 517, Manning and Schutze
+        vectors = [numpy.array(f) for f in [[2, 1], [1, 3], [4, 7], [6, 7]]]
+        clusterer = KMeansClusterer(
+            2, euclidean_distance, initial_means=[[4, 3], [5, 5]]
+        )
+        self.assertEqual(clusterer.cluster(vectors, True), [0, 0, 1, 1])
+        self.assertEqual(
+            [list(mean) for mean in clusterer.means()], [[1.5, 2.0], [5.0, 7.0]]
+        )
+        self.assertEqual(clusterer.classify_many(vectors), [0, 0, 1, 1])
+
+    def test_kmeans_plus_plus(self):
+        vectors = separated_vectors()
+        clusterer = KMeansClusterer(
+            3, euclidean_distance, initialisation='k-means++', rng=random.Random(0)
+        )
+        self.assert_separated(clusterer.cluster(vectors, True), 3)
+
+    def test_mini_batch(self):
+        vectors = numpy.array(separated_vectors(size=300))
+        clusterer = KMeansClusterer(
+            3,
+            euclidean_distance,
+            initialisation='k-means++',
+            batch_size=50,
+            rng=random.Random(0),
+        )
+        clusterer.cluster(vectors)
+        self.assert_separated(clusterer.classify_many(vectors), 3)
+
+    def test_processes(self):
+        vectors = separated_vectors()
+        means = []
+        for processes in (1, 2):
+            clusterer = KMeansClusterer(
+                3,
+                euclidean_distance,
+                repeats=3,
+                avoid_empty_clusters=True,
+                rng=random.Random(0),
+                processes=processes,
+            )
+            clusterer.cluster(vectors)
+            means.append([list(mean) for mean in clusterer.means()])
+        self.assertEqual(means[0], means[1])
+
+
+class TestGAAC(unittest.TestCase):
+    def test_cluster(self):
+        vectors = [
+            numpy.array(f) for f in [[3, 3], [1, 2], [4, 2], [4, 0], [2, 3], [3, 1]]
+        ]
+        clusterer = GAAClusterer(4)
+        self.assertEqual(clusterer.cluster(vectors, True), [0, 2, 3, 1, 2, 3])
+        self.assertEqual(clusterer.num_clusters(), 4)
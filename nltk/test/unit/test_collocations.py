@@ -4,6 +4,8 @@ import unittest
 
 from nltk.collocations import BigramCollocationFinder
 from nltk.metrics import BigramAssocMeasures
+from nltk.probability import FreqDist
+from nltk.util import bigrams
 
 ## Test bigram counters with discontinuous bigrams and repeated words
 
@@ -157,3 +159,47 @@ class TestBigram(unittest.TestCase):
                 ),
             )
         )
+
+    def test_merge(self):
+        sents = [
+            'this this is is a a test test'.split(),
+            'this is a test of the test'.split(),
+        ]
+        finders = [BigramCollocationFinder.from_words(sent) for sent in sents]
+        finders[0].merge(finders[1])
+        merged = BigramCollocationFinder.from_shards(sents)
+
+        word_fd = FreqDist(sents[0] + sents[1])
+        bigram_fd = FreqDist(list(bigrams(sents[0])) + list(bigrams(sents[1])))
+        expected = BigramCollocationFinder(word_fd, bigram_fd)
+        for finder in (finders[0], merged):
+            self.assertEqual(finder.N, len(sents[0]) + len(sents[1]))
+            for score_fn in (
+                BigramAssocMeasures.pmi,
+                BigramAssocMeasures.likelihood_ratio,
+                BigramAssocMeasures.chi_sq,
+                BigramAssocMeasures.student_t,
+            ):
+                self.assertEqual(
+                    finder.score_ngrams(score_fn), expected.score_ngrams(score_fn)
+                )
+                self.assertEqual(
+                    finder.nbest(score_fn, 3), expected.nbest(score_fn, 3)
+                )
+            self.assertEqual(sorted(finder.ngram_fd.items()), sorted(bigram_fd.items()))
+
+    def test_exact_scores(self):
+        sent = 'this this is is a a test test of the test'.split()
+        finder = BigramCollocationFinder.from_words(sent, window_size=3)
+        for score_fn in (BigramAssocMeasures.pmi, BigramAssocMeasures.likelihood_ratio):
+            # A plain function is always scored one candidate at a time.
+            expected = finder.score_ngrams(lambda *marginals: score_fn(*marginals))
+            self.assertEqual(finder.score_ngrams(score_fn), expected)
+            self.assertEqual(finder.nbest(score_fn, 3), [p for p, s in expected[:3]])
+            self.assertEqual(
+                list(finder.above_score(score_fn, expected[4][1])),
+                [p for p, s in expected[:4]],
+            )
+            finder.exact_scores = False
+            self.assertTrue(close_enough(finder.score_ngrams(score_fn), expected))
+            finder.exact_scores = True
@@ -78,6 +78,87 @@ def test_backward_probability():
     assert_array_almost_equal(wikipedia_results, bp, 4)
 
 
+def _random_hmm(n_states, n_symbols, seed=0):
+    import numpy as np
+
+    rng = np.random.RandomState(seed)
+    states = ['s%d' % i for i in range(n_states)]
+    symbols = ['o%d' % i for i in range(n_symbols)]
+    A = rng.dirichlet(np.ones(n_states) * 0.5, n_states)
+    B = rng.dirichlet(np.ones(n_symbols) * 0.5, n_states)
+    pi = rng.dirichlet(np.ones(n_states))
+    model = hmm._create_hmm_tagger(states, symbols, A, B, pi)
+    sequences = [
+        [symbols[k] for k in rng.randint(0, n_symbols, length)]
+        for length in rng.randint(1, 12, 40)
+    ]
+    return model, sequences
+
+
+def test_best_path_matches_simple_viterbi():
+    model, sequences = _random_hmm(6, 10)
+    for seq in sequences:
+        assert model.best_path(seq) == model.best_path_simple(seq)
+
+
+def test_tag_sents_batched():
+    model, sequences = _random_hmm(8, 15)
+    sequences.append([])
+    expected = [model.tag(seq) if seq else [] for seq in sequences]
+    assert model.tag_sents(sequences) == expected
+    assert model.best_paths(sequences, batch_size=3) == [
+        [state for symbol, state in tagged] for tagged in expected
+    ]
+
+
+def _train_unsupervised(model, sequences, **kwargs):
+    import numpy as np
+
+    trainer = hmm.HiddenMarkovModelTrainer(model._states, model._symbols)
+    trained = trainer.train_unsupervised(
+        [[(symbol, None) for symbol in seq] for seq in sequences],
+        model=model,
+        max_iterations=3,
+        **kwargs
+    )
+    transitions = [
+        [trained._transitions[si].prob(sj) for sj in model._states]
+        for si in model._states
+    ]
+    outputs = [
+        [trained._outputs[si].prob(ok) for ok in model._symbols]
+        for si in model._states
+    ]
+    return np.array(transitions), np.array(outputs)
+
+
+def test_train_unsupervised_processes():
+    import numpy as np
+
+    model, sequences = _random_hmm(5, 12)
+    sequential = _train_unsupervised(model, sequences)
+    model, sequences = _random_hmm(5, 12)
+    parallel = _train_unsupervised(model, sequences, processes=2)
+    for expected, probs in zip(sequential, parallel):
+        assert np.allclose(probs, expected)
+        assert np.allclose(probs.sum(axis=1), 1)
+
+
+def test_train_unsupervised_transitions_cache():
+    import numpy as np
+
+    other, _ = _random_hmm(5, 12, seed=1)
+    model, sequences = _random_hmm(5, 12)
+    model._transitions_matrix()
+    model._transitions = other._transitions
+    fresh, _ = _random_hmm(5, 12)
+    fresh._transitions = other._transitions
+    for expected, probs in zip(
+        _train_unsupervised(fresh, sequences), _train_unsupervised(model, sequences)
+    ):
+        assert np.allclose(probs, expected)
+
+
 def setup_module(module):
     from nose import SkipTest
 
@@ -22,3 +22,28 @@ class NaiveBayesClassifierTest(unittest.TestCase):
         result = classifier.prob_classify({'bad': True})
         self.assertTrue(result.prob('positive') < result.prob('negative'))
         self.assertEqual(result.max(), 'negative')
+
+    def test_classify_many(self):
+        training_features = [
+            ({'nice': True, 'good': True}, 'positive'),
+            ({'bad': True, 'mean': True}, 'negative'),
+            ({'nice': False, 'mean': True}, 'negative'),
+        ]
+        classifier = NaiveBayesClassifier.train(training_features)
+
+        featuresets = [
+            {'nice': True},
+            {'bad': True, 'good': False},
+            {'nice': 'unseen', 'unknown': True},
+            {},
+        ]
+        expected = [classifier.prob_classify(fs) for fs in featuresets]
+        results = classifier.prob_classify_many(featuresets)
+        for result, prob in zip(results, expected):
+            for label in classifier.labels():
+                self.assertAlmostEqual(result.prob(label), prob.prob(label))
+        self.assertEqual(
+            classifier.classify_many(featuresets),
+            [prob.max() for prob in expected],
+        )
+        self.assertEqual(classifier.classify_many([]), [])
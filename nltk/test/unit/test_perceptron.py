@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the averaged perceptron tagger.
+"""
+from __future__ import absolute_import, unicode_literals
+
+import os
+import pickle
+import random
+import shutil
+import tempfile
+import unittest
+
+from nltk.tag.perceptron import AveragedPerceptron, PerceptronTagger, convert_pickle
+from nltk.test.unit.utils import skipIf
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _corpus(seed, n_sents):
+    rng = random.Random(seed)
+    words = ['w%d' % i for i in range(200)] + ['1999', '42', 'well-known', 'The']
+    tags = ['T%d' % i for i in range(12)]
+    word_tags = dict((w, rng.sample(tags, rng.randint(1, 3))) for w in words)
+    return [
+        [(w, rng.choice(word_tags[w])) for w in rng.sample(words, rng.randint(1, 15))]
+        for _ in range(n_sents)
+    ]
+
+
+def _context(tagger, sent):
+    return tagger.START + [tagger.normalize(w) for w in sent] + tagger.END
+
+
+class TestPerceptronTagger(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        random.seed(0)
+        cls.tagger = PerceptronTagger(load=False)
+        cls.tagger.train(_corpus(0, 300), nr_iter=3)
+        cls.sentences = [[w for w, _ in sent] for sent in _corpus(1, 100)]
+        cls.sentences += [[], ['unseen', 'words', 'only']]
+
+    def test_tag_sents(self):
+        expected = [self.tagger.tag(sent) for sent in self.sentences]
+        self.assertEqual(self.tagger.tag_sents(self.sentences), expected)
+        self.assertEqual(self.tagger.tag_sents([]), [])
+
+    def test_predict_many(self):
+        model = self.tagger.model
+        tagger = self.tagger
+        features_list = [
+            tagger._get_features(i, word, _context(tagger, sent), prev, 'T1')
+            for sent in self.sentences
+            for i, word in enumerate(sent)
+            for prev in ('-START-', 'T0', 'T5')
+        ]
+        features_list.append({'bias': 1, 'unknown': 3})
+        self.assertEqual(
+            model.predict_many(features_list),
+            [model.predict(features) for features in features_list],
+        )
+
+    def test_dense_weights_follow_updates(self):
+        tagger = PerceptronTagger(load=False)
+        tagger.train(_corpus(2, 50), nr_iter=1)
+        context = _context(tagger, ['w1'])
+        features = tagger._get_features(0, 'w1', context, *tagger.START)
+        tagger.model.predict_many([features])
+        for tag in sorted(tagger.classes):
+            if tag != tagger.model.predict(features):
+                break
+        for _ in range(20):
+            tagger.model.update(tag, tagger.model.predict(features), features)
+        self.assertEqual(tagger.model.predict_many([features]), [tag])
+
+
+@skipIf(numpy is None, "numpy is required for array-based training")
+class TestPerceptronTraining(unittest.TestCase):
+    def test_same_model_as_dict_training(self):
+        sentences = _corpus(3, 200)
+        random.seed(0)
+        tagger = PerceptronTagger(load=False)
+        tagger.train(sentences, nr_iter=3)
+
+        # Train the dict-based perceptron with the same shuffles.
+        random.seed(0)
+        reference = PerceptronTagger(load=False)
+        reference._sentences = []
+        reference._make_tagdict(sentences)
+        reference.model.classes = reference.classes
+        for _ in range(3):
+            reference._train_epoch(reference.model, reference._sentences)
+            random.shuffle(reference._sentences)
+        reference.model.average_weights()
+
+        self.assertIsInstance(tagger.model, AveragedPerceptron)
+        self.assertEqual(tagger.model.weights, reference.model.weights)
+
+    def test_parameter_mixing(self):
+        sentences = _corpus(3, 200)
+        test = _corpus(4, 50)
+        random.seed(0)
+        sequential = PerceptronTagger(load=False)
+        sequential.train(sentences, nr_iter=3)
+        mixed = PerceptronTagger(load=False)
+        mixed.train(sentences, nr_iter=3, processes=2)
+        self.assertEqual(mixed.classes, sequential.classes)
+        self.assertGreater(mixed.evaluate(test), sequential.evaluate(test) - 0.1)
+
+
+@skipIf(numpy is None, "numpy is required for binary perceptron models")
+class TestBinaryPerceptronModel(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        self.tmpdir = tempfile.mkdtemp()
+        self.tagger = PerceptronTagger(load=False)
+        self.tagger.train(_corpus(0, 300), nr_iter=2)
+        self.sentences = [[w for w, _ in sent] for sent in _corpus(1, 50)]
+        self.sentences.append(['unseen', 'w1', 'well-known', '2018'])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def assertSameTags(self, tagger):
+        expected = [self.tagger.tag(sent) for sent in self.sentences]
+        self.assertEqual([tagger.tag(sent) for sent in self.sentences], expected)
+        self.assertEqual(tagger.tag_sents(self.sentences), expected)
+
+    def test_save_and_load(self):
+        path = os.path.join(self.tmpdir, 'model')
+        self.tagger.save_binary(path)
+        tagger = PerceptronTagger(load=False)
+        tagger.load_binary(path)
+        self.assertEqual(tagger.classes, self.tagger.classes)
+        self.assertEqual(tagger.tagdict, self.tagger.tagdict)
+        self.assertSameTags(tagger)
+
+        # A loaded model can be saved again, but not updated in place.
+        tagger.save_binary(os.path.join(self.tmpdir, 'copy'))
+        copy = PerceptronTagger(load=False)
+        copy.load_binary(os.path.join(self.tmpdir, 'copy'))
+        self.assertSameTags(copy)
+        self.assertRaises(TypeError, tagger.model.update, 'T0', 'T1', {})
+
+    def test_train_loaded_model(self):
+        path = os.path.join(self.tmpdir, 'model')
+        self.tagger.save_binary(path)
+        tagger = PerceptronTagger(load=False)
+        tagger.load_binary(path)
+        self.assertEqual(tagger.model.dict_weights(), self.tagger.model.weights)
+
+        sentences = _corpus(2, 100)
+        random.seed(1)
+        tagger.train(sentences, nr_iter=1)
+        random.seed(1)
+        self.tagger.train(sentences, nr_iter=1)
+        self.assertIsInstance(tagger.model, AveragedPerceptron)
+        self.assertEqual(tagger.model.weights, self.tagger.model.weights)
+
+    def test_convert_pickle(self):
+        pickle_path = os.path.join(self.tmpdir, 'model.pickle')
+        with open(pickle_path, 'wb') as fout:
+            tagger = self.tagger
+            pickle.dump((tagger.model.weights, tagger.tagdict, tagger.classes), fout, 2)
+        convert_pickle('file:' + pickle_path, os.path.join(self.tmpdir, 'model'))
+        tagger = PerceptronTagger(load=False)
+        tagger.load_binary(os.path.join(self.tmpdir, 'model'))
+        self.assertSameTags(tagger)
+
+    def test_not_a_model(self):
+        with open(os.path.join(self.tmpdir, 'model.json'), 'w') as fout:
+            fout.write('{}')
+        tagger = PerceptronTagger(load=False)
+        self.assertRaises(ValueError, tagger.load_binary, self.tmpdir)
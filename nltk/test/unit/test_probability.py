@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the compact frequency distributions of nltk.probability.
+"""
+from __future__ import absolute_import, unicode_literals
+import pickle
+import unittest
+
+from nltk.probability import (
+    CompactConditionalFreqDist,
+    CompactFreqDist,
+    ConditionalFreqDist,
+    ConditionalProbDist,
+    FreqDist,
+    MLEProbDist,
+)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+WORDS = 'the cat sat on the mat and the dog sat on the cat too'.split()
+
+
+@unittest.skipIf(numpy is None, 'numpy is required for compact distributions')
+class TestCompactFreqDist(unittest.TestCase):
+    def test_statistics(self):
+        fdist = FreqDist(WORDS)
+        compact = CompactFreqDist(WORDS, buffer_size=3)
+        self.assertEqual(compact, fdist)
+        self.assertEqual(compact.N(), fdist.N())
+        self.assertEqual(compact.B(), fdist.B())
+        self.assertEqual(compact.r_Nr(), fdist.r_Nr())
+        self.assertEqual(compact.Nr(0, 20), fdist.Nr(0, 20))
+        self.assertEqual(compact.freq('the'), fdist.freq('the'))
+        self.assertEqual(compact.most_common(3), [('the', 4), ('cat', 2), ('sat', 2)])
+        self.assertEqual(sorted(compact.hapaxes()), sorted(fdist.hapaxes()))
+
+    def test_updates(self):
+        compact = CompactFreqDist(buffer_size=2)
+        for word in WORDS:
+            compact[word] += 1
+        compact.update(['too', 'cat'])
+        del compact['mat']
+        self.assertEqual(compact.pop('dog'), 1)
+        fdist = FreqDist(WORDS + ['too', 'cat'])
+        del fdist['mat'], fdist['dog']
+        self.assertEqual(compact, fdist)
+        self.assertEqual(compact.N(), fdist.N())
+        self.assertEqual(compact['mat'], 0)
+        self.assertNotIn('mat', compact)
+        self.assertEqual(pickle.loads(pickle.dumps(compact)), fdist)
+
+
+@unittest.skipIf(numpy is None, 'numpy is required for compact distributions')
+class TestCompactConditionalFreqDist(unittest.TestCase):
+    PAIRS = [(len(word), word) for word in WORDS]
+
+    def test_conditions(self):
+        cfdist = ConditionalFreqDist(self.PAIRS)
+        compact = CompactConditionalFreqDist(self.PAIRS, buffer_size=4)
+        self.assertEqual(compact, cfdist)
+        self.assertEqual(compact.N(), cfdist.N())
+        self.assertEqual(sorted(compact.conditions()), sorted(cfdist.conditions()))
+        for condition in cfdist.conditions():
+            self.assertIsInstance(compact[condition], CompactFreqDist)
+            self.assertEqual(compact[condition].N(), cfdist[condition].N())
+            self.assertEqual(compact[condition].B(), cfdist[condition].B())
+
+        compact[3]['dog'] += 2
+        compact[4]['word'] += 1
+        cfdist[3]['dog'] += 2
+        cfdist[4]['word'] += 1
+        self.assertEqual(compact, cfdist)
+        self.assertEqual(compact.N(), cfdist.N())
+        del compact[4]
+        self.assertNotIn(4, compact)
+        self.assertEqual(compact.copy(), compact)
+        self.assertEqual(pickle.loads(pickle.dumps(compact)), compact)
+
+    def test_small_updates(self):
+        pairs = [(i % 100, i) for i in range(20000)]
+        cfdist = ConditionalFreqDist(pairs)
+        compact = CompactConditionalFreqDist(pairs, buffer_size=1000)
+        codes = compact._table.codes
+        for i in range(200):
+            words = ['w%d' % (i % 7), 'w%d' % (i % 5), i]
+            cfdist[i % 3].update(words)
+            compact[i % 3].update(words)
+        # Small updates are buffered rather than merged into the arrays.
+        self.assertIs(compact._table.codes, codes)
+        self.assertEqual(compact[1].N(), cfdist[1].N())
+        self.assertEqual(compact[1].B(), cfdist[1].B())
+        self.assertEqual(compact, cfdist)
+
+    def test_prob_dist(self):
+        cfdist = ConditionalFreqDist(self.PAIRS)
+        compact = CompactConditionalFreqDist(self.PAIRS)
+        expected = ConditionalProbDist(cfdist, MLEProbDist)
+        cpdist = ConditionalProbDist(compact, MLEProbDist)
+        for condition, sample in self.PAIRS:
+            self.assertEqual(
+                cpdist[condition].prob(sample), expected[condition].prob(sample)
+            )
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for nltk.text.
+"""
+from __future__ import absolute_import, unicode_literals
+
+import contextlib
+import shutil
+import sys
+import tempfile
+import unittest
+
+from six import StringIO
+
+from nltk.text import (
+    ConcordanceIndex,
+    ContextIndex,
+    MappedConcordanceIndex,
+    MappedContextIndex,
+    Text,
+    TextCollection,
+)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+TOKENS = (
+    'The cat sat on the mat . The dog sat on the cat , and the cat ran ! '
+    'A dog ran on a mat . The Cat sat .'
+).split()
+
+
+@contextlib.contextmanager
+def captured_stdout():
+    out, sys.stdout = sys.stdout, StringIO()
+    try:
+        yield sys.stdout
+    finally:
+        sys.stdout = out
+
+
+@unittest.skipIf(numpy is None, 'numpy is required for mapped indexes')
+class TestMappedIndexes(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_concordance_index(self):
+        index = ConcordanceIndex(TOKENS, key=lambda s: s.lower())
+        mapped = MappedConcordanceIndex.build(
+            iter(TOKENS), self.path, key=lambda s: s.lower()
+        )
+        self.assertEqual(list(mapped.tokens()), TOKENS)
+        for word in set(TOKENS) | {'unknown'}:
+            self.assertEqual(mapped.offsets(word), index.offsets(word))
+            self.assertEqual(
+                mapped.find_concordance(word), index.find_concordance(word)
+            )
+
+        reopened = MappedConcordanceIndex(self.path, key=lambda s: s.lower())
+        self.assertEqual(reopened.offsets('cat'), index.offsets('cat'))
+
+    def test_context_index(self):
+        index = ContextIndex(TOKENS, key=lambda s: s.lower())
+        mapped = MappedContextIndex.build(TOKENS, self.path, key=lambda s: s.lower())
+        for word in ['cat', 'the', 'mat']:
+            self.assertEqual(mapped.similar_words(word), index.similar_words(word))
+            self.assertEqual(
+                mapped.word_similarity_dict(word), index.word_similarity_dict(word)
+            )
+        for words in [['cat', 'dog'], ['The', 'a'], ['cat', 'unknown']]:
+            self.assertEqual(
+                list(mapped.common_contexts(words).items()),
+                list(index.common_contexts(words).items()),
+            )
+        self.assertRaises(
+            ValueError, mapped.common_contexts, ['cat', 'unknown'], True
+        )
+
+    def test_text_from_index(self):
+        text = Text(TOKENS)
+        mapped = Text.build_index(iter(TOKENS), self.path)
+        self.assertEqual(mapped.name, text.name)
+        self.assertEqual(mapped.count('cat'), text.count('cat'))
+        self.assertEqual(mapped.concordance_list('cat'), text.concordance_list('cat'))
+        for method, arg in [('similar', 'cat'), ('common_contexts', ['cat', 'dog'])]:
+            with captured_stdout() as expected:
+                getattr(text, method)(arg)
+            with captured_stdout() as out:
+                getattr(Text.from_index(self.path), method)(arg)
+            self.assertEqual(out.getvalue(), expected.getvalue())
+
+
+class TestTextCollectionIndex(unittest.TestCase):
+    TEXTS = [
+        'the cat sat on the mat'.split(),
+        'the dog sat'.split(),
+        'a cat and a dog and a cat'.split(),
+    ]
+
+    def test_index_scores(self):
+        scanned = TextCollection(self.TEXTS)
+        indexed = TextCollection(self.TEXTS, index=True)
+        for text in self.TEXTS:
+            for term in ['the', 'cat', 'dog', 'and', 'unknown']:
+                self.assertEqual(indexed.tf(term, text), scanned.tf(term, text))
+                self.assertEqual(indexed.idf(term), scanned.idf(term))
+        vectors = indexed.tf_idf_vectors()
+        for text, vector in zip(self.TEXTS, vectors):
+            self.assertEqual(
+                vector, dict((t, scanned.tf_idf(t, text)) for t in set(text))
+            )
+
+    def test_add_texts(self):
+        collection = TextCollection(self.TEXTS[:1], index=True)
+        collection.add_texts(self.TEXTS[1:])
+        self.assertEqual(len(collection), sum(len(t) for t in self.TEXTS))
+        self.assertEqual(
+            collection.tf_idf_vectors(),
+            TextCollection(self.TEXTS, index=True).tf_idf_vectors(),
+        )
+        self.assertEqual(collection.idf('dog'), TextCollection(self.TEXTS).idf('dog'))
+
+    def test_tf_idf_matrix(self):
+        try:
+            import scipy
+        except ImportError:
+            raise unittest.SkipTest('scipy is required for tf_idf_matrix')
+        collection = TextCollection(self.TEXTS)
+        matrix, terms = collection.tf_idf_matrix()
+        self.assertEqual(matrix.shape, (len(self.TEXTS), len(terms)))
+        for row, vector in enumerate(collection.tf_idf_vectors()):
+            for column, term in enumerate(terms):
+                self.assertEqual(matrix[row, column], vector.get(term, 0.0))
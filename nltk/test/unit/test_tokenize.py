@@ -6,17 +6,21 @@ See also nltk/test/tokenize.doctest
 
 from __future__ import unicode_literals
 
+import random
 import unittest
 
 from nose import SkipTest
 from nose.tools import assert_equal
 
+import nltk.tokenize
 from nltk.tokenize import (
     punkt,
     word_tokenize,
+    word_tokenize_many,
     TweetTokenizer,
     StanfordSegmenter,
     TreebankWordTokenizer,
+    CompiledTreebankWordTokenizer,
 )
 
 
@@ -365,6 +369,72 @@ class TestTokenize(unittest.TestCase):
         expected = ["'", 'v', "'", "'re", "'"]
         self.assertEqual(word_tokenize(sentence), expected)
 
+    def test_compiled_treebank_tokenizer(self):
+        """
+        Differential test of CompiledTreebankWordTokenizer against the
+        sequential implementation, on random strings rich in the characters
+        and words the rules look for.
+        """
+        reference = TreebankWordTokenizer()
+        compiled = CompiledTreebankWordTokenizer()
+        pieces = list("abdeimnostwyACNOT'\"`,.:;?!()[]{}<>-$%&@# \n\t«»“”‘’„ſKİı") + [
+            "can", "not", "'tis", "'Twas", "wanna ", "GONNA", "'ll", "N'T",
+            "...", "--", "''", "``", "'s ", "d'ye", "mor'n", "gimme", "gotta",
+        ]
+        rng = random.Random(0)
+        texts = [
+            "".join(rng.choice(pieces) for _ in range(rng.randint(0, 40)))
+            for _ in range(3000)
+        ]
+        texts.append("Good muffins cost $3.88\nin New (York).  Please buy me\ntwo of them.")
+        for text in texts:
+            for kwargs in ({}, {'convert_parentheses': True}, {'return_str': True}):
+                self.assertEqual(
+                    compiled.tokenize(text, **kwargs),
+                    reference.tokenize(text, **kwargs),
+                    msg=repr(text),
+                )
+
+        from nltk.tokenize import treebank
+
+        stats = treebank.benchmark(texts[:100])
+        self.assertTrue(stats['same_tokens'])
+        self.assertEqual(
+            stats['tokens'], sum(len(reference.tokenize(text)) for text in texts[:100])
+        )
+
+    def test_word_tokenize_many(self):
+        texts = [
+            "The 'v', I've been fooled but I'll seek revenge.",
+            "'v' - 'V'? It's a Deal!",
+        ]
+        self.assertEqual(
+            word_tokenize_many(texts, preserve_line=True),
+            [word_tokenize(text, preserve_line=True) for text in texts],
+        )
+        try:
+            expected = [word_tokenize(text) for text in texts]
+        except LookupError as e:
+            raise SkipTest(str(e))
+        self.assertEqual(word_tokenize_many(texts), expected)
+
+    def test_sent_tokenizer_registry(self):
+        nltk.tokenize.clear_sent_tokenizer_cache()
+        try:
+            tokenizer = nltk.tokenize.load_sent_tokenizer('english')
+        except LookupError as e:
+            raise SkipTest(str(e))
+        self.assertIs(nltk.tokenize.load_sent_tokenizer('english'), tokenizer)
+
+        old_size = nltk.tokenize.SENT_TOKENIZER_CACHE_SIZE
+        nltk.tokenize.SENT_TOKENIZER_CACHE_SIZE = 1
+        try:
+            nltk.tokenize.load_sent_tokenizer('german')
+            self.assertEqual(list(nltk.tokenize._sent_tokenizers), ['german'])
+        finally:
+            nltk.tokenize.SENT_TOKENIZER_CACHE_SIZE = old_size
+            nltk.tokenize.clear_sent_tokenizer_cache()
+
     def test_punkt_pair_iter(self):
 
         test_cases = [
@@ -396,3 +466,78 @@ class TestTokenize(unittest.TestCase):
         obj._lang_vars = TestPunktTokenizeWordsMock()
         # unpack generator, ensure that no error is raised
         list(obj._tokenize_words('test'))
+
+    def test_punkt_token(self):
+        self.assertEqual(punkt.PunktToken('Mr.').type_no_period, 'mr')
+        self.assertEqual(punkt.PunktToken('-3,5.').type, '##number##')
+        self.assertEqual(punkt.PunktToken('3rd').type, '3rd')
+        self.assertTrue(punkt.PunktToken('...').is_ellipsis)
+        self.assertFalse(punkt.PunktToken('a..').is_ellipsis)
+        token = punkt.PunktToken('Hello', linestart=True)
+        self.assertTrue(token.linestart)
+        self.assertIsNone(token.parastart)
+        self.assertFalse(hasattr(token, '__dict__'))
+
+        stats = punkt.benchmark("Mr. Smith went home. Then he slept.")
+        self.assertEqual(stats['tokens'], 7)
+        self.assertGreater(stats['token_bytes'], 0)
+
+    def test_punkt_trainer_merge(self):
+        import json
+
+        parts = [
+            "Mr. Smith went to Washington. He met Dr. Jones there.\n\n"
+            "Then J. S. Bach played. Mr. Smith left at 5 p.m. today.",
+            "Dr. Jones said hello. Mr. Brown did not. It was 3.5 miles away. "
+            "He left... She stayed. Mr. Smith and Dr. Jones talked.",
+        ]
+        sequential = punkt.PunktTrainer()
+        merged = punkt.PunktTrainer()
+        for part in parts:
+            sequential.train(part, finalize=False)
+            trainer = punkt.PunktTrainer()
+            trainer.train(part, finalize=False)
+            state = json.loads(json.dumps(trainer.get_state()))
+            merged.merge_state(state)
+
+        self.assertEqual(merged._type_fdist, sequential._type_fdist)
+        self.assertEqual(merged._num_period_toks, sequential._num_period_toks)
+        self.assertEqual(merged._sentbreak_count, sequential._sentbreak_count)
+        self.assertEqual(
+            merged._collocation_fdist, sequential._collocation_fdist
+        )
+        self.assertEqual(
+            merged._sent_starter_fdist, sequential._sent_starter_fdist
+        )
+        self.assertEqual(
+            dict(merged._params.ortho_context),
+            dict(sequential._params.ortho_context),
+        )
+        merged_params, params = merged.get_params(), sequential.get_params()
+        self.assertEqual(merged_params.abbrev_types, params.abbrev_types)
+        self.assertEqual(merged_params.collocations, params.collocations)
+        self.assertEqual(merged_params.sent_starters, params.sent_starters)
+
+    def test_punkt_tokenize_sents_parallel(self):
+        tokenizer = punkt.PunktSentenceTokenizer(
+            "Mr. Smith went to Washington. He met Dr. Jones there. "
+            "Mr. Jones said hello. Dr. Smith did not."
+        )
+        texts = [
+            "Mr. Smith arrived. Then he left (quickly.) Dr. Jones stayed.",
+            "",
+            "No sentence break here",
+        ] * 20
+        expected = [tokenizer.tokenize(text) for text in texts]
+        self.assertEqual(tokenizer.tokenize_sents(texts), expected)
+        self.assertEqual(
+            tokenizer.tokenize_sents(iter(texts), n_jobs=2, chunksize=7), expected
+        )
+
+        expected_spans = [list(tokenizer.span_tokenize(text)) for text in texts]
+        spans = tokenizer.span_tokenize_sents(texts, n_jobs=2, chunksize=5)
+        self.assertEqual(list(spans), expected_spans)
+        # The pool is shut down when the consumer stops early.
+        spans = tokenizer.span_tokenize_sents(texts, n_jobs=2)
+        self.assertEqual(next(spans), expected_spans[0])
+        spans.close()
@@ -16,17 +16,28 @@ distributional similarity.
 from __future__ import print_function, division, unicode_literals, absolute_import
 
 from math import log
+import array
+from bisect import bisect_left
 from collections import defaultdict, Counter, namedtuple
 from functools import reduce
+from itertools import islice
+import io
+import json
+import os
 import re
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from six import text_type
 
 from nltk.probability import FreqDist
 from nltk.probability import ConditionalFreqDist as CFD
 from nltk.util import tokenwrap, LazyConcatenation
 from nltk.metrics import f_measure, BigramAssocMeasures
-from nltk.collocations import BigramCollocationFinder
+from nltk.collocations import BigramCollocationFinder, _CountMerger
 from nltk.compat import python_2_unicode_compatible
 
 ConcordanceLine = namedtuple(
@@ -34,6 +45,11 @@ ConcordanceLine = namedtuple(
     ['left', 'query', 'right', 'offset', 'left_print', 'right_print', 'line'],
 )
 
+_INDEX_FORMAT = 'nltk-text-index-1'
+
+#: The number of tokens that the mapped indexes read or write at once.
+_CHUNK_SIZE = 1 << 20
+
 
 class ContextIndex(object):
     """
@@ -99,6 +115,24 @@ class ContextIndex(object):
                     )
         return sorted(scores, key=scores.get, reverse=True)[:n]
 
+    def _shared_context_words(self, word, n=20):
+        """
+        Return the *n* words that share the most contexts with *word*,
+        most first, or None if *word* is not in the index.  Used by
+        ``Text.similar()``.
+        """
+        wci = self._word_to_contexts
+        if word not in wci.conditions():
+            return None
+        contexts = set(wci[word])
+        fd = Counter(
+            w
+            for w in wci.conditions()
+            for c in wci[w]
+            if c in contexts and not w == word
+        )
+        return [w for w, _ in fd.most_common(n)]
+
     def common_contexts(self, words, fail_on_unknown=False):
         """
         Find contexts where the specified words can all appear; and
@@ -240,6 +274,599 @@ class ConcordanceIndex(object):
                 print(concordance_line.line)
 
 
+def _varint_encode(values):
+    """
+    Return the non-negative integers *values* encoded as a uint8 array,
+    seven bits to a byte with the least significant first, and the high
+    bit set on every byte but the last of each value; and the number of
+    bytes taken by each value.
+    """
+    values = numpy.asarray(values, numpy.uint64)
+    nbytes = numpy.ones(len(values), numpy.int64)
+    rest = values >> numpy.uint64(7)
+    while rest.any():
+        nbytes += rest != 0
+        rest >>= numpy.uint64(7)
+    starts = numpy.cumsum(nbytes) - nbytes
+    data = numpy.empty(int(nbytes.sum()), numpy.uint8)
+    for k in range(int(nbytes.max()) if len(values) else 0):
+        (has,) = numpy.nonzero(nbytes > k)
+        byte = (values[has] >> numpy.uint64(7 * k)) & numpy.uint64(127)
+        more = (nbytes[has] > k + 1).astype(numpy.uint64) << numpy.uint64(7)
+        data[starts[has] + k] = byte | more
+    return data, nbytes
+
+
+def _varint_decode(data):
+    """Return the integers encoded in *data* by ``_varint_encode``."""
+    data = numpy.asarray(data)
+    if not len(data):
+        return numpy.zeros(0, numpy.int64)
+    ends = numpy.flatnonzero(data < 128) + 1
+    starts = numpy.concatenate(([0], ends[:-1]))
+    shifts = numpy.arange(len(data)) - numpy.repeat(starts, ends - starts)
+    values = (data & 127).astype(numpy.uint64) << (7 * shifts).astype(numpy.uint64)
+    return numpy.add.reduceat(values, starts).astype(numpy.int64)
+
+
+class _StringTable(object):
+    """
+    A read-only sequence of strings stored in NumPy arrays, so that it
+    can be memory-mapped: the UTF-8 encoded strings concatenated in one
+    byte array, their offsets in it, and the string numbers sorted by
+    their encodings, which ``find`` searches.
+    """
+
+    def __init__(self, blob, offsets, order):
+        self._blob = blob
+        self._offsets = offsets
+        self._order = order
+
+    @classmethod
+    def build(cls, strings):
+        """Build the arrays for a sequence of distinct strings."""
+        encoded = [s.encode('utf-8') for s in strings]
+        offsets = numpy.zeros(len(encoded) + 1, numpy.int64)
+        offsets[1:] = numpy.cumsum([len(data) for data in encoded])
+        blob = numpy.frombuffer(b''.join(encoded), numpy.uint8)
+        order = numpy.array(
+            sorted(range(len(encoded)), key=encoded.__getitem__), numpy.int64
+        )
+        return cls(blob, offsets, order)
+
+    @classmethod
+    def load(cls, path, name):
+        return cls(*(_load_array(path, name + part) for part in _TABLE_PARTS))
+
+    def save(self, path, name):
+        for part, data in zip(_TABLE_PARTS, (self._blob, self._offsets, self._order)):
+            numpy.save(os.path.join(path, name + part + '.npy'), data)
+
+    def _encoded(self, i):
+        return self._blob[self._offsets.item(i) : self._offsets.item(i + 1)].tobytes()
+
+    def __getitem__(self, i):
+        return self._encoded(i).decode('utf-8')
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def find(self, s):
+        """Return the number of the string *s*, or -1 if it is not in the table."""
+        try:
+            data = s.encode('utf-8')
+        except AttributeError:
+            return -1
+        lo, hi = 0, len(self._order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._encoded(self._order.item(mid)) < data:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self._order) and self._encoded(self._order.item(lo)) == data:
+            return self._order.item(lo)
+        return -1
+
+
+_TABLE_PARTS = ('_blob', '_offsets', '_order')
+
+
+def _load_array(path, name):
+    return numpy.load(os.path.join(path, name + '.npy'), mmap_mode='r')
+
+
+def _index_tables(strings, func, skip=None):
+    """
+    Return a table of the distinct values of *func* over *strings*,
+    numbered in the order they first appear, and an array mapping the
+    position of each string to the number of its value; or to -1 if
+    *skip* returns true for the string.
+    """
+    numbers = {}
+    mapping = numpy.empty(len(strings), numpy.int64)
+    for i in range(len(strings)):
+        s = strings[i]
+        if skip is not None and skip(s):
+            mapping[i] = -1
+        else:
+            mapping[i] = numbers.setdefault(func(s), len(numbers))
+    return _StringTable.build(sorted(numbers, key=numbers.get)), mapping
+
+
+class _MappedTokens(object):
+    """
+    A read-only sequence of tokens stored in the directory of a mapped
+    text index: a memory-mapped array of token numbers, and a table of
+    the distinct tokens.  Slices are returned as lists.  Recently read
+    tokens are cached, as a few tokens make up most of a text.
+    """
+
+    CACHE_SIZE = 100000
+
+    def __init__(self, path):
+        with io.open(os.path.join(path, 'index.json'), encoding='utf-8') as fin:
+            meta = json.load(fin)
+        if meta.get('format') != _INDEX_FORMAT:
+            raise ValueError('{0} is not a mapped text index'.format(path))
+        self.path = path
+        self._ids = _load_array(path, 'tokens')
+        self._vocab = _StringTable.load(path, 'vocab')
+        self._cache = {}
+
+    @classmethod
+    def build(cls, tokens, path):
+        """
+        Number the tokens of the iterable *tokens* in one pass, writing
+        their numbers to the directory *path*, and return the stored
+        sequence.
+        """
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        numbers = {}
+        get = numbers.get
+        tokens = iter(tokens)
+        size = 0
+        scratch = os.path.join(path, 'tokens.tmp')
+        with open(scratch, 'wb') as fout:
+            while True:
+                ids = []
+                for token in islice(tokens, _CHUNK_SIZE):
+                    i = get(token)
+                    if i is None:
+                        i = numbers[token] = len(numbers)
+                    ids.append(i)
+                if not ids:
+                    break
+                fout.write(numpy.array(ids, numpy.uint32).tobytes())
+                size += len(ids)
+        stored = numpy.lib.format.open_memmap(
+            os.path.join(path, 'tokens.npy'), 'w+', numpy.uint32, (size,)
+        )
+        if size:
+            stored[:] = numpy.memmap(scratch, numpy.uint32, 'r', shape=(size,))
+            stored.flush()
+        del stored
+        os.remove(scratch)
+        _StringTable.build(sorted(numbers, key=numbers.get)).save(path, 'vocab')
+        meta = dict(format=_INDEX_FORMAT, tokens=size)
+        with io.open(os.path.join(path, 'index.json'), 'w', encoding='utf-8') as fout:
+            fout.write(text_type(json.dumps(meta)))
+        return cls(path)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._token(j) for j in self._ids[i].tolist()]
+        return self._token(int(self._ids[i]))
+
+    def _token(self, i):
+        token = self._cache.get(i)
+        if token is None:
+            token = self._cache[i] = self._vocab[i]
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.clear()
+        return token
+
+    def __iter__(self):
+        for start in range(0, len(self._ids), _CHUNK_SIZE):
+            ids, inverse = numpy.unique(
+                self._ids[start : start + _CHUNK_SIZE], return_inverse=True
+            )
+            strings = numpy.array([self._vocab[i] for i in ids.tolist()], object)
+            for token in strings[inverse].tolist():
+                yield token
+
+    def _positions(self, word):
+        i = self._vocab.find(word)
+        for start in range(0, len(self._ids), _CHUNK_SIZE):
+            if i < 0:
+                break
+            chunk = self._ids[start : start + _CHUNK_SIZE]
+            yield start + numpy.flatnonzero(chunk == i)
+
+    def count(self, word):
+        return sum(len(positions) for positions in self._positions(word))
+
+    def index(self, word):
+        for positions in self._positions(word):
+            if len(positions):
+                return positions.item(0)
+        raise ValueError('{0!r} is not in the text'.format(word))
+
+
+def _stored_tokens(tokens, path):
+    """Return *tokens* as a ``_MappedTokens`` stored in *path*."""
+    if (
+        isinstance(tokens, _MappedTokens)
+        and os.path.isdir(path)
+        and os.path.samefile(tokens.path, path)
+    ):
+        return tokens
+    return _MappedTokens.build(tokens, path)
+
+
+class MappedConcordanceIndex(ConcordanceIndex):
+    """
+    A ``ConcordanceIndex`` stored in a directory, which it
+    memory-maps rather than reads, so that it opens at once, takes
+    little memory, and can be shared by several processes.  The tokens
+    are stored as numbers, and the offsets of each word as the
+    differences between them, in a variable number of bytes.
+
+    The index is built with ``build()``, in one pass over the tokens, so
+    a corpus view is never held in memory.
+    """
+
+    def __init__(self, path, key=lambda x: x):
+        """
+        Open the concordance index stored in *path*.
+
+        :param path: The directory given to ``build()``.
+        :param key: The key function given to ``build()``.
+        """
+        self._tokens = _MappedTokens(path)
+        self._key = key
+        self._keys = _StringTable.load(path, 'concordance_keys')
+        self._pointers = _load_array(path, 'concordance_pointers')
+        self._postings = _load_array(path, 'concordance_postings')
+
+    @classmethod
+    def build(cls, tokens, path, key=lambda x: x):
+        """
+        Build a concordance index of *tokens* in the directory *path*.
+
+        :param tokens: The document: any iterable of tokens, such as a
+            corpus view, or the ``tokens()`` of another index stored in
+            *path*, whose tokens are then not stored again.
+        :param path: The directory to store the index in.
+        :param key: A function that maps each token to a normalized
+            string that will be used as a key in the index.
+        :rtype: MappedConcordanceIndex
+        """
+        tokens = _stored_tokens(tokens, path)
+        keys, key_ids = _index_tables(tokens._vocab, key)
+        keys.save(path, 'concordance_keys')
+
+        # Count the bytes of each key's offsets, then write them in place.
+        sizes = numpy.zeros(len(keys), numpy.int64)
+        for key_ids_, _, nbytes in _posting_chunks(tokens._ids, key_ids, len(keys)):
+            sizes += numpy.bincount(key_ids_, nbytes, len(keys)).astype(numpy.int64)
+        pointers = numpy.zeros(len(keys) + 1, numpy.int64)
+        pointers[1:] = numpy.cumsum(sizes)
+        numpy.save(os.path.join(path, 'concordance_pointers.npy'), pointers)
+        postings = numpy.lib.format.open_memmap(
+            os.path.join(path, 'concordance_postings.npy'),
+            'w+',
+            numpy.uint8,
+            (int(pointers[-1]),),
+        )
+        cursors = pointers[:-1].copy()
+        for key_ids_, data, nbytes in _posting_chunks(tokens._ids, key_ids, len(keys)):
+            before = numpy.cumsum(nbytes) - nbytes
+            starts = numpy.flatnonzero(
+                numpy.concatenate(([True], key_ids_[1:] != key_ids_[:-1]))
+            )
+            lengths = numpy.diff(numpy.append(starts, len(key_ids_)))
+            within = before - numpy.repeat(before[starts], lengths)
+            targets = cursors[key_ids_] + within - before
+            postings[numpy.repeat(targets, nbytes) + numpy.arange(len(data))] = data
+            cursors += numpy.bincount(key_ids_, nbytes, len(keys)).astype(numpy.int64)
+        postings.flush()
+        del postings
+        return cls(path, key)
+
+    def offsets(self, word):
+        """
+        :rtype: list(int)
+        :return: A list of the offset positions at which the given
+            word occurs.  If a key function was specified for the
+            index, then given word's key will be looked up.
+        """
+        i = self._keys.find(self._key(word))
+        if i < 0:
+            return []
+        data = self._postings[self._pointers.item(i) : self._pointers.item(i + 1)]
+        return numpy.cumsum(_varint_decode(data)).tolist()
+
+    def __repr__(self):
+        return '<MappedConcordanceIndex for %d tokens (%d types)>' % (
+            len(self._tokens),
+            len(self._keys),
+        )
+
+
+def _posting_chunks(ids, key_ids, n_keys):
+    """
+    Yield, for each chunk of the token numbers *ids*, the keys of its
+    tokens sorted by key, and the encoded differences between the
+    offsets of each key's tokens, with the number of bytes each takes.
+    """
+    last = numpy.zeros(n_keys, numpy.int64)
+    for start in range(0, len(ids), _CHUNK_SIZE):
+        keys = key_ids[ids[start : start + _CHUNK_SIZE]]
+        order = numpy.argsort(keys, kind='mergesort')
+        keys = keys[order]
+        offsets = order + start
+        gaps = numpy.diff(offsets, prepend=0)
+        first = numpy.concatenate(([True], keys[1:] != keys[:-1]))
+        gaps[first] = offsets[first] - last[keys[first]]
+        final = numpy.append(first[1:], True)
+        last[keys[final]] = offsets[final]
+        data, nbytes = _varint_encode(gaps)
+        yield keys, data, nbytes
+
+
+class MappedContextIndex(ContextIndex):
+    """
+    A ``ContextIndex`` stored in a directory, which it memory-maps
+    rather than reads, so that it opens at once, takes little memory,
+    and can be shared by several processes.  The contexts are those of
+    the default context function; the words and contexts are stored as
+    numbers, with the contexts of each word and the words of each
+    context in arrays.
+
+    The index is built with ``build()``, in one pass over the tokens, so
+    a corpus view is never held in memory.
+    """
+
+    def __init__(self, path, key=lambda x: x):
+        """
+        Open the context index stored in *path*.
+
+        :param path: The directory given to ``build()``.
+        :param key: The key function given to ``build()``.
+        """
+        self._tokens = _MappedTokens(path)
+        self._key = key
+        self._words = _StringTable.load(path, 'context_words')
+        self._neighbors = _StringTable.load(path, 'context_neighbors')
+        self._codes = _load_array(path, 'context_codes')
+        self._by_word = [
+            _load_array(path, 'context_by_word' + part) for part in _CSR_PARTS
+        ]
+        self._by_context = [
+            _load_array(path, 'context_by_context' + part) for part in _CSR_PARTS
+        ]
+
+    @classmethod
+    def build(cls, tokens, path, filter=None, key=lambda x: x):
+        """
+        Build a context index of *tokens* in the directory *path*.  The
+        context of a word is the word to its left and the word to its
+        right, normalized to lowercase, as with ``ContextIndex``'s
+        default context function.
+
+        :param tokens: The document: any iterable of tokens, such as a
+            corpus view, or the ``tokens()`` of another index stored in
+            *path*, whose tokens are then not stored again.
+        :param path: The directory to store the index in.
+        :param filter: A function that returns true for the tokens to
+            index; the other tokens are skipped.
+        :param key: A function that maps each token to a normalized
+            string that will be used as a key in the index.
+        :rtype: MappedContextIndex
+        """
+        tokens = _stored_tokens(tokens, path)
+        skip = None if filter is None else (lambda s: not filter(s))
+        words, word_ids = _index_tables(tokens._vocab, key, skip)
+        neighbors, neighbor_ids = _index_tables(tokens._vocab, _lowercase, skip)
+        words.save(path, 'context_words')
+        neighbors.save(path, 'context_neighbors')
+        # Number the contexts in the order they first appear.
+        counter = _CountMerger(positions=True)
+        for _, codes, positions in _context_chunks(
+            tokens._ids, word_ids, neighbor_ids, len(neighbors)
+        ):
+            counter.add(codes, positions=positions)
+        context_codes, _, firsts = counter.merged()
+        order = numpy.argsort(firsts, kind='mergesort')
+        numpy.save(os.path.join(path, 'context_codes.npy'), context_codes[order])
+        context_ids = numpy.empty(len(order), numpy.int64)
+        context_ids[order] = numpy.arange(len(order))
+        # Count each word in each context.
+        counter = _CountMerger(positions=True)
+        for words_, codes, positions in _context_chunks(
+            tokens._ids, word_ids, neighbor_ids, len(neighbors)
+        ):
+            contexts = context_ids[numpy.searchsorted(context_codes, codes)]
+            counter.add(words_ * len(order) + contexts, positions=positions)
+        pairs, counts, firsts = counter.merged()
+        pair_words, pair_contexts = numpy.divmod(pairs, max(len(order), 1))
+        for name, rows, columns, size in (
+            ('context_by_word', pair_words, pair_contexts, len(words)),
+            ('context_by_context', pair_contexts, pair_words, len(order)),
+        ):
+            order_ = numpy.lexsort((firsts, rows))
+            pointers = numpy.zeros(size + 1, numpy.int64)
+            pointers[1:] = numpy.cumsum(numpy.bincount(rows, minlength=size))
+            for part, data in zip(
+                _CSR_PARTS, (pointers, columns[order_], counts[order_])
+            ):
+                if part != '_pointers' and (not len(data) or data.max() < 1 << 32):
+                    data = data.astype(numpy.uint32)
+                numpy.save(os.path.join(path, name + part + '.npy'), data)
+        return cls(path, key)
+
+    def _word_id(self, word, key=True):
+        return self._words.find(self._key(word) if key else word)
+
+    def _contexts_of(self, i):
+        pointers, contexts, counts = self._by_word
+        if i < 0:
+            return contexts[:0], counts[:0]
+        start, end = pointers.item(i), pointers.item(i + 1)
+        return contexts[start:end], counts[start:end]
+
+    def _words_of(self, contexts):
+        """
+        Return the words of each of *contexts* concatenated, their
+        counts, and the number of words of each context.
+        """
+        pointers, words, counts = self._by_context
+        starts, ends = pointers[contexts], pointers[contexts + 1]
+        lengths = ends - starts
+        index = numpy.arange(lengths.sum()) + numpy.repeat(
+            starts - (numpy.cumsum(lengths) - lengths), lengths
+        )
+        return words[index], counts[index], lengths
+
+    def _context(self, i):
+        """Return the (left, right) strings of context number *i*."""
+        base = len(self._neighbors)
+        return tuple(
+            self._neighbors[j] if j < base else ('*START*', '*END*')[j - base]
+            for j in divmod(self._codes.item(i), base + 2)
+        )
+
+    def word_similarity_dict(self, word):
+        """
+        Return a dictionary mapping from words to 'similarity scores,'
+        indicating how often these two words occur in the same
+        context.
+        """
+        contexts, _ = self._contexts_of(self._word_id(word))
+        words, _, _ = self._words_of(contexts)
+        shared = numpy.bincount(words, minlength=len(self._words)).tolist()
+        sizes = numpy.diff(self._by_word[0]).tolist()
+        scores = {}
+        # The f-measure of each word's contexts against those of *word*.
+        for i, (common, size) in enumerate(zip(shared, sizes)):
+            if not len(contexts) or not size:
+                score = None
+            elif not common:
+                score = 0
+            else:
+                score = 1.0 / (0.5 / (common / size) + 0.5 / (common / len(contexts)))
+            scores[self._words[i]] = score
+        return scores
+
+    def similar_words(self, word, n=20):
+        contexts, _ = self._contexts_of(self._word_id(word))
+        words, counts, lengths = self._words_of(contexts)
+        if not len(words):
+            return []
+        # The count of *word* itself (not its key) in each context.
+        own = numpy.where(words == self._word_id(word, key=False), counts, 0)
+        starts = numpy.cumsum(lengths) - lengths
+        scores = counts * numpy.repeat(numpy.add.reduceat(own, starts), lengths)
+        keep = words != self._word_id(word, key=False)
+        return self._ranked(words[keep], scores[keep], n)
+
+    def _ranked(self, words, scores, n):
+        """
+        Return the *n* words with the highest total score, ties going to
+        the word that comes first in *words*.
+        """
+        distinct, first, inverse = numpy.unique(
+            words, return_index=True, return_inverse=True
+        )
+        totals = numpy.bincount(inverse, scores.astype(numpy.float64))
+        best = numpy.lexsort((first, -totals))[:n]
+        return [self._words[i] for i in distinct[best].tolist()]
+
+    def _shared_context_words(self, word, n=20):
+        i = self._word_id(word, key=False)
+        if i < 0:
+            return None
+        contexts, _ = self._contexts_of(i)
+        words, _, _ = self._words_of(contexts)
+        words = words[words != i]
+        # Words are numbered in the order they first appear.
+        return self._ranked(numpy.sort(words), numpy.ones(len(words)), n)
+
+    def common_contexts(self, words, fail_on_unknown=False):
+        """
+        Find contexts where the specified words can all appear; and
+        return a frequency distribution mapping each context to the
+        number of times that context was used.
+
+        :param words: The words used to seed the similarity search
+        :type words: str
+        :param fail_on_unknown: If true, then raise a value error if
+            any of the given words do not occur at all in the index.
+        """
+        words = [self._key(w) for w in words]
+        contexts = [self._contexts_of(self._word_id(w, key=False))[0] for w in words]
+        empty = [w for w, c in zip(words, contexts) if not len(c)]
+        common = reduce(numpy.intersect1d, contexts)
+        if empty and fail_on_unknown:
+            raise ValueError("The following word(s) were not found:", " ".join(words))
+        elif not len(common):
+            # nothing in common -- just return an empty freqdist.
+            return FreqDist()
+        else:
+            fd = FreqDist()
+            for c in contexts:
+                for i in c[numpy.isin(c, common)].tolist():
+                    fd[self._context(i)] += 1
+            return fd
+
+
+_CSR_PARTS = ('_pointers', '_ids', '_counts')
+
+
+def _lowercase(s):
+    return s.lower()
+
+
+def _context_chunks(ids, word_ids, neighbor_ids, n_neighbors):
+    """
+    Yield, for each chunk of the token numbers *ids*, the words of the
+    tokens that are not skipped, the codes of their contexts, and their
+    positions among those tokens.  A context is coded as the number of
+    the left neighbor times ``n_neighbors + 2``, plus the number of the
+    right neighbor, where ``n_neighbors`` and ``n_neighbors + 1`` stand
+    for the start and the end of the text.
+    """
+    base = n_neighbors + 2
+    left = n_neighbors
+    carried = numpy.zeros(0, numpy.int64), numpy.zeros(0, numpy.int64)
+    position = 0
+    for start in range(0, len(ids), _CHUNK_SIZE):
+        chunk = ids[start : start + _CHUNK_SIZE]
+        words = word_ids[chunk]
+        kept = words >= 0
+        words = numpy.concatenate((carried[0], words[kept]))
+        neighbors = numpy.concatenate((carried[1], neighbor_ids[chunk][kept]))
+        if len(words) < 2:
+            carried = words, neighbors
+            continue
+        # The last token waits for its right neighbor in the next chunk.
+        lefts = numpy.concatenate(([left], neighbors[:-2]))
+        positions = position + numpy.arange(len(words) - 1)
+        yield words[:-1], lefts * base + neighbors[1:], positions
+        position += len(words) - 1
+        left = neighbors[-2]
+        carried = words[-1:], neighbors[-1:]
+    if len(carried[0]):
+        yield carried[0], numpy.array([left * base + n_neighbors + 1]), numpy.array(
+            [position]
+        )
+
+
 class TokenSearcher(object):
     """
     A class that makes it easier to use regular expressions to search
@@ -331,7 +958,7 @@ class Text(object):
         :param tokens: The source text.
         :type tokens: sequence of str
         """
-        if self._COPY_TOKENS:
+        if self._COPY_TOKENS and not isinstance(tokens, _MappedTokens):
             tokens = list(tokens)
         self.tokens = tokens
 
@@ -343,6 +970,46 @@ class Text(object):
         else:
             self.name = " ".join(text_type(tok) for tok in tokens[:8]) + "..."
 
+    @classmethod
+    def build_index(cls, tokens, path, name=None):
+        """
+        Index the source text in the directory *path*, in one pass over
+        *tokens*, and return a ``Text`` that uses the index (see
+        ``from_index()``).
+
+        :param tokens: The source text, such as a corpus view.
+        :type tokens: iterable of str
+        :param path: The directory to store the index in.
+        :type path: str
+        """
+        tokens = _MappedTokens.build(tokens, path)
+        MappedConcordanceIndex.build(tokens, path, key=lambda s: s.lower())
+        MappedContextIndex.build(
+            tokens, path, filter=lambda x: x.isalpha(), key=lambda s: s.lower()
+        )
+        return cls.from_index(path, name)
+
+    @classmethod
+    def from_index(cls, path, name=None):
+        """
+        Create a Text object from an index written by ``build_index()``.
+        The tokens and the indexes used by ``concordance()``,
+        ``similar()`` and ``common_contexts()`` are memory-mapped, so
+        the text opens at once and its pages are shared between
+        processes.  As in a text where ``similar()`` has been called,
+        ``common_contexts()`` uses the word-context index of
+        ``similar()``, which skips the tokens that are not alphabetic.
+
+        :param path: The directory given to ``build_index()``.
+        :type path: str
+        """
+        text = cls(_MappedTokens(path), name)
+        text._concordance_index = MappedConcordanceIndex(
+            path, key=lambda s: s.lower()
+        )
+        text._word_context_index = MappedContextIndex(path, key=lambda s: s.lower())
+        return text
+
     # ////////////////////////////////////////////////////////////
     # Support item & slice access
     # ////////////////////////////////////////////////////////////
@@ -353,6 +1020,9 @@ class Text(object):
     def __len__(self):
         return len(self.tokens)
 
+    def __iter__(self):
+        return iter(self.tokens)
+
     # ////////////////////////////////////////////////////////////
     # Interactive console methods
     # ////////////////////////////////////////////////////////////
@@ -463,17 +1133,8 @@ class Text(object):
 
         # words = self._word_context_index.similar_words(word, num)
 
-        word = word.lower()
-        wci = self._word_context_index._word_to_contexts
-        if word in wci.conditions():
-            contexts = set(wci[word])
-            fd = Counter(
-                w
-                for w in wci.conditions()
-                for c in wci[w]
-                if c in contexts and not w == word
-            )
-            words = [w for w, _ in fd.most_common(num)]
+        words = self._word_context_index._shared_context_words(word.lower(), num)
+        if words is not None:
             print(tokenwrap(words))
         else:
             print("No matches")
@@ -613,6 +1274,62 @@ class Text(object):
         return '<Text: %s>' % self.name
 
 
+class _TermIndex(object):
+    """
+    An inverted index of the terms of a list of texts, built in one pass
+    over each text: the number of texts that each term appears in, and
+    the count of each term in each text, as a sparse term-document
+    matrix in compressed row form, with a row per text and the terms of
+    each row in order of their numbers.  Texts can be added at any time.
+    """
+
+    def __init__(self):
+        self.terms = []
+        self._numbers = {}
+        self.df = array.array('l')
+        self.lengths = array.array('l')
+        self.pointers = array.array('l', [0])
+        self.indices = array.array('l')
+        self.counts = array.array('l')
+        self._rows = {}
+
+    def add(self, text):
+        """Add a row for *text*, which is remembered by its identity."""
+        numbers = self._numbers
+        row = []
+        for term, count in Counter(text).items():
+            i = numbers.get(term)
+            if i is None:
+                i = numbers[term] = len(self.terms)
+                self.terms.append(term)
+                self.df.append(0)
+            row.append((i, count))
+        row.sort()
+        for i, count in row:
+            self.df[i] += 1
+            self.indices.append(i)
+            self.counts.append(count)
+        self.pointers.append(len(self.indices))
+        self.lengths.append(sum(count for _, count in row))
+        self._rows.setdefault(id(text), len(self.lengths) - 1)
+
+    def row(self, text):
+        """Return the row of *text*, or None if it was not added."""
+        return self._rows.get(id(text))
+
+    def document_frequency(self, term):
+        i = self._numbers.get(term)
+        return 0 if i is None else self.df[i]
+
+    def count(self, term, row):
+        i = self._numbers.get(term)
+        if i is None:
+            return 0
+        start, end = self.pointers[row], self.pointers[row + 1]
+        j = bisect_left(self.indices, i, start, end)
+        return self.counts[j] if j < end and self.indices[j] == i else 0
+
+
 # Prototype only; this approach will be slow to load
 class TextCollection(Text):
     """A collection of texts, which can be loaded with list of texts, or
@@ -629,18 +1346,72 @@ class TextCollection(Text):
 
     Iterating over a TextCollection produces all the tokens of all the
     texts in order.
+
+    With ``index=True``, the collection counts the terms of its texts
+    in one pass, and answers ``tf``, ``idf`` and ``tf_idf`` queries
+    about them from the counts, instead of scanning the texts on every
+    query.  ``tf_idf_vectors`` and ``tf_idf_matrix`` build the index if
+    it has not been built yet.
     """
 
-    def __init__(self, source):
+    def __init__(self, source, index=False):
         if hasattr(source, 'words'):  # bridge to the text corpus reader
             source = [source.words(f) for f in source.fileids()]
 
         self._texts = source
         Text.__init__(self, LazyConcatenation(source))
         self._idf_cache = {}
+        self._index = None
+        if index:
+            self._build_index()
+
+    def _build_index(self):
+        self._index = _TermIndex()
+        for text in self._texts:
+            self._index.add(text)
+
+    def add_texts(self, texts):
+        """
+        Add *texts* to the end of the collection, updating the term index
+        if there is one, and discarding the cached results of the
+        ``Text`` methods.
+
+        :param texts: The texts to add.
+        :type texts: iterable of (sequence of str)
+        """
+        texts = list(texts)
+        self._texts = list(self._texts) + texts
+        if isinstance(self.tokens, list):
+            for text in texts:
+                self.tokens.extend(text)
+        else:
+            self.tokens = LazyConcatenation(self._texts)
+        for name in (
+            '_concordance_index',
+            '_word_context_index',
+            '_collocations',
+            '_vocab',
+            '_token_searcher',
+        ):
+            self.__dict__.pop(name, None)
+        self._idf_cache = {}
+        if self._index is not None:
+            for text in texts:
+                self._index.add(text)
 
     def tf(self, term, text):
-        """ The frequency of the term in text. """
+        """
+        The frequency of the term in text.
+
+        With a term index, the frequency is looked up for the very text
+        objects of the collection; any other sequence, even an equal one
+        such as ``list(text)`` or a re-created corpus view, is scanned.
+        ``tf_idf_vectors`` is the bulk path, scoring every text of the
+        collection from the index.
+        """
+        row = None if self._index is None else self._index.row(text)
+        if row is not None:
+            return self._index.count(term, row) / self._index.lengths[row]
         return text.count(term) / len(text)
 
     def idf(self, term):
@@ -650,7 +1421,10 @@ class TextCollection(Text):
         # idf values are cached for performance.
         idf = self._idf_cache.get(term)
         if idf is None:
-            matches = len([True for text in self._texts if term in text])
+            if self._index is not None:
+                matches = self._index.document_frequency(term)
+            else:
+                matches = len([True for text in self._texts if term in text])
             if len(self._texts) == 0:
                 raise ValueError('IDF undefined for empty document collection')
             idf = log(len(self._texts) / matches) if matches else 0.0
@@ -660,6 +1434,58 @@ class TextCollection(Text):
     def tf_idf(self, term, text):
         return self.tf(term, text) * self.idf(term)
 
+    def _index_idfs(self):
+        """Return the idf of every term of the index, by term number."""
+        n = len(self._texts)
+        return [log(n / df) for df in self._index.df]
+
+    def tf_idf_vectors(self):
+        """
+        Return the TF-IDF vector of each text, as a dictionary mapping
+        each term of the text to its ``tf_idf`` score.
+
+        :rtype: list(dict(str, float))
+        """
+        if self._index is None:
+            self._build_index()
+        index = self._index
+        idfs = self._index_idfs()
+        vectors = []
+        for row, length in enumerate(index.lengths):
+            start, end = index.pointers[row], index.pointers[row + 1]
+            counts = zip(index.indices[start:end], index.counts[start:end])
+            vectors.append(
+                dict((index.terms[i], count / length * idfs[i]) for i, count in counts)
+            )
+        return vectors
+
+    def tf_idf_matrix(self):
+        """
+        Return the TF-IDF scores of all the terms in all the texts, as a
+        sparse ``scipy.sparse.csr_matrix`` with a row for each text and a
+        column for each term; and the list of terms, in column order.
+
+        :rtype: tuple(scipy.sparse.csr_matrix, list(str))
+        """
+        try:
+            from scipy.sparse import csr_matrix
+        except ImportError:
+            raise ImportError('tf_idf_matrix requires scipy.')
+        if self._index is None:
+            self._build_index()
+        index = self._index
+        pointers = numpy.frombuffer(index.pointers, 'l')
+        indices = numpy.frombuffer(index.indices, 'l')
+        lengths = numpy.frombuffer(index.lengths, 'l')
+        tf = numpy.frombuffer(index.counts, 'l') / numpy.repeat(
+            lengths, numpy.diff(pointers)
+        )
+        scores = tf * numpy.array(self._index_idfs())[indices]
+        matrix = csr_matrix(
+            (scores, indices, pointers), shape=(len(lengths), len(index.terms))
+        )
+        return matrix, list(index.terms)
+
 
 def demo():
     from nltk.corpus import brown
@@ -697,6 +1523,8 @@ if __name__ == '__main__':
 __all__ = [
     "ContextIndex",
     "ConcordanceIndex",
+    "MappedContextIndex",
+    "MappedConcordanceIndex",
     "TokenSearcher",
     "Text",
     "TextCollection",
@@ -61,6 +61,7 @@ For further information, please see Chapter 3 of the NLTK book.
 """
 
 import re
+from collections import OrderedDict
 
 from nltk.data import load
 from nltk.tokenize.casual import TweetTokenizer, casual_tokenize
@@ -85,11 +86,52 @@ from nltk.tokenize.simple import (
 )
 from nltk.tokenize.texttiling import TextTilingTokenizer
 from nltk.tokenize.toktok import ToktokTokenizer
-from nltk.tokenize.treebank import TreebankWordTokenizer
+from nltk.tokenize.treebank import (
+    TreebankWordTokenizer,
+    CompiledTreebankWordTokenizer,
+)
 from nltk.tokenize.util import string_span_tokenize, regexp_span_tokenize
 from nltk.tokenize.stanford_segmenter import StanfordSegmenter
 
 
+# Loaded Punkt models, keyed by language, least recently used first.
+_sent_tokenizers = OrderedDict()
+
+#: The maximum number of Punkt models kept loaded by `load_sent_tokenizer`.
+SENT_TOKENIZER_CACHE_SIZE = 8
+
+
+def load_sent_tokenizer(language='english'):
+    """
+    Return the Punkt sentence tokenizer for *language*.
+
+    Models are unpickled once and kept in a registry of at most
+    ``SENT_TOKENIZER_CACHE_SIZE`` languages, evicting the least recently
+    used one.  Calling this function before tokenizing (or before forking
+    worker processes) warms the registry up, so that `sent_tokenize` and
+    `word_tokenize` never go through `nltk.data.load`.
+
+    :param language: the model name in the Punkt corpus
+    :rtype: PunktSentenceTokenizer
+    """
+    try:
+        tokenizer = _sent_tokenizers.pop(language)
+    except KeyError:
+        # The registry does the caching, so that evicted models are freed.
+        tokenizer = load('tokenizers/punkt/{0}.pickle'.format(language), cache=False)
+    _sent_tokenizers[language] = tokenizer
+    while len(_sent_tokenizers) > SENT_TOKENIZER_CACHE_SIZE:
+        _sent_tokenizers.popitem(last=False)
+    return tokenizer
+
+
+def clear_sent_tokenizer_cache():
+    """
+    Remove all loaded Punkt models from the registry.
+    """
+    _sent_tokenizers.clear()
+
+
 # Standard sentence tokenizer.
 def sent_tokenize(text, language='english'):
     """
@@ -101,12 +143,12 @@ def sent_tokenize(text, language='english'):
     :param text: text to split into sentences
     :param language: the model name in the Punkt corpus
     """
-    tokenizer = load('tokenizers/punkt/{0}.pickle'.format(language))
+    tokenizer = load_sent_tokenizer(language)
     return tokenizer.tokenize(text)
 
 
 # Standard word tokenizer.
-_treebank_word_tokenizer = TreebankWordTokenizer()
+_treebank_word_tokenizer = CompiledTreebankWordTokenizer()
 
 # See discussion on https://github.com/nltk/nltk/pull/1437
 # Adding to TreebankWordTokenizer, nltk.word_tokenize now splits on
@@ -144,3 +186,28 @@ def word_tokenize(text, language='english', preserve_line=False):
     return [
         token for sent in sentences for token in _treebank_word_tokenizer.tokenize(sent)
     ]
+
+
+def word_tokenize_many(texts, language='english', preserve_line=False):
+    """
+    Return a tokenized copy of each of *texts*, as `word_tokenize` does.
+
+    The sentence tokenizer is looked up once for the whole batch, which
+    matters when tokenizing many short documents.
+
+    :param texts: the texts to split into words
+    :type texts: iter(str)
+    :param language: the model name in the Punkt corpus
+    :type language: str
+    :param preserve_line: An option to keep the preserve the sentence and not sentence tokenize it.
+    :type preserve_line: bool
+    :rtype: list(list(str))
+    """
+    tokenize = _treebank_word_tokenizer.tokenize
+    if preserve_line:
+        return [tokenize(text) for text in texts]
+    sent_tokenizer = load_sent_tokenizer(language)
+    return [
+        [token for sent in sent_tokenizer.tokenize(text) for token in tokenize(sent)]
+        for text in texts
+    ]
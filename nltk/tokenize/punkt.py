@@ -108,6 +108,9 @@ from __future__ import print_function, unicode_literals, division
 import re
 import math
 from collections import defaultdict
+from functools import partial
+from itertools import islice
+from multiprocessing import Pool, cpu_count
 
 from six import string_types
 
@@ -324,6 +327,27 @@ def _pair_iter(it):
     yield (prev, None)
 
 
+def _fdist_items(fdist):
+    """
+    Returns the (sample, count) pairs of a FreqDist as lists, with tuple
+    samples as lists, in a form that can be serialized as JSON.
+    """
+    return [
+        [list(sample) if isinstance(sample, tuple) else sample, count]
+        for sample, count in fdist.items()
+    ]
+
+
+def _fdist_from_items(items):
+    """The FreqDist of a list returned by ``_fdist_items``."""
+    return FreqDist(
+        dict(
+            (tuple(sample) if isinstance(sample, list) else sample, count)
+            for sample, count in items
+        )
+    )
+
+
 ######################################################################
 # { Punkt Parameters
 ######################################################################
@@ -401,8 +425,14 @@ class PunktToken(object):
         self.type = self._get_type(tok)
         self.period_final = tok.endswith('.')
 
-        for p in self._properties:
-            setattr(self, p, None)
+        # Tokens are created for every word of every text, so the default
+        # annotations are assigned directly unless a subclass adds some.
+        if self._properties is PunktToken._properties:
+            self.parastart = self.linestart = None
+            self.sentbreak = self.abbr = self.ellipsis = None
+        else:
+            for p in self._properties:
+                setattr(self, p, None)
         for k in params:
             setattr(self, k, params[k])
 
@@ -421,7 +451,12 @@ class PunktToken(object):
 
     def _get_type(self, tok):
         """Returns a case-normalized representation of the token."""
-        return self._RE_NUMERIC.sub('##number##', tok.lower())
+        typ = tok.lower()
+        # Numbers start with a digit, or with a sign or separator before one.
+        first = typ[:1]
+        if first.isdigit() or first in '-.,':
+            return self._RE_NUMERIC.sub('##number##', typ)
+        return typ
 
     @property
     def type_no_period(self):
@@ -463,7 +498,7 @@ class PunktToken(object):
     @property
     def is_ellipsis(self):
         """True if the token text is that of an ellipsis."""
-        return self._RE_ELLIPSIS.match(self.tok)
+        return self.tok.startswith('..') and self._RE_ELLIPSIS.match(self.tok)
 
     @property
     def is_number(self):
@@ -612,9 +647,10 @@ class PunktBaseClass(object):
         elif aug_tok.is_ellipsis:
             aug_tok.ellipsis = True
         elif aug_tok.period_final and not tok.endswith('..'):
+            typ = tok[:-1].lower()
             if (
-                tok[:-1].lower() in self._params.abbrev_types
-                or tok[:-1].lower().split('-')[-1] in self._params.abbrev_types
+                typ in self._params.abbrev_types
+                or typ.split('-')[-1] in self._params.abbrev_types
             ):
 
                 aug_tok.abbr = True
@@ -762,18 +798,7 @@ class PunktTrainer(PunktBaseClass):
                 self._num_period_toks += 1
 
         # Look for new abbreviations, and for types that no longer are
-        unique_types = self._unique_types(tokens)
-        for abbr, score, is_add in self._reclassify_abbrev_types(unique_types):
-            if score >= self.ABBREV:
-                if is_add:
-                    self._params.abbrev_types.add(abbr)
-                    if verbose:
-                        print(('  Abbreviation: [%6.4f] %s' % (score, abbr)))
-            else:
-                if not is_add:
-                    self._params.abbrev_types.remove(abbr)
-                    if verbose:
-                        print(('  Removed abbreviation: [%6.4f] %s' % (score, abbr)))
+        self._update_abbrev_types(self._unique_types(tokens), verbose)
 
         # Make a preliminary pass through the document, marking likely
         # sentence breaks, abbreviations, and ellipsis tokens.
@@ -811,6 +836,19 @@ class PunktTrainer(PunktBaseClass):
     def _unique_types(self, tokens):
         return set(aug_tok.type for aug_tok in tokens)
 
+    def _update_abbrev_types(self, types, verbose=False):
+        for abbr, score, is_add in self._reclassify_abbrev_types(types):
+            if score >= self.ABBREV:
+                if is_add:
+                    self._params.abbrev_types.add(abbr)
+                    if verbose:
+                        print(('  Abbreviation: [%6.4f] %s' % (score, abbr)))
+            else:
+                if not is_add:
+                    self._params.abbrev_types.remove(abbr)
+                    if verbose:
+                        print(('  Removed abbreviation: [%6.4f] %s' % (score, abbr)))
+
     def finalize_training(self, verbose=False):
         """
         Uses data that has been gathered in training to determine likely
@@ -830,6 +868,82 @@ class PunktTrainer(PunktBaseClass):
 
         self._finalized = True
 
+    # ////////////////////////////////////////////////////////////
+    # { Merging
+    # ////////////////////////////////////////////////////////////
+
+    def get_state(self):
+        """
+        Returns the statistics gathered in training so far, as a dict of
+        lists, strings and integers that can be stored with ``json`` or
+        ``pickle`` and added to another trainer with `merge_state()`.
+
+        The state holds the type, collocation and sentence starter counts,
+        the number of period-final tokens and of sentence breaks, and the
+        abbreviation types and orthographic contexts found so far. The
+        collocations and sentence starters themselves are not part of it:
+        they are derived from the counts by `finalize_training()`.
+        """
+        return dict(
+            type_counts=_fdist_items(self._type_fdist),
+            num_period_toks=self._num_period_toks,
+            collocation_counts=_fdist_items(self._collocation_fdist),
+            sent_starter_counts=_fdist_items(self._sent_starter_fdist),
+            sentbreak_count=self._sentbreak_count,
+            abbrev_types=sorted(self._params.abbrev_types),
+            ortho_context=sorted(self._params.ortho_context.items()),
+        )
+
+    def merge_state(self, state, verbose=False):
+        """
+        Adds the statistics of a state returned by `get_state()`, typically
+        from a trainer that was trained on another part of the corpus with
+        ``finalize=False``. Training can thus be split over many processes
+        or machines, the states merged, and `finalize_training()` (or
+        `get_params()`) called once at the end.
+
+        Counts are added and orthographic contexts combined. Abbreviation
+        types are the union of both sets, after which the types counted in
+        ``state`` are reclassified against the merged counts, just as the
+        types of a new text are in `train()`. As the two parts were
+        annotated with their own abbreviations, the result can differ
+        slightly from training on the whole text in one trainer.
+
+            >>> first, second = PunktTrainer(), PunktTrainer()
+            >>> first.train("Mr. Smith went home. He slept.", finalize=False)
+            >>> second.train("Mr. Jones stayed. She read.", finalize=False)
+            >>> first.merge(second)
+            >>> first._type_fdist['mr.']
+            2
+            >>> sorted(first.get_params().abbrev_types)
+            ['mr']
+        """
+        self._finalized = False
+        self._type_fdist.update(_fdist_from_items(state['type_counts']))
+        self._num_period_toks += state['num_period_toks']
+        self._collocation_fdist.update(
+            _fdist_from_items(state['collocation_counts'])
+        )
+        self._sent_starter_fdist.update(
+            _fdist_from_items(state['sent_starter_counts'])
+        )
+        self._sentbreak_count += state['sentbreak_count']
+        self._params.abbrev_types.update(state['abbrev_types'])
+        for typ, flag in state['ortho_context']:
+            self._params.add_ortho_context(typ, flag)
+
+        types = [typ for typ, count in state['type_counts'] if typ is not None]
+        self._update_abbrev_types(types, verbose)
+
+    def merge(self, other, verbose=False):
+        """
+        Adds the statistics gathered by another trainer to this one. See
+        `merge_state()`.
+
+        :type other: PunktTrainer
+        """
+        self.merge_state(other.get_state(), verbose)
+
     # ////////////////////////////////////////////////////////////
     # { Overhead reduction
     # ////////////////////////////////////////////////////////////
@@ -1228,6 +1342,52 @@ class PunktTrainer(PunktBaseClass):
         return sum(1 for aug_tok in tokens if aug_tok.sentbreak)
 
 
+######################################################################
+# { Batch Tokenization Workers
+######################################################################
+
+# Tokenizer used by worker processes, set once per worker by
+# `_init_tokenizer_worker` rather than pickled with every text.
+_worker_tokenizer = None
+
+
+def _init_tokenizer_worker(tokenizer):
+    global _worker_tokenizer
+    _worker_tokenizer = tokenizer
+
+
+def _worker_tokenize(realign_boundaries, text):
+    return _worker_tokenizer.tokenize(text, realign_boundaries)
+
+
+def _worker_span_tokenize(realign_boundaries, text):
+    return list(_worker_tokenizer.span_tokenize(text, realign_boundaries))
+
+
+def _imap_ordered(tokenizer, function, texts, n_jobs, chunksize):
+    """
+    Apply a worker function to each text in a pool of `n_jobs` processes
+    sharing `tokenizer`, yielding the results in input order as they
+    become available. `Pool.imap` reads its whole input up front, so the
+    texts are passed to it in batches of two chunks per process.
+    """
+    batch_size = 2 * (n_jobs or cpu_count()) * chunksize
+    texts = iter(texts)
+    pool = Pool(n_jobs, initializer=_init_tokenizer_worker, initargs=(tokenizer,))
+    try:
+        while True:
+            batch = list(islice(texts, batch_size))
+            if not batch:
+                break
+            for result in pool.imap(function, batch, chunksize):
+                yield result
+        pool.close()
+    finally:
+        # Also reached when the consumer stops early.
+        pool.terminate()
+        pool.join()
+
+
 ######################################################################
 # { Punkt Sentence Tokenizer
 ######################################################################
@@ -1330,6 +1490,44 @@ class PunktSentenceTokenizer(PunktBaseClass, TokenizerI):
         """
         return [text[s:e] for s, e in self.span_tokenize(text, realign_boundaries)]
 
+    def tokenize_sents(self, texts, realign_boundaries=True, n_jobs=1, chunksize=64):
+        """
+        Given a sequence of texts, returns a list with the list of sentences
+        of each text, in input order.
+
+        With ``n_jobs`` other than 1, the texts are tokenized in a pool of
+        worker processes (``None`` means one per CPU). The tokenizer is sent
+        to each worker once, when the pool starts, and texts are sent in
+        batches of ``chunksize``.
+
+            >>> tokenizer = PunktSentenceTokenizer()
+            >>> tokenizer.tokenize_sents(["One. Two.", "Three."], n_jobs=2)
+            [['One.', 'Two.'], ['Three.']]
+        """
+        if n_jobs == 1:
+            return [self.tokenize(text, realign_boundaries) for text in texts]
+        function = partial(_worker_tokenize, realign_boundaries)
+        return list(_imap_ordered(self, function, texts, n_jobs, chunksize))
+
+    def span_tokenize_sents(
+        self, texts, realign_boundaries=True, n_jobs=1, chunksize=64
+    ):
+        """
+        Given a sequence of texts, generates the list of sentence spans of
+        each text, in input order. With several jobs, ``texts`` is read a
+        few chunks per worker at a time and results are generated as soon
+        as they are available, so large collections can be streamed
+        through the pool. ``n_jobs`` and ``chunksize`` are as for
+        `tokenize_sents`.
+        """
+        if n_jobs == 1:
+            for text in texts:
+                yield list(self.span_tokenize(text, realign_boundaries))
+        else:
+            function = partial(_worker_span_tokenize, realign_boundaries)
+            for spans in _imap_ordered(self, function, texts, n_jobs, chunksize):
+                yield spans
+
     def _slices_from_text(self, text):
         last_break = 0
         for match in self._lang_vars.period_context_re().finditer(text):
@@ -1664,3 +1862,32 @@ def demo(text, tok_cls=PunktSentenceTokenizer, train_cls=PunktTrainer):
     sbd = tok_cls(trainer.get_params())
     for l in sbd.sentences_from_text(text):
         print(cleanup(l))
+
+
+def benchmark(text, tok_cls=PunktSentenceTokenizer, train_cls=PunktTrainer):
+    """
+    Trains a punkt model on the text and segments the same text with it,
+    returning a dict with the number of tokens, the memory used by a token
+    object (excluding its strings, which are shared with the text and the
+    model), and the training and segmentation times in seconds.
+    """
+    from sys import getsizeof
+    from timeit import default_timer as timer
+
+    start = timer()
+    trainer = train_cls(text)
+    params = trainer.get_params()
+    train_time = timer() - start
+
+    sbd = tok_cls(params)
+    start = timer()
+    sbd.tokenize(text)
+    tokenize_time = timer() - start
+
+    tokens = list(sbd._tokenize_words(text))
+    return dict(
+        tokens=len(tokens),
+        token_bytes=getsizeof(tokens[0]) if tokens else 0,
+        train_seconds=train_time,
+        tokenize_seconds=tokenize_time,
+    )
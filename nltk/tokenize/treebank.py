@@ -17,6 +17,22 @@ and available at http://www.cis.upenn.edu/~treebank/tokenizer.sed.
 """
 
 import re
+
+# The regular expression parser, used to derive the guards of
+# CompiledTreebankWordTokenizer.  It is private to the re module, and moved
+# there from the deprecated sre_parse module in Python 3.11; without it, no
+# guards are derived and every substitution is run.
+try:
+    from re import _parser as sre_parse, _constants as sre_constants
+except ImportError:
+    try:
+        import sre_parse
+        import sre_constants
+    except ImportError:
+        sre_parse = sre_constants = None
+
+from six import text_type, unichr
+
 from nltk.tokenize.api import TokenizerI
 from nltk.tokenize.util import align_tokens
 
@@ -114,35 +130,38 @@ class TreebankWordTokenizer(TokenizerI):
     CONTRACTIONS2 = list(map(re.compile, _contractions.CONTRACTIONS2))
     CONTRACTIONS3 = list(map(re.compile, _contractions.CONTRACTIONS3))
 
+    def _sub(self, regexp, substitution, text):
+        return regexp.sub(substitution, text)
+
     def tokenize(self, text, convert_parentheses=False, return_str=False):
         for regexp, substitution in self.STARTING_QUOTES:
-            text = regexp.sub(substitution, text)
+            text = self._sub(regexp, substitution, text)
 
         for regexp, substitution in self.PUNCTUATION:
-            text = regexp.sub(substitution, text)
+            text = self._sub(regexp, substitution, text)
 
         # Handles parentheses.
         regexp, substitution = self.PARENS_BRACKETS
-        text = regexp.sub(substitution, text)
+        text = self._sub(regexp, substitution, text)
         # Optionally convert parentheses
         if convert_parentheses:
             for regexp, substitution in self.CONVERT_PARENTHESES:
-                text = regexp.sub(substitution, text)
+                text = self._sub(regexp, substitution, text)
 
         # Handles double dash.
         regexp, substitution = self.DOUBLE_DASHES
-        text = regexp.sub(substitution, text)
+        text = self._sub(regexp, substitution, text)
 
         # add extra space to make things easier
         text = " " + text + " "
 
         for regexp, substitution in self.ENDING_QUOTES:
-            text = regexp.sub(substitution, text)
+            text = self._sub(regexp, substitution, text)
 
         for regexp in self.CONTRACTIONS2:
-            text = regexp.sub(r' \1 \2 ', text)
+            text = self._sub(regexp, r' \1 \2 ', text)
         for regexp in self.CONTRACTIONS3:
-            text = regexp.sub(r' \1 \2 ', text)
+            text = self._sub(regexp, r' \1 \2 ', text)
 
         # We are not using CONTRACTIONS4 since
         # they are also commented out in the SED scripts
@@ -208,6 +227,152 @@ class TreebankWordTokenizer(TokenizerI):
             yield tok
 
 
+# Under re.IGNORECASE, "i" also matches these two characters, whose case
+# folded forms differ from "i".
+_DOTTED_AND_DOTLESS_I = {0x130: u'i', 0x131: u'i'}
+
+
+def _casefold(text):
+    """
+    Fold case so that every ASCII string a case-insensitive regular expression
+    matches in `text` also occurs, lowercased, in the result.
+    """
+    text = text.translate(_DOTTED_AND_DOTLESS_I)
+    return text.casefold() if hasattr(text, 'casefold') else text.lower()
+
+
+def _flatten(items):
+    """Inline the contents of plain capturing groups into their parent."""
+    for op, av in items:
+        # Groups with inline flags, e.g. (?i:...), are left opaque.
+        if op is sre_constants.SUBPATTERN and not any(av[1:-1]):
+            for item in _flatten(av[-1]):
+                yield item
+        else:
+            yield op, av
+
+
+def _charset(av):
+    """The characters of a character class, or None if it is not a plain set."""
+    chars = set()
+    for op, value in av:
+        if op is not sre_constants.LITERAL:
+            return None
+        chars.add(unichr(value))
+    return chars
+
+
+def _required_literals(items):
+    """
+    Yield sets of strings such that every match of the sequence `items`
+    contains at least one string of each set.
+    """
+    run = []
+    for op, av in _flatten(items):
+        if op is sre_constants.LITERAL:
+            run.append(unichr(av))
+            continue
+        if run:
+            yield set([''.join(run)])
+            run = []
+        if op is sre_constants.IN:
+            chars = _charset(av)
+            if chars:
+                yield chars
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) and av[0] >= 1:
+            for literals in _required_literals(av[2]):
+                yield literals
+        elif op is sre_constants.BRANCH:
+            branches = [_best_literals(branch) for branch in av[1]]
+            if all(branches):
+                yield set().union(*branches)
+    if run:
+        yield set([''.join(run)])
+
+
+def _best_literals(items):
+    """The most selective set of required literals, i.e. the one with the longest strings."""
+    candidates = list(_required_literals(items))
+    if not candidates:
+        return None
+    return max(candidates, key=lambda lits: (min(map(len, lits)), -len(lits)))
+
+
+# Cache of guards derived by _literal_guard, keyed by compiled regexp.
+_GUARDS = {}
+
+
+def _literal_guard(regexp):
+    """
+    Derive a cheap necessary condition for `regexp` to match.
+
+    :return: A tuple of strings, one of which occurs in every string that
+        `regexp` matches (after case folding when ``ignorecase`` is set),
+        and the ``ignorecase`` flag.  ``None`` if no such strings are found.
+    """
+    if regexp not in _GUARDS:
+        guard = None
+        if (
+            sre_parse is not None
+            and isinstance(regexp.pattern, text_type)
+            and not regexp.flags & re.LOCALE
+        ):
+            literals = _best_literals(sre_parse.parse(regexp.pattern, regexp.flags))
+            if literals:
+                ignorecase = bool(regexp.flags & re.IGNORECASE)
+                if ignorecase:
+                    literals = set(_casefold(literal) for literal in literals)
+                    # Non-ASCII characters can have case variants that fold
+                    # to several characters, so only ASCII guards are exact.
+                    if any(ord(char) > 127 for lit in literals for char in lit):
+                        literals = None
+                if literals:
+                    guard = (tuple(literals), ignorecase)
+        _GUARDS[regexp] = guard
+    return _GUARDS[regexp]
+
+
+class CompiledTreebankWordTokenizer(TreebankWordTokenizer):
+    """
+    A faster engine for the Treebank tokenizer with identical output.
+
+    Before the tokenizer's regular expressions are used, each is compiled
+    into a guard: a few literal strings, one of which must occur in any
+    text the expression matches (e.g. ``n't`` or ``'ll`` for the clitic
+    rules).  A substitution is only run when its guard finds one of them in
+    the current text, and such substring tests are much cheaper than a
+    regular expression pass.  Most rules cannot apply to a typical sentence,
+    so most of the passes over the text are skipped.
+
+    Guards are derived from whatever rules the class currently holds, so rule
+    lists extended at runtime (as `word_tokenize` does) are handled too.
+
+        >>> from nltk.tokenize.treebank import CompiledTreebankWordTokenizer
+        >>> s = "They'll save and invest more. hi, my name can't hello,"
+        >>> CompiledTreebankWordTokenizer().tokenize(s) == TreebankWordTokenizer().tokenize(s)
+        True
+    """
+
+    # The last text whose case folded version was computed, and that version.
+    _folded = (None, None)
+
+    def _sub(self, regexp, substitution, text):
+        guard = _literal_guard(regexp)
+        if guard is not None:
+            literals, ignorecase = guard
+            if ignorecase:
+                folded_for, folded = self._folded
+                if folded_for is not text:
+                    folded = _casefold(text)
+                    self._folded = (text, folded)
+                haystack = folded
+            else:
+                haystack = text
+            if not any(literal in haystack for literal in literals):
+                return text
+        return regexp.sub(substitution, text)
+
+
 class TreebankWordDetokenizer(TokenizerI):
     """
     The Treebank detokenizer uses the reverse regex operations corresponding to
@@ -384,3 +549,27 @@ class TreebankWordDetokenizer(TokenizerI):
     def detokenize(self, tokens, convert_parentheses=False):
         """ Duck-typing the abstract *tokenize()*."""
         return self.tokenize(tokens, convert_parentheses)
+
+
+def benchmark(
+    texts, tok_cls=CompiledTreebankWordTokenizer, base_cls=TreebankWordTokenizer
+):
+    """
+    Tokenizes the texts with both tokenizer classes, returning a dict with
+    the number of tokens, the tokenization times in seconds, and whether
+    the two tokenizers gave the same tokens.
+    """
+    from timeit import default_timer as timer
+
+    results = {}
+    for name, cls in (('base', base_cls), ('compiled', tok_cls)):
+        tokenizer = cls()
+        start = timer()
+        results[name] = [tokenizer.tokenize(text) for text in texts]
+        results[name + '_seconds'] = timer() - start
+    return dict(
+        tokens=sum(len(tokens) for tokens in results['compiled']),
+        base_seconds=results['base_seconds'],
+        compiled_seconds=results['compiled_seconds'],
+        same_tokens=results['base'] == results['compiled'],
+    )